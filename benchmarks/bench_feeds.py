@@ -0,0 +1,71 @@
+# benchmarks/bench_feeds.py
+"""
+Feed ingestion benchmark: bt.feeds.PandasData vs ArrayData.
+
+Writes a synthetic OHLCV CSV (5M bars by default), reads it once with
+pandas, then times building each feed and preloading it the way Cerebro
+does, reporting bars/sec for each.
+
+    python -m benchmarks.bench_feeds [--bars N] [--csv PATH]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import backtrader as bt
+import pandas as pd
+
+from benchmarks.synthetic import write_csv
+from src.data.feeds import ArrayData
+
+
+def pandas_feed(df):
+    df = df.rename(columns={'Date': 'datetime'}).set_index('datetime')
+    df['openinterest'] = 0
+    return bt.feeds.PandasData(dataname=df, datetime=None, open='Open', high='High', low='Low',
+                               close='Close', volume='Volume', openinterest='openinterest')
+
+
+def time_preload(make_feed, df):
+    t0 = time.perf_counter()
+    feed = make_feed(df)
+    cerebro = bt.Cerebro()
+    cerebro.adddata(feed)
+    feed._start()
+    feed.preload()
+    elapsed = time.perf_counter() - t0
+    return feed.buflen(), elapsed
+
+
+def run(bars: int, csv_path: str = None):
+    cleanup = csv_path is None
+    if csv_path is None:
+        fd, csv_path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+    if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
+        print(f"Writing {bars:,} bars to {csv_path} ...")
+        write_csv(csv_path, bars)
+    try:
+        t0 = time.perf_counter()
+        df = pd.read_csv(csv_path, parse_dates=['Date'])
+        print(f"read_csv: {len(df):,} rows in {time.perf_counter() - t0:.2f}s")
+
+        results = {}
+        for name, make in (('PandasData', pandas_feed), ('ArrayData', ArrayData.from_dataframe)):
+            n, elapsed = time_preload(make, df)
+            results[name] = n / elapsed
+            print(f"  {name:<10} {n:>10,} bars in {elapsed:7.2f}s  {n / elapsed:>14,.0f} bars/sec")
+        print(f"speedup: {results['ArrayData'] / results['PandasData']:.1f}x")
+    finally:
+        if cleanup:
+            os.remove(csv_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bars', type=int, default=5_000_000)
+    parser.add_argument('--csv', default=None, help="existing or output CSV path (kept)")
+    args = parser.parse_args()
+    run(args.bars, args.csv)
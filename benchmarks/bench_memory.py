@@ -0,0 +1,68 @@
+# benchmarks/bench_memory.py
+"""
+Peak memory per engine mode on a long synthetic minute history.
+
+Each mode runs SmaCross in a fresh process so peak RSS readings do not
+leak between modes:
+  default         - BacktestEngine() plus the TimeReturn/DrawDown/TradeAnalyzer
+                    set used by the main window
+  low_memory      - BacktestEngine(low_memory=True), sink kept in memory
+  low_memory_disk - BacktestEngine(low_memory=True, sink_path=...)
+
+    python -m benchmarks.bench_memory [--bars N]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_ohlcv
+
+MODES = ('default', 'low_memory', 'low_memory_disk')
+
+
+def _run_mode(mode: str, bars: int, out):
+    import backtrader as bt
+    from src.backtester.engine import BacktestEngine
+    from src.backtester.strategies import SmaCross
+    from src.data.feeds import ArrayData
+    from src.utils.memory import peak_rss_mb
+
+    feed = ArrayData.from_dataframe(synthetic_ohlcv(bars, seed=11))
+    base = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        if mode == 'default':
+            engine = BacktestEngine()
+            engine.add_analyzer(bt.analyzers.TimeReturn, _name='returns')
+            engine.add_analyzer(bt.analyzers.DrawDown, _name='drawdown')
+            engine.add_analyzer(bt.analyzers.TradeAnalyzer, _name='trade')
+        else:
+            sink_path = os.path.join(tmp, 'run') if mode == 'low_memory_disk' else None
+            engine = BacktestEngine(low_memory=True, sink_path=sink_path)
+        engine.add_data(feed)
+        engine.set_strategy(SmaCross)
+        t0 = time.perf_counter()
+        engine.run()
+        out.put((mode, time.perf_counter() - t0, base, engine.peak_rss_mb))
+
+
+def run(bars: int):
+    ctx = mp.get_context('spawn')
+    print(f"{bars:,} one-minute bars, SmaCross")
+    print(f"  {'mode':<16}{'run (s)':>10}{'data RSS (MB)':>16}{'peak RSS (MB)':>16}{'run delta (MB)':>16}")
+    for mode in MODES:
+        out = ctx.Queue()
+        proc = ctx.Process(target=_run_mode, args=(mode, bars, out))
+        proc.start()
+        name, elapsed, base, peak = out.get()
+        proc.join()
+        print(f"  {name:<16}{elapsed:>10.1f}{base:>16.0f}{peak:>16.0f}{peak - base:>16.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bars', type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.bars)
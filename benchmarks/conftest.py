@@ -0,0 +1,68 @@
+# benchmarks/conftest.py
+"""
+pytest-benchmark suite (benchmarks/test_bench_*.py).
+
+    pytest benchmarks                                 # 10k and 100k bars
+    pytest benchmarks --bench-bars 10000,1000000,10000000
+    pytest benchmarks --benchmark-compare             # against the last saved run
+    pytest-benchmark compare 0001 0002 --group-by name
+
+Every run is saved under .benchmarks/ (named after the commit) unless
+--benchmark-disable is given, so results can be compared between commits.
+The default `pytest` run only collects tests/, not this directory.
+"""
+
+import pytest
+from pytest_benchmark.utils import get_tag
+
+from benchmarks.synthetic import synthetic_ohlcv, write_csv
+
+DEFAULT_BARS = '10000,100000'
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-bars', default=DEFAULT_BARS,
+                     help=f"comma-separated bar counts to benchmark (default {DEFAULT_BARS})")
+
+
+def pytest_configure(config):
+    # Same as passing --benchmark-autosave: the file name carries the commit id
+    opt = config.option
+    if not (opt.benchmark_disable or opt.benchmark_save or opt.benchmark_autosave):
+        opt.benchmark_autosave = get_tag()
+
+
+def pytest_generate_tests(metafunc):
+    if 'bars' in metafunc.fixturenames:
+        sizes = [int(s) for s in metafunc.config.getoption('--bench-bars').split(',') if s]
+        metafunc.parametrize('bars', sizes, ids=[f'{n:,}'.replace(',', '_') for n in sizes],
+                             scope='session')
+
+
+@pytest.fixture(scope='session')
+def ohlcv(bars):
+    return synthetic_ohlcv(bars)
+
+
+@pytest.fixture(scope='session')
+def ohlcv_csv(bars, tmp_path_factory):
+    return write_csv(str(tmp_path_factory.mktemp('bench') / f'ohlcv_{bars}.csv'), bars)
+
+
+@pytest.fixture
+def bench(benchmark):
+    """
+    bench(fn, bars, rounds=None, setup=None): time fn over a fixed number
+    of rounds (these are seconds-long calls, not microbenchmarks; by default
+    3 up to 100k bars, then 1) and record bars and bars/s next to the timings.
+    """
+    def run(fn, bars: int, rounds: int = None, setup=None):
+        if rounds is None:
+            rounds = 3 if bars <= 100_000 else 1
+        result = benchmark.pedantic(fn, setup=setup, rounds=rounds, iterations=1)
+        benchmark.extra_info['bars'] = bars
+        if benchmark.stats is not None:
+            mean = benchmark.stats.stats.mean
+            benchmark.extra_info['bars_per_s'] = bars / mean if mean else None
+        return result
+    return run
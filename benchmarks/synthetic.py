@@ -0,0 +1,31 @@
+# benchmarks/synthetic.py
+"""
+Synthetic OHLCV data for benchmarks: a geometric random walk with
+consistent Open/High/Low/Close and integer volume, from 10k to 10M+ bars.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlcv(bars: int, freq: str = 'min', start: str = '2000-01-03 09:30',
+                    vol: float = 0.0005, seed: int = 1) -> pd.DataFrame:
+    """Date/Open/High/Low/Close/Volume frame with `bars` rows, sorted by date."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, vol, bars)))
+    open_ = np.concatenate(([close[0]], close[:-1])) * np.exp(rng.normal(0, vol / 4, bars))
+    spread = close * np.abs(rng.normal(0, vol, bars))
+    return pd.DataFrame({
+        'Date': pd.date_range(start, periods=bars, freq=freq),
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.integers(100, 10_000, bars),
+    })
+
+
+def write_csv(path: str, bars: int, **kwargs):
+    """Write synthetic_ohlcv(bars) in the CSV layout DataLoader.from_csv reads."""
+    synthetic_ohlcv(bars, **kwargs).to_csv(path, index=False, float_format='%.4f')
+    return path
@@ -0,0 +1,37 @@
+# benchmarks/test_bench_data.py
+"""CSV loading and feed construction (including the preload Cerebro does)."""
+
+import backtrader as bt
+import pytest
+
+from benchmarks.bench_feeds import pandas_feed
+from src.data.feeds import ArrayData
+from src.data.loader import DataLoader
+
+# PandasData loads ~5k bars/s; larger sizes would take minutes per round
+PANDAS_MAX_BARS = 100_000
+
+
+def _preload(feed):
+    cerebro = bt.Cerebro()
+    cerebro.adddata(feed)
+    feed._start()
+    feed.preload()
+    return feed
+
+
+def test_from_csv(bench, ohlcv_csv, bars):
+    feed, rows = bench(lambda: DataLoader.from_csv(ohlcv_csv), bars)
+    assert rows == bars
+
+
+def test_arraydata_preload(bench, ohlcv, bars):
+    feed = bench(lambda: _preload(ArrayData.from_dataframe(ohlcv)), bars)
+    assert feed.buflen() == bars
+
+
+def test_pandasdata_preload(bench, ohlcv, bars):
+    if bars > PANDAS_MAX_BARS:
+        pytest.skip(f"PandasData is only benchmarked up to {PANDAS_MAX_BARS:,} bars")
+    feed = bench(lambda: _preload(pandas_feed(ohlcv)), bars)
+    assert feed.buflen() == bars
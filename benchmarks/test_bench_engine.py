@@ -0,0 +1,42 @@
+# benchmarks/test_bench_engine.py
+"""BacktestEngine.run for every strategy, plus the low-memory mode."""
+
+import backtrader as bt
+import pytest
+
+from src.backtester.engine import BacktestEngine
+from src.backtester.strategies import (
+    AtrPositionSizing, MultiTimeframeSma, SmaCross, SmaWithTrailing, TimedExitSma
+)
+from src.data.feeds import ArrayData, clone_feed
+
+STRATEGIES = [SmaCross, SmaWithTrailing, AtrPositionSizing, TimedExitSma, MultiTimeframeSma]
+
+
+@pytest.fixture(scope='session')
+def feed(ohlcv):
+    # Converted once per size; each run gets a clone over the same arrays
+    return ArrayData.from_dataframe(ohlcv)
+
+
+def _engine(feed, strat_cls, **kwargs):
+    engine = BacktestEngine(**kwargs)
+    engine.add_data(clone_feed(feed))
+    if strat_cls is MultiTimeframeSma:
+        # Trend filter on hourly bars resampled from the minute feed
+        engine.cerebro.resampledata(clone_feed(feed), timeframe=bt.TimeFrame.Minutes, compression=60)
+    engine.set_strategy(strat_cls)
+    return engine
+
+
+@pytest.mark.parametrize('strat_cls', STRATEGIES, ids=lambda c: c.__name__)
+def test_engine_run(bench, feed, bars, strat_cls):
+    results = bench(lambda engine: engine.run(),
+                    bars, setup=lambda: ((_engine(feed, strat_cls),), {}))
+    assert len(results[0]) >= bars
+
+
+def test_engine_run_low_memory(bench, feed, bars):
+    results = bench(lambda engine: engine.run(),
+                    bars, setup=lambda: ((_engine(feed, SmaCross, low_memory=True),), {}))
+    assert len(results[0].analyzers.sink.get_analysis()['equity']) == bars
@@ -0,0 +1,44 @@
+# benchmarks/test_bench_reporting.py
+"""Metrics over the recorder arrays and the Results-tab Plotly HTML."""
+
+import numpy as np
+import pytest
+
+from src.backtester.analyzers import EQUITY_DTYPE, TRADE_DTYPE
+from src.backtester.metrics import equity_metrics, trade_metrics
+from src.data.feeds import to_bt_datenum
+from src.viz.dashboard import build_dashboard, dashboard_series
+
+
+@pytest.fixture(scope='session')
+def run_arrays(ohlcv):
+    """EquityRecorder/TradeRecorder-shaped arrays without running a backtest."""
+    n = len(ohlcv)
+    rng = np.random.default_rng(3)
+    equity = np.empty(n, dtype=EQUITY_DTYPE)
+    equity['datetime'] = to_bt_datenum(ohlcv['Date'])
+    equity['equity'] = 100_000 * ohlcv['Close'].to_numpy() / ohlcv['Close'].iat[0]
+    equity['cash'] = equity['equity']
+    equity['position'] = 0
+    trades = np.zeros(max(n // 100, 1), dtype=TRADE_DTYPE)
+    trades['pnl'] = rng.normal(5, 100, len(trades))
+    trades['pnlcomm'] = trades['pnl'] - 1
+    trades['duration'] = rng.integers(1, 200, len(trades))
+    return equity, trades
+
+
+def test_metrics(bench, run_arrays, bars):
+    equity, trades = run_arrays
+
+    def compute():
+        series = dashboard_series(equity)
+        return equity_metrics(series['equity_vals'], start_value=100_000), trade_metrics(trades)
+
+    em, tm = bench(compute, bars)
+    assert tm['total_trades'] == len(trades)
+
+
+def test_plotly_html(bench, run_arrays, bars):
+    series = dashboard_series(run_arrays[0])
+    html = bench(lambda: build_dashboard(**series).to_html(include_plotlyjs='cdn'), bars)
+    assert 'Backtest Performance Dashboard' in html
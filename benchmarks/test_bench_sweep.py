@@ -0,0 +1,30 @@
+# benchmarks/test_bench_sweep.py
+"""
+Parameter sweeps as OptimizationDialog runs them: SweepExecutor with one
+Cerebro per combo over cloned feeds, collecting each equity curve.
+"""
+
+import pytest
+
+from src.backtester.strategies import SmaCross
+from src.data.feeds import ArrayData
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.samplers import make_sampler
+from src.optimizer.space import ParamSpace
+
+# 3 x 3 grid; the sampled modes draw 9 combos from a much larger space
+GRID = {'sma_short': (5, 15, 5), 'sma_long': (20, 40, 10)}
+WIDE = {'sma_short': (2, 50, 1), 'sma_long': (10, 200, 1), 'stop_loss_pct': (0.01, 0.10, 0.01)}
+BUDGET = 9
+
+
+@pytest.mark.parametrize('mode', ['grid', 'random', 'lhs', 'tpe'])
+def test_sweep(bench, ohlcv, bars, benchmark, mode):
+    feed = ArrayData.from_dataframe(ohlcv)
+    space = ParamSpace.from_ranges(GRID if mode == 'grid' else WIDE,
+                                   constraint=lambda p: p['sma_short'] < p['sma_long'])
+    executor = SweepExecutor(SmaCross, [feed])
+    benchmark.extra_info['runs'] = BUDGET
+    result = bench(lambda: executor.run(make_sampler(mode, space, seed=1), budget=BUDGET),
+                   bars * BUDGET, rounds=1)
+    assert len(result) == BUDGET and len(result.equities[0]) == bars
@@ -0,0 +1,189 @@
+# src/backtester/analyzers.py
+"""
+Custom Backtrader analyzers that keep per-bar results in preallocated
+structured NumPy arrays (EQUITY_DTYPE, TRADE_DTYPE) instead of the nested
+dicts produced by the built-in analyzers. Backtests, sweeps and the
+low-memory engine all record through the same rows.
+"""
+
+import os
+
+import backtrader as bt
+import numpy as np
+
+
+EQUITY_DTYPE = np.dtype([
+    ('datetime', 'f8'), ('equity', 'f8'), ('cash', 'f8'), ('position', 'f8'),
+])
+TRADE_DTYPE = np.dtype([
+    ('ref', 'i8'), ('entry_dt', 'f8'), ('exit_dt', 'f8'), ('entry_bar', 'i8'), ('exit_bar', 'i8'),
+    ('size', 'f8'), ('entry_price', 'f8'), ('exit_price', 'f8'),
+    ('pnl', 'f8'), ('pnlcomm', 'f8'), ('duration', 'i8'),
+])
+
+
+class _RowBuffer:
+    """Preallocated structured array that doubles when full."""
+
+    def __init__(self, dtype, capacity):
+        self.rows = np.empty(max(int(capacity), 16), dtype=dtype)
+        self.n = 0
+
+    def append(self, row):
+        if self.n == len(self.rows):
+            self.rows = np.resize(self.rows, 2 * len(self.rows))
+        self.rows[self.n] = row
+        self.n += 1
+
+    def spill(self, f):
+        """Write the buffered rows to file `f` and start over."""
+        self.rows[:self.n].tofile(f)
+        self.n = 0
+
+    def result(self):
+        return self.rows[:self.n].copy()
+
+
+def _equity_row(strategy, data) -> tuple:
+    broker = strategy.broker
+    return data.datetime[0], broker.getvalue(), broker.getcash(), strategy.getposition(data).size
+
+
+class _TradeRows:
+    """TRADE_DTYPE rows of closed trades (remembers each trade's size at entry)."""
+
+    def __init__(self):
+        self._opened = {}
+
+    def row(self, trade):
+        """The trade's row once it closes, else None."""
+        if trade.justopened:
+            self._opened[trade.ref] = trade.size
+        if not trade.isclosed:
+            return None
+        size = self._opened.pop(trade.ref, 0.0)
+        exit_price = trade.price + trade.pnl / size if size else trade.price
+        return (trade.ref, trade.dtopen, trade.dtclose, trade.baropen, trade.barclose,
+                size, trade.price, exit_price, trade.pnl, trade.pnlcomm, trade.barlen)
+
+
+class EquityRecorder(bt.Analyzer):
+    """
+    Per-bar datetime, portfolio value, cash and position size (first
+    data) written into a preallocated structured array sized from the
+    preloaded bar count. get_analysis() returns an EQUITY_DTYPE array.
+    """
+
+    def start(self):
+        self._buf = _RowBuffer(EQUITY_DTYPE, self.datas[0].buflen() or 1024)
+
+    def next(self):
+        self._buf.append(_equity_row(self.strategy, self.datas[0]))
+
+    def get_analysis(self):
+        return self._buf.result()
+
+
+class TradeRecorder(bt.Analyzer):
+    """
+    One row per closed trade: entry/exit time and bar, size at entry,
+    entry/exit price, gross/net PnL and duration in bars.
+    get_analysis() returns a TRADE_DTYPE array.
+    """
+
+    def start(self):
+        self._buf = _RowBuffer(TRADE_DTYPE, 256)
+        self._trades = _TradeRows()
+
+    def notify_trade(self, trade):
+        row = self._trades.row(trade)
+        if row is not None:
+            self._buf.append(row)
+
+    def get_analysis(self):
+        return self._buf.result()
+
+
+class EventSink(bt.Analyzer):
+    """
+    EquityRecorder and TradeRecorder in one analyzer that can spill to disk.
+
+    Rows are kept in memory, or, when `path` is set, written every
+    `flush_rows` bars to '<path>.equity.bin' and '<path>.trades.bin' so
+    memory use stays flat however long the run. get_analysis() returns
+    {'equity': EQUITY_DTYPE array, 'trades': TRADE_DTYPE array}; with a
+    path they are read-only memory maps over the files.
+    """
+    params = (
+        ('path', None),
+        ('flush_rows', 4096),
+    )
+
+    def start(self):
+        capacity = self.p.flush_rows if self.p.path else self.datas[0].buflen() or 1024
+        self._equity = _RowBuffer(EQUITY_DTYPE, capacity)
+        self._trades = _RowBuffer(TRADE_DTYPE, 256)
+        self._trade_rows = _TradeRows()
+        self._files = None
+        if self.p.path:
+            self._files = (open(f"{self.p.path}.equity.bin", 'wb'),
+                           open(f"{self.p.path}.trades.bin", 'wb'))
+
+    def next(self):
+        self._equity.append(_equity_row(self.strategy, self.datas[0]))
+        if self._files and self._equity.n >= self.p.flush_rows:
+            self._spill()
+
+    def notify_trade(self, trade):
+        row = self._trade_rows.row(trade)
+        if row is not None:
+            self._trades.append(row)
+
+    def _spill(self):
+        for buf, f in zip((self._equity, self._trades), self._files):
+            buf.spill(f)
+
+    def stop(self):
+        if self._files:
+            self._spill()
+            for f in self._files:
+                f.close()
+
+    def get_analysis(self):
+        if not self.p.path:
+            return {'equity': self._equity.result(), 'trades': self._trades.result()}
+
+        def load(suffix, dtype):
+            fname = f"{self.p.path}.{suffix}.bin"
+            if os.path.getsize(fname) == 0:
+                return np.empty(0, dtype=dtype)
+            return np.memmap(fname, dtype=dtype, mode='r')
+        return {'equity': load('equity', EQUITY_DTYPE), 'trades': load('trades', TRADE_DTYPE)}
+
+
+class OrderHistoryPruner(bt.Analyzer):
+    """
+    Bound the order/trade history Backtrader keeps for the whole run.
+
+    Every `every` bars: drop finished orders from the broker's order list
+    (only open orders are ever looked up there), clear the strategy's
+    order-notification history, and keep just the latest trade per
+    data/tradeid. Equity and closed trades should be captured by an
+    analyzer such as EventSink before they are pruned.
+    """
+    params = (('every', 1024),)
+
+    def start(self):
+        self._bars = 0
+
+    def next(self):
+        self._bars += 1
+        if self._bars % self.p.every:
+            return
+        broker = self.strategy.broker
+        if hasattr(broker, 'orders'):
+            broker.orders = [o for o in broker.orders if o.alive()]
+        del self.strategy._orders[:]
+        for by_id in self.strategy._trades.values():
+            for trades in by_id.values():
+                del trades[:-1]
@@ -2,28 +2,65 @@
 """
 BacktestEngine: wraps Backtrader Cerebro for running backtests.
 Automatically adds a BuySell observer so that each buy/sell is printed to the console.
+
+With low_memory=True the engine instead runs Cerebro with bounded line
+buffers (exactbars=1), no standard/plotting observers, an EventSink
+analyzer that streams equity and closed trades to flat arrays or disk,
+and periodic pruning of Backtrader's finished-order history.
+
+With profile_strategies=True each strategy is instrumented with
+HotLoopProfiler (see hotloop.py) and run() leaves the per-strategy
+counters in self.strategy_stats.
 """
 
 import backtrader as bt
 
+from src.backtester.analyzers import EventSink, OrderHistoryPruner
+from src.backtester.hotloop import collect_stats, log_stats, profiled
+from src.utils.memory import peak_rss_mb
+from src.utils.profiling import phase
+
 
 class BacktestEngine:
     """Engine to configure and run Backtrader backtests."""
 
-    def __init__(self, cash: float = 100000.0, commission: float = 0.001):
-        self.cerebro = bt.Cerebro()
+    def __init__(self, cash: float = 100000.0, commission: float = 0.001,
+                 low_memory: bool = False, sink_path: str = None, profile_strategies: bool = False):
+        """
+        -- low_memory: keep only the bars indicators look back on; results
+           come from the 'sink' analyzer rather than observers/plots
+        -- sink_path: with low_memory, spill the sink's rows to files with
+           this prefix instead of keeping them in memory
+        -- profile_strategies: time next()/notify_order()/notify_trade() and
+           count orders/cancels of every strategy (see hotloop.py)
+        """
+        self.low_memory = low_memory
+        self.profile_strategies = profile_strategies
+        if low_memory:
+            self.cerebro = bt.Cerebro(exactbars=1, stdstats=False)
+        else:
+            self.cerebro = bt.Cerebro()
 
         # Set initial cash and commission
         self.cerebro.broker.setcash(cash)
         self.cerebro.broker.setcommission(commission=commission)
 
-        # Automatically attach BuySell observer to log buy/sell events
-        self.cerebro.addobserver(bt.observers.BuySell)
+        if low_memory:
+            self.cerebro.addanalyzer(EventSink, _name='sink', path=sink_path)
+            self.cerebro.addanalyzer(OrderHistoryPruner)
+        else:
+            # Automatically attach BuySell observer to log buy/sell events
+            self.cerebro.addobserver(bt.observers.BuySell)
+
+        # Process peak RSS (MB) after the last run(), if the platform reports it
+        self.peak_rss_mb = None
+        # Per-strategy hot-loop counters of the last run() (profile_strategies)
+        self.strategy_stats = []
 
-    def add_data(self, data_feed: bt.feeds.PandasData):
+    def add_data(self, data_feed: bt.feed.DataBase):
         """
         Attach a historical or (simulated) live data feed.
-        Example: a bt.feeds.PandasData instance.
+        Example: an ArrayData or bt.feeds.PandasData instance.
         """
         self.cerebro.adddata(data_feed)
 
@@ -32,6 +69,8 @@ class BacktestEngine:
         Add a strategy class with its parameters.
         Example: engine.set_strategy(SmaCross, sma_short=10, sma_long=30, printlog=True)
         """
+        if self.profile_strategies:
+            strat_cls = profiled(strat_cls)
         self.cerebro.addstrategy(strat_cls, **params)
 
     def add_observer(self, observer_cls, **kwargs):
@@ -52,5 +91,14 @@ class BacktestEngine:
         """
         Execute the backtest and return strategy instances.
         All buy/sell events will be printed via the BuySell observer.
+        Recorded as the 'cerebro.run' phase when a RunProfiler is active.
         """
-        return self.cerebro.run()
+        with phase('cerebro.run') as rec:
+            results = self.cerebro.run()
+            if self.cerebro.datas:
+                rec['bars'] = len(self.cerebro.datas[0])
+            if self.profile_strategies:
+                self.strategy_stats = rec['strategies'] = collect_stats(results)
+                log_stats(self.strategy_stats)
+        self.peak_rss_mb = peak_rss_mb()
+        return results
@@ -0,0 +1,104 @@
+# src/backtester/metrics.py
+"""
+Vectorized performance metrics over the structured arrays produced by
+EquityRecorder and TradeRecorder (see analyzers.py).
+"""
+
+import numpy as np
+
+from src.data.feeds import from_bt_datenum
+
+
+def drawdown_pct(equity: np.ndarray) -> np.ndarray:
+    """Percent below the running peak at every bar (<= 0)."""
+    equity = np.asarray(equity, dtype=float)
+    if not len(equity):
+        return equity
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(peak > 0, (equity - peak) / peak * 100, 0.0)
+
+
+def period_returns(equity: np.ndarray, start_value: float = None) -> np.ndarray:
+    """Simple per-bar returns; the first bar is measured from start_value if given."""
+    equity = np.asarray(equity, dtype=float)
+    prev = equity[:-1] if start_value is None else np.concatenate(([start_value], equity[:-1]))
+    cur = equity[1:] if start_value is None else equity
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(prev != 0, cur / prev - 1, 0.0)
+
+
+def rolling_sharpe(changes: np.ndarray, window: int = 20) -> np.ndarray:
+    """
+    Sharpe of each trailing `window` of changes, scaled by sqrt(window);
+    NaN until the first full window and where the window is flat.
+    """
+    changes = np.asarray(changes, dtype=float)
+    out = np.full(len(changes), np.nan)
+    if len(changes) < window or window < 2:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(changes, window)
+    mean = windows.mean(axis=1)
+    std = windows.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[window - 1:] = np.where(std > 0, mean / std * np.sqrt(window), np.nan)
+    return out
+
+
+def equity_metrics(equity: np.ndarray, start_value: float = None, periods_per_year: int = 252) -> dict:
+    """Total return, CAGR (per period, annualized), Sharpe and max drawdown, all in %."""
+    equity = np.asarray(equity, dtype=float)
+    if not len(equity):
+        return {'final_value': 0.0, 'total_return': 0.0, 'cagr': 0.0, 'sharpe': 0.0, 'max_drawdown': 0.0}
+    start = equity[0] if start_value is None else start_value
+    rets = period_returns(equity, start_value)
+    std = rets.std(ddof=1) if len(rets) > 1 else 0.0
+    periods = len(rets)
+    growth = equity[-1] / start if start else 0.0
+    return {
+        'final_value': float(equity[-1]),
+        'total_return': float((growth - 1) * 100) if start else 0.0,
+        'cagr': float((growth ** (periods_per_year / periods) - 1) * 100) if periods and growth > 0 else 0.0,
+        'sharpe': float(rets.mean() / std * np.sqrt(periods_per_year)) if std else 0.0,
+        'max_drawdown': float(-drawdown_pct(equity).min()),
+    }
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True values."""
+    if not mask.any():
+        return 0
+    padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def trade_metrics(trades: np.ndarray) -> dict:
+    """Counts, win rate, average hold/profit/loss, expectancy and streaks.
+    A trade is a win when its net PnL is >= 0 (as in bt's TradeAnalyzer)."""
+    pnl = trades['pnlcomm']
+    total = len(pnl)
+    won = pnl >= 0
+    wins = int(won.sum())
+    losses = total - wins
+    avg_profit = float(pnl[won].mean()) if wins else 0.0
+    avg_loss = float(pnl[~won].mean()) if losses else 0.0
+    return {
+        'total_trades': total,
+        'wins': wins,
+        'losses': losses,
+        'win_rate': wins / total * 100 if total else 0.0,
+        'avg_hold': float(trades['duration'].mean()) if total else 0.0,
+        'avg_profit': avg_profit,
+        'avg_loss': avg_loss,
+        'expectancy': (wins * avg_profit + losses * avg_loss) / total if total else 0.0,
+        'gross_pnl': float(trades['pnl'].sum()),
+        'net_pnl': float(pnl.sum()),
+        'max_consec_wins': _longest_run(won),
+        'max_consec_losses': _longest_run(~won),
+    }
+
+
+def equity_dates(equity: np.ndarray) -> np.ndarray:
+    """The equity rows' Backtrader date numbers as datetime64[us]."""
+    return from_bt_datenum(equity['datetime'])
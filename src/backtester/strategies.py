@@ -31,6 +31,8 @@ class SmaCross(bt.Strategy):
         self.fast = bt.indicators.SMA(self.dataclose, period=self.p.sma_short)
         self.slow = bt.indicators.SMA(self.dataclose, period=self.p.sma_long)
         self.cross = bt.indicators.CrossOver(self.fast, self.slow)
+        # Bars needed before both SMAs are valid (constant for the run)
+        self.min_bars = max(self.p.sma_short, self.p.sma_long)
 
         # Order handles
         self.order = None
@@ -106,8 +108,7 @@ class SmaCross(bt.Strategy):
 
     def next(self):
         # Wait until both SMAs have enough bars
-        min_bars = max(self.p.sma_short, self.p.sma_long)
-        if len(self.data) < min_bars:
+        if len(self.data) < self.min_bars:
             return
 
         # If there is any pending order, do nothing
@@ -124,12 +125,14 @@ class SmaCross(bt.Strategy):
                 size = int(risk_amount / potential_loss) if potential_loss > 0 else 0
 
                 if size > 0:
-                    self.log(f"BUY CREATE @ {self.dataclose[0]:.2f}, size={size}")
+                    if self.p.printlog:
+                        self.log(f"BUY CREATE @ {self.dataclose[0]:.2f}, size={size}")
                     self.order = self.buy(size=size)
         else:
             # Already in position: check for sell signal
             if self.cross < 0:
-                self.log(f"CLOSE CREATE @ {self.dataclose[0]:.2f}")
+                if self.p.printlog:
+                    self.log(f"CLOSE CREATE @ {self.dataclose[0]:.2f}")
                 self.order = self.close()
 
     def stop(self):
@@ -155,6 +158,7 @@ class SmaWithTrailing(bt.Strategy):
         self.fast_sma = bt.indicators.SMA(self.price, period=self.p.fast)
         self.slow_sma = bt.indicators.SMA(self.price, period=self.p.slow)
         self.cross = bt.indicators.CrossOver(self.fast_sma, self.slow_sma)
+        self.min_bars = max(self.p.fast, self.p.slow)
 
         self.order = None
         self.trail_order = None
@@ -166,8 +170,7 @@ class SmaWithTrailing(bt.Strategy):
         print(f"{dt.isoformat()} {txt}")
 
     def next(self):
-        min_bars = max(self.p.fast, self.p.slow)
-        if len(self.data) < min_bars:
+        if len(self.data) < self.min_bars:
             return
 
         if self.order or self.trail_order:
@@ -175,11 +178,13 @@ class SmaWithTrailing(bt.Strategy):
 
         if not self.position:
             if self.cross > 0:
-                self.log(f"BUY CREATE @ {self.data.close[0]:.2f}")
+                if self.p.printlog:
+                    self.log(f"BUY CREATE @ {self.data.close[0]:.2f}")
                 self.order = self.buy()
         else:
             if self.cross < 0:
-                self.log(f"CLOSE CREATE @ {self.data.close[0]:.2f}")
+                if self.p.printlog:
+                    self.log(f"CLOSE CREATE @ {self.data.close[0]:.2f}")
                 self.order = self.close()
 
     def notify_order(self, order):
@@ -229,6 +234,7 @@ class AtrPositionSizing(bt.Strategy):
         self.fast = bt.indicators.SMA(self.price, period=self.p.fast)
         self.slow = bt.indicators.SMA(self.price, period=self.p.slow)
         self.cross = bt.indicators.CrossOver(self.fast, self.slow)
+        self.min_bars = max(self.p.fast, self.p.slow)
 
         self.atr = bt.indicators.ATR(self.datas[0], period=self.p.atr_period)
         self.order = None
@@ -240,8 +246,7 @@ class AtrPositionSizing(bt.Strategy):
         print(f"{dt.isoformat()} {txt}")
 
     def next(self):
-        min_bars = max(self.p.fast, self.p.slow)
-        if len(self.data) < min_bars:
+        if len(self.data) < self.min_bars:
             return
 
         if self.order:
@@ -255,7 +260,8 @@ class AtrPositionSizing(bt.Strategy):
             size = int(risk_amount / stop_dist) if stop_dist > 0 else 0
 
             if size > 0:
-                self.log(f"BUY CREATE @ {self.data.close[0]:.2f}, size={size}")
+                if self.p.printlog:
+                    self.log(f"BUY CREATE @ {self.data.close[0]:.2f}, size={size}")
                 self.order = self.buy(size=size)
                 # Place stop-loss immediately
                 sl_price = self.data.close[0] - stop_dist
@@ -264,9 +270,11 @@ class AtrPositionSizing(bt.Strategy):
                     price=sl_price,
                     size=size
                 )
-                self.log(f"STOP-LOSS ORDER placed @ {sl_price:.2f} (size={size})")
+                if self.p.printlog:
+                    self.log(f"STOP-LOSS ORDER placed @ {sl_price:.2f} (size={size})")
         elif self.position and self.cross < 0:
-            self.log(f"CLOSE CREATE @ {self.data.close[0]:.2f}")
+            if self.p.printlog:
+                self.log(f"CLOSE CREATE @ {self.data.close[0]:.2f}")
             self.order = self.close()
 
     def notify_order(self, order):
@@ -294,6 +302,7 @@ class TimedExitSma(bt.Strategy):
         self.fast = bt.indicators.SMA(self.price, period=self.p.fast)
         self.slow = bt.indicators.SMA(self.price, period=self.p.slow)
         self.cross = bt.indicators.CrossOver(self.fast, self.slow)
+        self.min_bars = max(self.p.fast, self.p.slow)
 
         self.entry_bar = None
         self.order = None
@@ -305,8 +314,7 @@ class TimedExitSma(bt.Strategy):
         print(f"{dt.isoformat()} {txt}")
 
     def next(self):
-        min_bars = max(self.p.fast, self.p.slow)
-        if len(self.data) < min_bars:
+        if len(self.data) < self.min_bars:
             return
 
         if self.order:
@@ -314,16 +322,19 @@ class TimedExitSma(bt.Strategy):
 
         if not self.position and self.cross > 0:
             self.entry_bar = len(self)
-            self.log(f"BUY CREATE @ {self.data.close[0]:.2f}")
+            if self.p.printlog:
+                self.log(f"BUY CREATE @ {self.data.close[0]:.2f}")
             self.order = self.buy()
         elif self.position:
             # If slow SMA flips or max_hold is reached, close
             bars_held = len(self) - self.entry_bar
             if self.cross < 0:
-                self.log(f"SELL CREATE (SMA flip) @ {self.data.close[0]:.2f}")
+                if self.p.printlog:
+                    self.log(f"SELL CREATE (SMA flip) @ {self.data.close[0]:.2f}")
                 self.order = self.close()
             elif bars_held >= self.p.max_hold:
-                self.log(f"SELL CREATE (Max hold reached: {bars_held} bars) @ {self.data.close[0]:.2f}")
+                if self.p.printlog:
+                    self.log(f"SELL CREATE (Max hold reached: {bars_held} bars) @ {self.data.close[0]:.2f}")
                 self.order = self.close()
 
     def notify_order(self, order):
@@ -385,10 +396,12 @@ class MultiTimeframeSma(bt.Strategy):
             return
 
         if not self.position and self.cross > 0 and trend_up:
-            self.log(f"BUY CREATE @ {self.datas[0].close[0]:.2f} (Weekly trend UP)")
+            if self.p.printlog:
+                self.log(f"BUY CREATE @ {self.datas[0].close[0]:.2f} (Weekly trend UP)")
             self.order = self.buy()
         elif self.position and self.cross < 0 and trend_dn:
-            self.log(f"SELL CREATE @ {self.datas[0].close[0]:.2f} (Weekly trend DOWN)")
+            if self.p.printlog:
+                self.log(f"SELL CREATE @ {self.datas[0].close[0]:.2f} (Weekly trend DOWN)")
             self.order = self.sell()
 
     def notify_order(self, order):
@@ -0,0 +1,272 @@
+# src/data/aggregator.py
+"""
+BarAggregator: turn streamed trade/quote messages into OHLCV bars.
+
+Bars can be closed by time (every `size` seconds), by tick count or by
+traded volume. Time bars tolerate late and out-of-order events: a bar
+stays open until the newest event time seen for its symbol passes the
+bar's end by `watermark_s`; events older than that are counted and
+dropped. Completed bars are appended to a LiveBarStore.
+"""
+
+import heapq
+import threading
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import logger
+
+BAR_MODES = ('time', 'tick', 'volume')
+BAR_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+
+class Bar:
+    """One OHLCV bar; `ts` is the bar start in epoch seconds."""
+    __slots__ = ('ts', 'open', 'high', 'low', 'close', 'volume', 'ticks', '_first_ts', '_last_ts')
+
+    def __init__(self, ts: float, event_ts: float, price: float, size: float):
+        self.ts = ts
+        self.open = self.high = self.low = self.close = price
+        self.volume = size
+        self.ticks = 1
+        self._first_ts = self._last_ts = event_ts
+
+    def update(self, event_ts: float, price: float, size: float):
+        # Open/close follow event time, so out-of-order ticks land correctly
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        if event_ts < self._first_ts:
+            self._first_ts = event_ts
+            self.open = price
+        if event_ts >= self._last_ts:
+            self._last_ts = event_ts
+            self.close = price
+        self.volume += size
+        self.ticks += 1
+
+    @classmethod
+    def from_values(cls, ts, open_, high, low, close, volume):
+        bar = cls(ts, ts, open_, volume)
+        bar.high, bar.low, bar.close = high, low, close
+        return bar
+
+    def as_tuple(self):
+        return self.ts, self.open, self.high, self.low, self.close, self.volume
+
+    def __repr__(self):
+        return (f"Bar(ts={self.ts}, o={self.open}, h={self.high}, l={self.low}, "
+                f"c={self.close}, v={self.volume}, ticks={self.ticks})")
+
+
+def parse_message(msg: dict):
+    """
+    Extract (symbol, ts, price, size) from a trade or quote message.
+    Trades carry price/size; quotes carry bid/ask and contribute their
+    mid price with zero volume. Millisecond timestamps are detected and
+    converted to seconds. Returns None for messages without a price.
+    """
+    symbol = msg.get('symbol') or msg.get('s')
+    ts = msg.get('ts', msg.get('timestamp', msg.get('t')))
+    price = msg.get('price', msg.get('p'))
+    if price is None:
+        bid, ask = msg.get('bid'), msg.get('ask')
+        if bid is None or ask is None:
+            return None
+        price = (float(bid) + float(ask)) / 2
+        size = 0.0
+    else:
+        size = float(msg.get('size', msg.get('volume', msg.get('q', 0.0))) or 0.0)
+    if symbol is None or ts is None:
+        return None
+    ts = float(ts)
+    if ts > 1e11:
+        ts /= 1000.0
+    return symbol, ts, float(price), size
+
+
+class LiveBarStore:
+    """
+    Thread-safe, append-only store of completed bars per symbol, kept as
+    flat columns. Subscribers are called as callback(symbol, bar) on the
+    thread that appended the bar.
+    """
+
+    def __init__(self):
+        self._cols = {}
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def append(self, symbol: str, bar: Bar):
+        with self._lock:
+            cols = self._cols.get(symbol)
+            if cols is None:
+                cols = self._cols[symbol] = tuple(array('d') for _ in BAR_COLUMNS)
+            for col, value in zip(cols, bar.as_tuple()):
+                col.append(value)
+        for callback in list(self._subscribers):
+            callback(symbol, bar)
+
+    def symbols(self):
+        with self._lock:
+            return list(self._cols)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(c[0]) for c in self._cols.values())
+
+    def count(self, symbol: str) -> int:
+        with self._lock:
+            cols = self._cols.get(symbol)
+            return len(cols[0]) if cols else 0
+
+    def arrays(self, symbol: str) -> dict:
+        """Copy of one symbol's bars as float64 arrays keyed by column."""
+        with self._lock:
+            cols = self._cols.get(symbol)
+            if cols is None:
+                return {name: np.empty(0) for name in BAR_COLUMNS}
+            return {name: np.array(col, dtype=np.float64) for name, col in zip(BAR_COLUMNS, cols)}
+
+    def to_dataframe(self, symbol: str) -> pd.DataFrame:
+        """Bars as a Date/Open/High/Low/Close/Volume frame (UTC dates)."""
+        data = self.arrays(symbol)
+        df = pd.DataFrame(data, columns=BAR_COLUMNS)
+        df['Date'] = pd.to_datetime(df['Date'], unit='s', utc=True)
+        return df
+
+
+class BarAggregator:
+    """
+    Build bars from ticks with O(1) work per tick.
+
+    mode='time'   - size is the bar length in seconds
+    mode='tick'   - size is the number of ticks per bar
+    mode='volume' - size is the traded volume that closes a bar
+    """
+
+    def __init__(self, mode: str = 'time', size: float = 60, watermark_s: float = 2.0,
+                 store: LiveBarStore = None, parse=parse_message):
+        if mode not in BAR_MODES:
+            raise ValueError(f"Unknown bar mode '{mode}', expected one of {BAR_MODES}")
+        if size <= 0:
+            raise ValueError("Bar size must be positive")
+        self.mode = mode
+        self.size = size
+        self.watermark_s = watermark_s
+        self.store = store if store is not None else LiveBarStore()
+        self.parse = parse
+
+        self.ticks = 0
+        self.late_dropped = 0
+        self.bars_emitted = 0
+
+        # time mode: symbol -> {bucket: Bar}, plus a heap of open buckets
+        # and the emitted/event-time high-water marks per symbol
+        self._open = {}
+        self._heaps = {}
+        self._max_ts = {}
+        self._closed_until = {}
+        # tick/volume mode: symbol -> current Bar
+        self._current = {}
+
+    # -- input ------------------------------------------------------------
+    def on_message(self, msg: dict):
+        parsed = self.parse(msg)
+        if parsed is not None:
+            self.add_tick(*parsed)
+
+    def on_batch(self, batch):
+        """Consume a StreamHub batch of (key, payload) tuples."""
+        for _, payload in batch:
+            if isinstance(payload, list):
+                for msg in payload:
+                    self.on_message(msg)
+            else:
+                self.on_message(payload)
+
+    def add_tick(self, symbol: str, ts: float, price: float, size: float = 0.0):
+        self.ticks += 1
+        if self.mode == 'time':
+            self._add_time(symbol, ts, price, size)
+        else:
+            self._add_count(symbol, ts, price, size)
+
+    def _add_time(self, symbol, ts, price, size):
+        bucket = int(ts // self.size)
+        if bucket < self._closed_until.get(symbol, bucket):
+            self.late_dropped += 1
+            return
+        buckets = self._open.get(symbol)
+        if buckets is None:
+            buckets = self._open[symbol] = {}
+            self._heaps[symbol] = []
+        bar = buckets.get(bucket)
+        if bar is None:
+            buckets[bucket] = Bar(bucket * self.size, ts, price, size)
+            heapq.heappush(self._heaps[symbol], bucket)
+        else:
+            bar.update(ts, price, size)
+
+        if ts > self._max_ts.get(symbol, float('-inf')):
+            self._max_ts[symbol] = ts
+            self._close_ready(symbol, ts - self.watermark_s)
+
+    def _close_ready(self, symbol, watermark):
+        heap = self._heaps[symbol]
+        buckets = self._open[symbol]
+        # A bucket is final once the watermark has passed its end
+        limit = int(watermark // self.size)
+        while heap and heap[0] < limit:
+            self._emit(symbol, buckets.pop(heapq.heappop(heap)))
+        self._closed_until[symbol] = max(self._closed_until.get(symbol, limit), limit)
+
+    def _add_count(self, symbol, ts, price, size):
+        bar = self._current.get(symbol)
+        if bar is None:
+            bar = self._current[symbol] = Bar(ts, ts, price, size)
+        else:
+            bar.update(ts, price, size)
+        full = bar.ticks >= self.size if self.mode == 'tick' else bar.volume >= self.size
+        if full:
+            del self._current[symbol]
+            self._emit(symbol, bar)
+
+    # -- output -----------------------------------------------------------
+    def _emit(self, symbol, bar):
+        self.bars_emitted += 1
+        try:
+            self.store.append(symbol, bar)
+        except Exception as e:
+            logger.exception(e)
+
+    def open_bars(self, symbol: str):
+        """Bars still accepting ticks for `symbol`, oldest first."""
+        if self.mode == 'time':
+            buckets = self._open.get(symbol, {})
+            return [buckets[b] for b in sorted(buckets)]
+        bar = self._current.get(symbol)
+        return [bar] if bar else []
+
+    def flush(self):
+        """Emit every open bar, e.g. at end of session or on shutdown."""
+        for symbol, buckets in self._open.items():
+            for bucket in sorted(buckets):
+                self._emit(symbol, buckets[bucket])
+                self._closed_until[symbol] = bucket + 1
+            buckets.clear()
+            self._heaps[symbol].clear()
+        for symbol, bar in list(self._current.items()):
+            self._emit(symbol, bar)
+        self._current.clear()
+
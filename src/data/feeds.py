@@ -0,0 +1,209 @@
+# src/data/feeds.py
+"""
+ArrayData: a Backtrader feed backed by contiguous NumPy arrays.
+
+bt.feeds.PandasData walks the DataFrame one row at a time in _load().
+ArrayData converts the columns once (dates vectorized to Backtrader date
+numbers) and, when Cerebro preloads, copies each column into its line
+buffer in a single bulk operation. Non-preloaded runs (e.g. exactbars)
+still work through a per-bar _load() that reads from the arrays.
+"""
+
+import hashlib
+from array import array
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+FEED_LINES = ('datetime', 'open', 'high', 'low', 'close', 'volume', 'openinterest')
+
+# Backtrader date numbers count days from 0001-01-01 (= 1.0)
+_BT_EPOCH = np.datetime64('0001-01-01T00:00:00', 'us')
+_US_PER_DAY = 86_400_000_000
+
+
+def to_bt_datenum(dates) -> np.ndarray:
+    """
+    Vectorized bt.date2num: timezone-aware dates are converted to UTC
+    first, naive dates are taken as they are.
+    """
+    idx = pd.DatetimeIndex(dates)
+    if idx.tz is not None:
+        idx = idx.tz_convert('UTC').tz_localize(None)
+    us = idx.values.astype('datetime64[us]')
+    return (us - _BT_EPOCH).astype(np.int64) / _US_PER_DAY + 1.0
+
+
+def from_bt_datenum(nums) -> np.ndarray:
+    """Inverse of to_bt_datenum: Backtrader date numbers to datetime64[us]."""
+    nums = np.asarray(nums, dtype=np.float64)
+    us = np.rint((nums - 1.0) * _US_PER_DAY).astype(np.int64)
+    return _BT_EPOCH + us.astype('timedelta64[us]')
+
+
+class OHLCVArrays:
+    """Column arrays (float64, contiguous) for one feed; len() is the bar count."""
+    __slots__ = FEED_LINES
+
+    def __init__(self, datetime, open, high, low, close, volume=None, openinterest=None):
+        n = len(datetime)
+        self.datetime = np.ascontiguousarray(datetime, dtype=np.float64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.zeros(n) if volume is None else np.ascontiguousarray(volume, dtype=np.float64)
+        self.openinterest = (np.zeros(n) if openinterest is None
+                             else np.ascontiguousarray(openinterest, dtype=np.float64))
+        for name in FEED_LINES:
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"Column '{name}' has {len(getattr(self, name))} rows, expected {n}")
+
+    def __len__(self):
+        return len(self.datetime)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, datetime='Date', open='Open', high='High', low='Low',
+                       close='Close', volume='Volume', openinterest=None) -> 'OHLCVArrays':
+        """
+        Build from a DataFrame; datetime=None uses the index. Rows are
+        sorted by date. Missing volume/openinterest columns become zeros.
+        """
+        dates = df.index if datetime is None else df[datetime]
+        order = np.argsort(np.asarray(pd.DatetimeIndex(dates)), kind='stable')
+        if np.all(order[:-1] < order[1:]):
+            order = slice(None)
+
+        def col(name):
+            if name is None or name not in df.columns:
+                return None
+            return df[name].to_numpy(dtype=np.float64)[order]
+
+        return cls(to_bt_datenum(dates)[order], col(open), col(high), col(low), col(close),
+                   col(volume), col(openinterest))
+
+    def slice(self, start: int = None, stop: int = None) -> 'OHLCVArrays':
+        """Bars [start:stop] as views of these arrays (no copy)."""
+        sl = slice(start, stop)
+        return OHLCVArrays(*(getattr(self, name)[sl] for name in FEED_LINES))
+
+    def fingerprint(self) -> str:
+        """Content hash of the bars; equal data gives equal fingerprints."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(np.int64(len(self)).tobytes())
+        for name in FEED_LINES:
+            h.update(getattr(self, name).data)
+        return h.hexdigest()
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'Date': from_bt_datenum(self.datetime),
+            'Open': self.open, 'High': self.high, 'Low': self.low,
+            'Close': self.close, 'Volume': self.volume,
+        })
+
+
+class ArrayData(bt.feed.DataBase):
+    """
+    Feed whose dataname is an OHLCVArrays. The arrays are only read, so
+    several feeds (e.g. one per optimization run) can share them.
+    """
+
+    def start(self):
+        super().start()
+        if not isinstance(self.p.dataname, OHLCVArrays):
+            raise TypeError("ArrayData expects an OHLCVArrays dataname")
+        self._idx = -1
+
+    def _bounds(self):
+        dt = self.p.dataname.datetime
+        lo = int(np.searchsorted(dt, self.fromdate, side='left'))
+        hi = int(np.searchsorted(dt, self.todate, side='right'))
+        return lo, hi
+
+    def preload(self):
+        # Filters, input-timezone localization or bounded buffers need the
+        # per-bar path in load(); otherwise copy the columns in one go
+        bulk = (not self._filters and not self._ffilters and not self._tzinput
+                and all(isinstance(getattr(self.lines, name).array, array) for name in FEED_LINES))
+        if not bulk:
+            return super().preload()
+
+        lo, hi = self._bounds()
+        data = self.p.dataname
+        for name in FEED_LINES:
+            line = getattr(self.lines, name)
+            line.array.frombytes(getattr(data, name)[lo:hi].tobytes())
+            line.idx = hi - lo - 1
+            line.lencount = hi - lo
+        self._idx = hi - 1
+        self._last()
+        self.home()
+
+    def _load(self):
+        self._idx += 1
+        data = self.p.dataname
+        if self._idx >= len(data):
+            return False
+        i = self._idx
+        lines = self.lines
+        lines.datetime[0] = data.datetime[i]
+        lines.open[0] = data.open[i]
+        lines.high[0] = data.high[i]
+        lines.low[0] = data.low[i]
+        lines.close[0] = data.close[i]
+        lines.volume[0] = data.volume[i]
+        lines.openinterest[0] = data.openinterest[i]
+        return True
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, datetime='Date', open='Open', high='High', low='Low',
+                       close='Close', volume='Volume', openinterest=None, **kwargs) -> 'ArrayData':
+        """Convert df once (see OHLCVArrays.from_dataframe) and wrap it in a feed."""
+        arrays = OHLCVArrays.from_dataframe(df, datetime, open, high, low, close, volume, openinterest)
+        return cls(dataname=arrays, **kwargs)
+
+
+def feed_length(feed) -> int:
+    """Bar count of an ArrayData feed (known before it is loaded)."""
+    if not isinstance(feed.p.dataname, OHLCVArrays):
+        raise TypeError(f"{type(feed).__name__} does not expose its bar count; use ArrayData")
+    return len(feed.p.dataname)
+
+
+def slice_feed(feed, start: int = None, stop: int = None):
+    """
+    A fresh ArrayData feed (same parameters) over bars [start:stop] of an
+    ArrayData feed's arrays. The slice is a view; nothing is copied.
+    """
+    feed_length(feed)
+    kwargs = feed.p._getkwargs()
+    kwargs['dataname'] = feed.p.dataname.slice(start, stop)
+    return type(feed)(**kwargs)
+
+
+def slice_feeds(feeds: list, start: int = None, stop: int = None) -> list:
+    """
+    slice_feed over several time-aligned feeds: bars [start:stop] of the
+    first feed, and the bars of the others covering the same time span.
+    """
+    first = feeds[0].p.dataname
+    lo_dt = first.datetime[start or 0] if len(first) else 0.0
+    stop = len(first) if stop is None else min(stop, len(first))
+    hi_dt = first.datetime[stop - 1] if stop else -np.inf
+    out = [slice_feed(feeds[0], start, stop)]
+    for feed in feeds[1:]:
+        dt = feed.p.dataname.datetime
+        out.append(slice_feed(feed, int(np.searchsorted(dt, lo_dt, side='left')),
+                              int(np.searchsorted(dt, hi_dt, side='right'))))
+    return out
+
+
+def clone_feed(feed):
+    """
+    A fresh, unstarted feed of the same class and parameters, sharing the
+    original's dataname (no copy). Used to give every Cerebro run its own
+    feed object.
+    """
+    return type(feed)(**feed.p._getkwargs())
@@ -0,0 +1,235 @@
+# src/data/recorder.py
+"""
+MarketRecorder: persist streamed messages and bars to an append-only log,
+and ReplayFeed: play a recording back into the streaming/backtest path.
+
+File layout: an 8-byte magic header followed by records of
+
+    <f8 receive time> <u1 kind> <u4 payload length> <payload>
+
+kind 0 is a message, payload = compact JSON [key, message];
+kind 1 is a bar, payload = <6 f8: ts, open, high, low, close, volume>
+followed by the UTF-8 symbol. A truncated trailing record (e.g. after a
+crash) is ignored on read.
+"""
+
+import json
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from src.data.aggregator import Bar, BAR_COLUMNS
+from src.utils.logger import logger
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encoding/decoding
+    orjson = None
+
+MAGIC = b'BTREC01\n'
+KIND_MESSAGE = 0
+KIND_BAR = 1
+_HEADER = struct.Struct('<dBI')
+_BAR = struct.Struct('<6d')
+
+Record = namedtuple('Record', 'ts kind key payload')
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class MarketRecorder:
+    """
+    Thread-safe append-only writer. Records can come from the StreamHub
+    thread (record_message / on_batch), a LiveBarStore subscription
+    (record_bar) or polled candles (record_frame).
+    """
+
+    def __init__(self, path: str, buffering: int = 1 << 16):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab', buffering=buffering)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self.records = 0
+
+    def _write(self, kind: int, payload: bytes, ts: float = None):
+        header = _HEADER.pack(time.time() if ts is None else ts, kind, len(payload))
+        with self._lock:
+            self._file.write(header + payload)
+            self.records += 1
+
+    def record_message(self, key: str, message, ts: float = None):
+        self._write(KIND_MESSAGE, _dumps([key, message]), ts)
+
+    def on_batch(self, batch):
+        """Record a StreamHub batch of (key, payload) tuples."""
+        ts = time.time()
+        for key, message in batch:
+            self.record_message(key, message, ts)
+
+    def record_bar(self, symbol: str, bar, ts: float = None):
+        """Record one aggregator Bar; usable as a LiveBarStore subscriber."""
+        self._write(KIND_BAR, _BAR.pack(*bar.as_tuple()) + symbol.encode(), ts)
+
+    def record_frame(self, symbol: str, df: pd.DataFrame, ts: float = None):
+        """Record every row of a Date/Open/High/Low/Close/Volume frame as a bar."""
+        if df.empty:
+            return
+        dates = pd.to_datetime(df['Date'], utc=True)
+        epoch = (dates - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+        values = df[BAR_COLUMNS[1:]].astype(float).to_numpy()
+        sym = symbol.encode()
+        for t, row in zip(epoch.to_numpy(), values):
+            self._write(KIND_BAR, _BAR.pack(float(t), *row) + sym, ts)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_recording(path: str):
+    """Yield Record(ts, kind, key, payload) for every complete record."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a market data recording")
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            ts, kind, length = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                logger.warning(f"[read_recording] Truncated record at end of {path}")
+                return
+            if kind == KIND_MESSAGE:
+                key, message = _loads(payload)
+                yield Record(ts, kind, key, message)
+            elif kind == KIND_BAR:
+                values = _BAR.unpack_from(payload)
+                yield Record(ts, kind, payload[_BAR.size:].decode(), Bar.from_values(*values))
+
+
+class ReplayFeed:
+    """
+    Play a recording back with its original pacing scaled by `speed`
+    (1.0 = real time, 10.0 = ten times faster, None or float('inf') = as
+    fast as possible).
+
+    Messages are delivered as StreamHub-style batches of (key, payload),
+    so a ReplayFeed can stand in for a hub: start() fills `self.queue`
+    and QtStreamBridge(replay) drains it like live data. Bars go to
+    `bar_store` (a LiveBarStore) when one is given.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, batch_interval_s: float = 0.05,
+                 max_batch: int = 1000, bar_store=None):
+        self.path = path
+        self.speed = float('inf') if speed is None else float(speed)
+        if self.speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        self.batch_interval_s = batch_interval_s
+        self.max_batch = max_batch
+        self.bar_store = bar_store
+        self.queue = queue.Queue()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def run(self, on_batch=None, on_bar=None) -> int:
+        """
+        Replay synchronously on the calling thread. Messages whose
+        recorded times fall in the same batch interval are delivered
+        together. Returns the number of records replayed.
+        """
+        on_batch = on_batch or self.queue.put
+        if on_bar is None and self.bar_store is not None:
+            on_bar = self.bar_store.append
+        realtime = self.speed != float('inf')
+
+        count = 0
+        batch = []
+        batch_start = None
+        wall0 = rec0 = None
+        for rec in read_recording(self.path):
+            if self._stop.is_set():
+                break
+            if wall0 is None:
+                wall0, rec0 = time.perf_counter(), rec.ts
+            if batch and (len(batch) >= self.max_batch or
+                          (realtime and rec.ts - batch_start >= self.batch_interval_s)):
+                on_batch(batch)
+                batch = []
+            if realtime:
+                delay = (rec.ts - rec0) / self.speed - (time.perf_counter() - wall0)
+                if delay > 0:
+                    # Deliver what is due before waiting for the next record
+                    if batch:
+                        on_batch(batch)
+                        batch = []
+                    if self._stop.wait(delay):
+                        break
+            if rec.kind == KIND_MESSAGE:
+                if not batch:
+                    batch_start = rec.ts
+                batch.append((rec.key, rec.payload))
+            elif on_bar is not None:
+                on_bar(rec.key, rec.payload)
+            count += 1
+        if batch:
+            on_batch(batch)
+        return count
+
+    def start(self):
+        """Replay on a background thread into self.queue."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="ReplayFeed", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain(self) -> list:
+        """Return every replayed message queued so far (non-blocking)."""
+        out = []
+        while True:
+            try:
+                out.extend(self.queue.get_nowait())
+            except queue.Empty:
+                return out
+
+    def bars_dataframe(self, symbol: str) -> pd.DataFrame:
+        """All recorded bars for `symbol` as a Date/OHLCV frame, for backtests."""
+        rows = [rec.payload.as_tuple() for rec in read_recording(self.path)
+                if rec.kind == KIND_BAR and rec.key == symbol]
+        df = pd.DataFrame(rows, columns=BAR_COLUMNS)
+        df['Date'] = pd.to_datetime(df['Date'], unit='s', utc=True)
+        return df.drop_duplicates(subset=['Date'], keep='last').sort_values('Date', ignore_index=True)
@@ -0,0 +1,93 @@
+# src/data/shared.py
+"""
+OHLCVArrays in shared memory, for handing a dataset to worker processes.
+
+The owner copies the columns into one SharedMemory block once; workers
+attach by handle and get OHLCVArrays whose columns are views of that
+block, so a process pool never pickles or copies the bars.
+
+    with SharedOHLCV(feed.p.dataname) as shared:
+        pool.submit(work, shared.handle)          # in the worker:
+                                                   # arrays = attach(handle)
+"""
+
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from src.data.feeds import FEED_LINES, OHLCVArrays
+
+# Blocks attached in this process, least recently used first:
+# name -> (SharedMemory, OHLCVArrays). The SharedMemory object must stay
+# referenced while its views are used.
+_attached = OrderedDict()
+
+# Attachments kept per process; older ones are closed when unused
+MAX_ATTACHED = 8
+
+
+class SharedHandle(NamedTuple):
+    """Picklable reference to a SharedOHLCV block."""
+    name: str
+    bars: int
+
+
+class SharedOHLCV:
+    """Owner of a shared copy of one OHLCVArrays; close() frees it."""
+
+    def __init__(self, arrays: OHLCVArrays):
+        n = len(arrays)
+        # At least one byte: zero-sized blocks are rejected
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, len(FEED_LINES) * n * 8))
+        block = np.ndarray((len(FEED_LINES), n), dtype=np.float64, buffer=self._shm.buf)
+        for row, name in enumerate(FEED_LINES):
+            block[row] = getattr(arrays, name)
+        self.handle = SharedHandle(self._shm.name, n)
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(handle: SharedHandle) -> OHLCVArrays:
+    """OHLCVArrays viewing a shared block (attached once per process)."""
+    cached = _attached.get(handle.name)
+    if cached is not None:
+        _attached.move_to_end(handle.name)
+        return cached[1]
+    shm = shared_memory.SharedMemory(name=handle.name)
+    block = np.ndarray((len(FEED_LINES), handle.bars), dtype=np.float64, buffer=shm.buf)
+    # Rows of a C-contiguous block are contiguous float64, so
+    # OHLCVArrays keeps them as views
+    cached = _attached[handle.name] = (shm, OHLCVArrays(*block))
+    _evict()
+    return cached[1]
+
+
+def attached() -> list:
+    """Names of the blocks attached in this process, most recent last."""
+    return list(_attached)
+
+
+def _evict():
+    """Close the least recently used attachments beyond MAX_ATTACHED."""
+    while len(_attached) > MAX_ATTACHED:
+        shm, _ = _attached.popitem(last=False)[1]
+        del _
+        try:
+            shm.close()
+        except BufferError:
+            # Views are still referenced somewhere; the mapping goes
+            # away with the last of them
+            pass
@@ -0,0 +1,363 @@
+# src/data/snapshot_store.py
+"""
+SnapshotStore: SQLite storage for saved backtest snapshots.
+
+- WAL journaling with tuned pragmas so readers never block the writer
+- a single background writer thread (BatchWriter) that batches queued
+  inserts into one transaction per batch; SweepStore writes through one too
+- a small pool of read connections for history views and preview loaders
+- a schema_version table; MIGRATIONS are applied in order on open
+- an FTS5 index over the free-text fields plus indexed metric columns,
+  queried through search_clause()
+"""
+
+import itertools
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from src.utils.logger import logger
+
+# Columns accepted by SnapshotStore.insert(), in table order
+SNAPSHOT_COLUMNS = (
+    'symbol', 'live', 'title', 'description', 'notes', 'date',
+    'equity_img', 'drawdown_img', 'histogram_img',
+    'strategy', 'final_value', 'total_return', 'sharpe', 'max_drawdown', 'total_trades',
+)
+
+# Free-text columns covered by the FTS5 index
+TEXT_COLUMNS = ('title', 'description', 'notes', 'symbol', 'strategy')
+
+# Search keyword -> numeric metric column
+METRIC_FIELDS = {
+    'final': 'final_value',
+    'return': 'total_return',
+    'sharpe': 'sharpe',
+    'drawdown': 'max_drawdown',
+    'trades': 'total_trades',
+}
+
+# Search keyword -> exact-match column (case-insensitive)
+EXACT_FIELDS = {
+    'symbol': 'symbol',
+    'strategy': 'strategy',
+    'live': 'live',
+}
+
+# Pragmas applied to every connection. synchronous=NORMAL is durable
+# across application crashes in WAL mode; only an OS crash can lose
+# the last committed transactions.
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -32000",        # ~32 MB page cache
+    "PRAGMA mmap_size = 268435456",      # 256 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+def _migration_1(conn, table):
+    """Initial layout (matches databases created before versioning)."""
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY,
+            symbol TEXT,
+            live INTEGER,
+            title TEXT,
+            description TEXT,
+            notes TEXT,
+            date TEXT,
+            equity_img BLOB,
+            drawdown_img BLOB,
+            histogram_img BLOB
+        )
+        """
+    )
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_date ON {table} (date, id)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_symbol ON {table} (symbol, date)")
+
+
+def _migration_2(conn, table):
+    """Metric columns and a full-text index over the text fields."""
+    for col, sqltype in (('strategy', 'TEXT'), ('final_value', 'REAL'), ('total_return', 'REAL'),
+                         ('sharpe', 'REAL'), ('max_drawdown', 'REAL'), ('total_trades', 'INTEGER')):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {sqltype}")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_symbol_nocase ON {table} (symbol COLLATE NOCASE, date)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_strategy ON {table} (strategy COLLATE NOCASE, sharpe)")
+    for col in ('sharpe', 'total_return', 'max_drawdown', 'final_value', 'total_trades'):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{col} ON {table} ({col})")
+
+    # External-content FTS table kept in sync by triggers
+    cols = ', '.join(TEXT_COLUMNS)
+    new_cols = ', '.join(f"new.{c}" for c in TEXT_COLUMNS)
+    old_cols = ', '.join(f"old.{c}" for c in TEXT_COLUMNS)
+    fts = f"{table}_fts"
+    conn.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id')")
+    conn.execute(
+        f"CREATE TRIGGER {table}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {table}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {table}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    )
+    # Index rows saved before this migration
+    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+# Ordered list of (version, callable(conn, table)); append new entries
+# for later format changes, never edit an existing one.
+MIGRATIONS = [
+    (1, _migration_1),
+    (2, _migration_2),
+]
+
+_FILTER_RE = re.compile(r'^(\w+)(>=|<=|!=|=|>|<|:)(.+)$')
+
+
+def search_clause(query: str, table: str = 'snapshots'):
+    """
+    Translate a search-bar query into (where_sql, args) for `table`.
+
+    Tokens of the form `field<op>value` filter on metric columns
+    (sharpe, return, drawdown, trades, final; ops > >= < <= = !=) and
+    `field:value` matches symbol/strategy/live exactly, ignoring case.
+    Every other word is a prefix match against the FTS5 text index.
+    Example: 'SmaCross sharpe > 1 symbol:SPY'. Returns ('', []) for an
+    empty query.
+    """
+    # Allow 'sharpe > 1' as well as 'sharpe>1'
+    query = re.sub(r'\s*(>=|<=|!=|=|>|<)\s*', r'\1', query or '')
+    clauses, args, words = [], [], []
+    for token in query.split():
+        m = _FILTER_RE.match(token)
+        field = m.group(1).lower() if m else None
+        if m and field in METRIC_FIELDS and m.group(2) != ':':
+            op = m.group(2)
+            try:
+                value = float(m.group(3))
+            except ValueError:
+                raise ValueError(f"'{m.group(3)}' is not a number in '{token}'")
+            clauses.append(f"{METRIC_FIELDS[field]} {op} ?")
+            args.append(value)
+        elif m and field in EXACT_FIELDS and m.group(2) in (':', '='):
+            clauses.append(f"{EXACT_FIELDS[field]} = ? COLLATE NOCASE")
+            args.append(m.group(3))
+        else:
+            # Quote each word so FTS5 operators in user text are literal
+            words.append('"' + token.replace('"', '""') + '"*')
+    if words:
+        clauses.append(f"id IN (SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH ?)")
+        args.append(' '.join(words))
+    return ' AND '.join(clauses), args
+
+
+class _FlushMarker:
+    """Queued by flush(); set once everything before it was written (or failed)."""
+    __slots__ = ('done', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class BatchWriter:
+    """
+    One write connection on a background thread. put() queues a statement
+    and returns at once; the thread runs whatever is waiting (up to
+    batch_size statements) in one transaction, consecutive statements
+    with the same SQL through executemany().
+
+    -- connect: callable returning a new sqlite3 connection
+    -- name: thread name, also used in log messages
+    -- batch_size: statements per transaction at most
+    """
+
+    def __init__(self, connect, name: str, batch_size: int = 64):
+        self.name = name
+        self.batch_size = batch_size
+        self._connect = connect
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, sql: str, args: tuple = ()):
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        self._queue.put((sql, args))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until everything queued so far is written. Returns False on
+        timeout; raises the sqlite3.Error of a batch that failed since the
+        previous flush.
+        """
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        if not marker.done.wait(timeout):
+            return False
+        if marker.error is not None:
+            raise marker.error
+        return True
+
+    def _loop(self):
+        conn = self._connect()
+        # Write failure not yet reported to a flush() caller
+        failure = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                # Drain whatever else is already waiting into the same batch
+                batch, markers, stop = [], [], False
+                while True:
+                    if isinstance(item, _FlushMarker):
+                        markers.append(item)
+                    elif item is None:
+                        stop = True
+                        break
+                    else:
+                        batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        with conn:
+                            for sql, group in itertools.groupby(batch, key=lambda entry: entry[0]):
+                                conn.executemany(sql, [args for _, args in group])
+                    except sqlite3.Error as e:
+                        logger.exception(f"{self.name}: failed to write a batch of {len(batch)} statement(s)")
+                        failure = e
+                for marker in markers:
+                    marker.error = failure
+                    marker.done.set()
+                if markers:
+                    failure = None
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def close(self):
+        """Write what is queued and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+
+class SnapshotStore:
+    """Owns all connections to the snapshot database."""
+
+    def __init__(self, db_path: str = 'snapshots.db', table: str = 'snapshots',
+                 pool_size: int = 4, batch_size: int = 64):
+        self.db_path = db_path
+        self.table = table
+        self.batch_size = batch_size
+
+        # Schema first, on a short-lived connection
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._migrate(conn)
+        finally:
+            conn.close()
+
+        # Read pool: connections are handed to one thread at a time
+        self._readers = queue.Queue()
+        for _ in range(pool_size):
+            self._readers.put(self._connect())
+
+        # Writer thread
+        self._closed = False
+        self._writer = BatchWriter(self._connect, "SnapshotStoreWriter", batch_size)
+        self._insert_sql = (
+            f"INSERT INTO {self.table} ({', '.join(SNAPSHOT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in SNAPSHOT_COLUMNS)})"
+        )
+
+    # -- connections ------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Borrow a read connection from the pool."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            # Never hand back a connection with an open read transaction
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    # -- schema -----------------------------------------------------------
+    def _migrate(self, conn):
+        conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        current = row[0] or 0
+        for version, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            # Explicit BEGIN: sqlite3 does not open a transaction for DDL itself
+            conn.execute("BEGIN")
+            try:
+                migrate(conn, self.table)
+                conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            logger.info(f"SnapshotStore: migrated {self.db_path} to schema v{version}")
+
+    def schema_version(self) -> int:
+        with self.reader() as conn:
+            return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+
+    # -- writes -----------------------------------------------------------
+    def insert(self, snapshot: dict):
+        """
+        Queue one snapshot for writing. Keys are SNAPSHOT_COLUMNS; missing
+        keys are stored as NULL. Returns immediately.
+        """
+        if self._closed:
+            raise RuntimeError("SnapshotStore is closed")
+        self._writer.put(self._insert_sql, tuple(snapshot.get(col) for col in SNAPSHOT_COLUMNS))
+
+    def insert_many(self, snapshots):
+        """Queue several snapshots (e.g. one per optimization run)."""
+        for snap in snapshots:
+            self.insert(snap)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued snapshot is written (see BatchWriter.flush)."""
+        return self._writer.flush(timeout)
+
+    # -- lifecycle --------------------------------------------------------
+    def close(self):
+        """Flush pending writes and close every connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
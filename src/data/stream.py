@@ -1,64 +1,489 @@
 # src/data/stream.py
 """
 LiveStreamer: provide real-time data via REST polling and WebSocket.
+
+StreamHub runs every REST poller and websocket subscription on a single
+asyncio event loop in a background thread, sharing one pooled aiohttp
+session. Received messages are gathered into batches and handed over
+through one thread-safe queue; QtStreamBridge drains that queue on the
+GUI thread, emits one signal per batch and hands each subscribed key its
+own messages. A hub has one consumer: RestStreamer and WebSocketStreamer
+share the hub's bridge (hub_bridge()) rather than draining it themselves.
+
+CoalescingDispatcher decodes raw messages on a worker thread and
+delivers at most one merged update per symbol per frame to the GUI. A
+websocket added with a sink skips the hub queue: the hub thread hands
+each raw message straight to the sink (e.g. dispatcher.submit), so the
+dispatcher's bounded inbox is the only backlog between socket and GUI.
 """
 
+import asyncio
+import itertools
 import json
+import queue
+import random
 import threading
-import time
-import requests
+import weakref
+
+import aiohttp
 from PySide6.QtCore import QObject, Signal, QTimer
-from PySide6.QtWebSockets import QWebSocket
+
+from src.utils.logger import logger
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON decoding
+    orjson = None
+
+
+class StreamHub:
+    """
+    Multiplex many REST pollers and websocket subscriptions on one
+    asyncio loop. Each source is identified by a caller-chosen key.
+
+    Batches put on `self.queue` are lists of (key, payload) tuples in
+    arrival order. Failed polls and dropped sockets are retried with
+    exponential backoff (plus jitter) up to backoff_max_s.
+    """
+
+    def __init__(self, batch_interval_s: float = 0.05, max_batch: int = 1000,
+                 backoff_initial_s: float = 0.5, backoff_max_s: float = 30.0,
+                 connection_limit: int = 32, request_timeout_s: float = 10.0, recorder=None):
+        self.queue = queue.Queue()
+        # Optional MarketRecorder; every received message is appended to it
+        self.recorder = recorder
+        self.batch_interval_s = batch_interval_s
+        self.max_batch = max_batch
+        self.backoff_initial_s = backoff_initial_s
+        self.backoff_max_s = backoff_max_s
+        self.connection_limit = connection_limit
+        self.request_timeout_s = request_timeout_s
+
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._tasks = {}
+        self._pending = []
+        self._ready = threading.Event()
+
+    # -- lifecycle --------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the event loop thread (no-op if already running)."""
+        if self.running:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="StreamHub", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, timeout: float = 5.0):
+        """Cancel all sources, flush what was received and stop the thread."""
+        if not self.running:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._startup())
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _startup(self):
+        connector = aiohttp.TCPConnector(limit=self.connection_limit)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout_s)
+        )
+        self._tasks['__flush__'] = asyncio.ensure_future(self._flush_loop())
+
+    async def _shutdown(self):
+        flusher = self._tasks.pop('__flush__', None)
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if flusher:
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+        self._flush()
+        await self._session.close()
+
+    # -- sources ----------------------------------------------------------
+    def add_rest_poller(self, key: str, url: str, interval_s: float = 5.0, params: dict = None):
+        """Poll `url` every interval_s seconds and publish each JSON response."""
+        self._submit(key, lambda: self._poll(key, url, interval_s, params))
+
+    def add_websocket(self, key: str, url: str, subscribe_msg: dict = None, sink=None):
+        """
+        Connect to `url`, send subscribe_msg and publish every JSON message.
+        With `sink`, each raw text message is passed to sink(text) on the
+        hub thread instead, undecoded and never queued.
+        """
+        self._submit(key, lambda: self._websocket(key, url, subscribe_msg, sink))
+
+    def remove(self, key: str):
+        """Stop and forget one source."""
+        if self.running:
+            self._loop.call_soon_threadsafe(self._cancel, key)
+
+    def sources(self):
+        return [k for k in self._tasks if k != '__flush__']
+
+    def _submit(self, key, make_coro):
+        if not self.running:
+            self.start()
+
+        def create():
+            self._cancel(key)
+            self._tasks[key] = asyncio.ensure_future(make_coro())
+        self._loop.call_soon_threadsafe(create)
+
+    def _cancel(self, key):
+        task = self._tasks.pop(key, None)
+        if task:
+            task.cancel()
+
+    async def _poll(self, key, url, interval_s, params):
+        delay = self.backoff_initial_s
+        while True:
+            try:
+                async with self._session.get(url, params=params) as resp:
+                    resp.raise_for_status()
+                    self._publish(key, await resp.json(content_type=None))
+                delay = self.backoff_initial_s
+                await asyncio.sleep(interval_s)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[StreamHub] {key}: error polling {url}: {e}; retry in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = self._next_delay(delay)
+
+    async def _websocket(self, key, url, subscribe_msg, sink):
+        delay = self.backoff_initial_s
+        while True:
+            try:
+                async with self._session.ws_connect(url, heartbeat=30,
+                                                   timeout=aiohttp.ClientWSTimeout(ws_close=self.request_timeout_s)) as ws:
+                    if subscribe_msg is not None:
+                        await ws.send_str(json.dumps(subscribe_msg))
+                    delay = self.backoff_initial_s
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT and sink is not None:
+                            self._hand_off(key, sink, msg.data)
+                        elif msg.type == aiohttp.WSMsgType.TEXT:
+                            try:
+                                self._publish(key, json.loads(msg.data))
+                            except ValueError as e:
+                                logger.warning(f"[StreamHub] {key}: invalid JSON: {e}")
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+                logger.info(f"[StreamHub] {key}: {url} closed; reconnecting in {delay:.1f}s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[StreamHub] {key}: websocket {url} failed: {e}; retry in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = self._next_delay(delay)
+
+    def _next_delay(self, delay):
+        return min(self.backoff_max_s, delay * 2) * random.uniform(0.9, 1.1)
+
+    def _hand_off(self, key, sink, raw):
+        if self.recorder is not None:
+            # Recordings hold decoded messages; only pay for it when recording
+            try:
+                self.recorder.record_message(key, json.loads(raw))
+            except ValueError:
+                pass
+        sink(raw)
+
+    # -- batching ---------------------------------------------------------
+    def _publish(self, key, payload):
+        if self.recorder is not None:
+            self.recorder.record_message(key, payload)
+        self._pending.append((key, payload))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self.queue.put(batch)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.batch_interval_s)
+            self._flush()
+
+    def drain(self) -> list:
+        """
+        Return every message queued so far as one flat list (non-blocking).
+        Drained messages are gone for every other reader; GUI code goes
+        through hub_bridge() instead.
+        """
+        out = []
+        while True:
+            try:
+                out.extend(self.queue.get_nowait())
+            except queue.Empty:
+                return out
+
+
+_default_hub = None
+
+
+def default_hub() -> StreamHub:
+    """Process-wide hub shared by the GUI streamers."""
+    global _default_hub
+    if _default_hub is None:
+        _default_hub = StreamHub()
+    return _default_hub
+
+
+class QtStreamBridge(QObject):
+    """
+    Drain a StreamHub queue on the GUI thread; one signal per tick.
+    subscribe(key, callback) also hands callback(list of payloads) the
+    messages of that key only.
+    """
+    batch_ready = Signal(list)
+
+    def __init__(self, hub: StreamHub, interval_ms: int = 50, parent=None):
+        super().__init__(parent)
+        self.hub = hub
+        self._subscribers = {}
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.poll)
+        self._timer.start(interval_ms)
+
+    def subscribe(self, key: str, callback):
+        self._subscribers[key] = callback
+
+    def unsubscribe(self, key: str):
+        self._subscribers.pop(key, None)
+
+    def poll(self):
+        batch = self.hub.drain()
+        if not batch:
+            return
+        self.batch_ready.emit(batch)
+        if self._subscribers:
+            by_key = {}
+            for key, payload in batch:
+                if key in self._subscribers:
+                    by_key.setdefault(key, []).append(payload)
+            for key, payloads in by_key.items():
+                callback = self._subscribers.get(key)
+                if callback is not None:
+                    callback(payloads)
+
+    def stop(self):
+        self._timer.stop()
+
+
+_bridges = weakref.WeakKeyDictionary()
+
+
+def hub_bridge(hub: StreamHub) -> QtStreamBridge:
+    """The one QtStreamBridge draining `hub` (created on first use, GUI thread)."""
+    bridge = _bridges.get(hub)
+    if bridge is None:
+        bridge = _bridges[hub] = QtStreamBridge(hub)
+    return bridge
+
+
+class CoalescingDispatcher(QObject):
+    """
+    Backpressure-aware delivery of streamed updates to the GUI thread.
+
+    submit() may be called from any thread with raw text/bytes or
+    already-decoded dicts. A worker thread decodes (with orjson when
+    available) and folds each update into the pending entry for its
+    symbol; every frame_ms the GUI thread takes the pending entries and
+    emits them as one {symbol: update} dict.
+
+    policy='merge'  - later fields update earlier ones within a frame
+    policy='latest' - only the newest update per symbol survives
+    When the inbound queue is full the oldest raw message is dropped.
+    """
+    frame_ready = Signal(dict)
+
+    POLICIES = ('merge', 'latest')
+
+    def __init__(self, frame_ms: int = 50, max_queue: int = 10000, policy: str = 'merge',
+                 symbol_key: str = 'symbol', use_orjson: bool = True, parent=None):
+        super().__init__(parent)
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown coalescing policy '{policy}', expected one of {self.POLICIES}")
+        self.policy = policy
+        self.symbol_key = symbol_key
+        self._loads = orjson.loads if (use_orjson and orjson is not None) else json.loads
+        self._inbox = queue.Queue(maxsize=max_queue)
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Counters are bumped from submitting threads, the worker and the GUI
+        self._count_lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ('received', 'decoded', 'coalesced', 'dropped', 'invalid', 'frames', 'delivered'), 0)
+
+        self._worker = threading.Thread(target=self._decode_loop, name="CoalescingDispatcher", daemon=True)
+        self._worker.start()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.deliver)
+        self._timer.start(frame_ms)
+
+    @property
+    def decoder(self) -> str:
+        return 'orjson' if self._loads is not json.loads else 'json'
+
+    def _count(self, name: str, n: int = 1):
+        with self._count_lock:
+            self._counters[name] += n
+
+    def submit(self, message):
+        """Queue one raw message (str/bytes) or decoded dict; never blocks."""
+        self._count('received')
+        while True:
+            try:
+                self._inbox.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self._inbox.get_nowait()
+                    self._count('dropped')
+                except queue.Empty:
+                    pass
+
+    def submit_batch(self, batch):
+        """Queue a StreamHub batch of (key, payload) tuples."""
+        for _, payload in batch:
+            self.submit(payload)
+
+    def _decode_loop(self):
+        while True:
+            message = self._inbox.get()
+            if message is None:
+                return
+            if isinstance(message, (str, bytes, bytearray)):
+                try:
+                    message = self._loads(message)
+                except ValueError as e:
+                    self._count('invalid')
+                    logger.warning(f"[CoalescingDispatcher] Invalid JSON: {e}")
+                    continue
+            self._count('decoded')
+            for update in (message if isinstance(message, list) else (message,)):
+                self._fold(update)
+
+    def _fold(self, update):
+        if not isinstance(update, dict):
+            self._count('invalid')
+            return
+        symbol = update.get(self.symbol_key)
+        with self._lock:
+            previous = self._pending.get(symbol)
+            if previous is not None:
+                self._count('coalesced')
+                if self.policy == 'merge':
+                    previous.update(update)
+                    return
+            self._pending[symbol] = dict(update)
+
+    def deliver(self):
+        """Emit everything pending as one frame (GUI thread)."""
+        with self._lock:
+            if not self._pending:
+                return
+            frame, self._pending = self._pending, {}
+        self._count('frames')
+        self._count('delivered', len(frame))
+        self.frame_ready.emit(frame)
+
+    def stats(self) -> dict:
+        """Counters plus the current inbound queue depth and pending symbols."""
+        with self._lock:
+            pending = len(self._pending)
+        with self._count_lock:
+            counters = dict(self._counters)
+        return {**counters, 'queue_depth': self._inbox.qsize(), 'pending': pending}
+
+    def stop(self):
+        self._timer.stop()
+        self._inbox.put(None)
+        self._worker.join(timeout=2)
 
 
 class RestStreamer(QObject):
     """Poll REST endpoint periodically and emit new data."""
     new_data = Signal(dict)
 
-    def __init__(self, url: str, interval_s: int = 5, parent=None):
+    _ids = itertools.count()
+
+    def __init__(self, url: str, interval_s: int = 5, parent=None, hub: StreamHub = None):
         super().__init__(parent)
         self.url = url
         self.interval_s = interval_s
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self.fetch)
+        # Requests run on the hub's event loop, never on the GUI thread
+        self.hub = hub or default_hub()
+        self.key = f"rest-{next(self._ids)}-{url}"
 
     def start(self):
-        self._timer.start(self.interval_s * 1000)
+        hub_bridge(self.hub).subscribe(self.key, self._on_messages)
+        self.hub.add_rest_poller(self.key, self.url, self.interval_s)
 
     def stop(self):
-        self._timer.stop()
+        self.hub.remove(self.key)
+        hub_bridge(self.hub).unsubscribe(self.key)
 
-    def fetch(self):
-        try:
-            resp = requests.get(self.url, timeout=5)
-            resp.raise_for_status()
-            data = resp.json()
+    def _on_messages(self, payloads):
+        for data in payloads:
             self.new_data.emit(data)
-        except Exception as e:
-            print(f"[RestStreamer] Error fetching {self.url}: {e}")
 
 
 class WebSocketStreamer(QObject):
     """Subscribe to a WebSocket feed and emit incoming messages."""
     new_data = Signal(dict)
 
-    def __init__(self, url: str, subscribe_msg: dict, parent=None):
+    _ids = itertools.count()
+
+    def __init__(self, url: str, subscribe_msg: dict, parent=None,
+                 dispatcher: CoalescingDispatcher = None, hub: StreamHub = None):
         super().__init__(parent)
-        self.socket = QWebSocket()
-        self.socket.connected.connect(self._on_connected)
-        self.socket.textMessageReceived.connect(self._on_message)
+        # With a dispatcher, raw messages go from the hub thread straight to
+        # dispatcher.submit and arrive coalesced on dispatcher.frame_ready
+        # instead of new_data
+        self.dispatcher = dispatcher
         self.url = url
         self.subscribe_msg = subscribe_msg
+        # The socket, its reconnects and JSON decoding live on the hub's loop
+        self.hub = hub or default_hub()
+        self.key = f"ws-{next(self._ids)}-{url}"
 
     def start(self):
-        self.socket.open(self.url)
+        if self.dispatcher is not None:
+            self.hub.add_websocket(self.key, self.url, self.subscribe_msg, sink=self.dispatcher.submit)
+            return
+        hub_bridge(self.hub).subscribe(self.key, self._on_messages)
+        self.hub.add_websocket(self.key, self.url, self.subscribe_msg)
 
-    def _on_connected(self):
-        self.socket.sendTextMessage(json.dumps(self.subscribe_msg))
+    def stop(self):
+        self.hub.remove(self.key)
+        if self.dispatcher is None:
+            hub_bridge(self.hub).unsubscribe(self.key)
 
-    def _on_message(self, msg: str):
-        try:
-            data = json.loads(msg)
+    def _on_messages(self, payloads):
+        for data in payloads:
             self.new_data.emit(data)
-        except Exception as e:
-            print(f"[WebSocketStreamer] Invalid JSON: {e}")
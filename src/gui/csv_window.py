@@ -1,9 +1,9 @@
 # src/gui/csv_window.py
 
 import pandas as pd
-import backtrader as bt
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QFileDialog, QMessageBox, QTableWidget, QTableWidgetItem
 from src.backtester.engine import BacktestEngine
+from src.data.feeds import ArrayData, OHLCVArrays
 from src.utils.logger import logger
 
 class CsvBacktestWindow(QWidget):
@@ -16,6 +16,8 @@ class CsvBacktestWindow(QWidget):
         self.engine = None
         self.data_rows = 0
         self.df = pd.DataFrame()
+        # (df, arrays): converted once per loaded CSV and shared by every run's feed
+        self._arrays = None
 
         layout = QVBoxLayout(self)
         self.load_btn = QPushButton("Browse CSV File...")
@@ -51,17 +53,9 @@ class CsvBacktestWindow(QWidget):
                 self.table.setItem(i, j, QTableWidgetItem(txt))
 
     def get_datafeed(self):
-        """Return list of bt.feeds.PandasData created from loaded CSV"""
+        """Return list with one ArrayData feed built from the loaded CSV"""
         if self.data_rows == 0:
             raise RuntimeError("No CSV loaded - please browse first.")
-        df = self.df.copy()
-        df.rename(columns={"Date":"datetime"}, inplace=True)
-        df.set_index("datetime", inplace=True)
-        df["openinterest"] = 0
-        feed = bt.feeds.PandasData(
-            dataname=df,
-            datetime=None,
-            open="Open", high="High", low="Low",
-            close="Close", volume="Volume", openinterest="openinterest"
-        )
-        return [feed]
+        if self._arrays is None or self._arrays[0] is not self.df:
+            self._arrays = (self.df, OHLCVArrays.from_dataframe(self.df))
+        return [ArrayData(dataname=self._arrays[1])]
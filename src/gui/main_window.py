@@ -1,7 +1,7 @@
 # src/gui/main_window.py
 import sys
-import sqlite3
 import os
+import sqlite3
 from datetime import datetime
 from io import BytesIO
 
@@ -10,16 +10,15 @@ from PySide6.QtWidgets import (
     QSplitter, QTabWidget, QPushButton, QLineEdit, QTextEdit,
     QLabel, QCheckBox, QDateEdit, QFormLayout, QMessageBox,
     QTableWidget, QTableWidgetItem, QHeaderView, QDialog,
-    QHBoxLayout, QVBoxLayout, QScrollArea
+    QHBoxLayout, QVBoxLayout, QScrollArea, QTableView
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThreadPool, QTimer
 from PySide6.QtWidgets import QHeaderView
 from src.gui.report_generator import ReportGenerator
 from PySide6.QtWidgets import QPushButton, QFileDialog
 
 from PySide6.QtWebEngineWidgets import QWebEngineView
 import plotly.graph_objs as go
-from plotly.subplots import make_subplots
 
 import backtrader as bt
 from matplotlib.backends.backend_qtagg import (
@@ -34,57 +33,35 @@ from src.gui.data_source_widget import DataSourceWidget
 from src.gui.strategy_selector_widget import StrategySelectorWidget
 from src.gui.csv_window import CsvBacktestWindow
 from src.gui.ws_window import WsBacktestWindow
-
-# --- BEGIN MONKEY-PATCH FOR BACKTRADER ---
-# This is a global fix for older backtrader versions where PandasData
-# objects are created without the necessary '_tz' attribute.
-
-# 1. Store the original __init__ method
-_original_pandas_data_init = bt.feeds.PandasData.__init__
-
-
-def _patched_pandas_data_init(self, *args, **kwargs):
-    """A new __init__ that calls the original and then fixes the object."""
-    # 2. Call the original __init__ to let it do its work
-    _original_pandas_data_init(self, *args, **kwargs)
-
-    # 3. After initialization, forcefully ensure '_tz' exists.
-    #    It checks if a 'tz' parameter was passed, otherwise defaults to None.
-    self._tz = getattr(self.p, 'tz', None)
-
-    # Fix _calendar to avoid attribute errors in optimization
-    if not hasattr(self, '_calendar'):
-        self._calendar = None
-    if not hasattr(self, 'fromdate'):
-        self.fromdate = None
-    if not hasattr(self, 'todate'):
-        self.todate = None
-
-    self.sessionstart = getattr(self, 'sessionstart', None)
-    self.sessionend = getattr(self, 'sessionend', None)
-# 4. Replace the original __init__ with our patched version
-bt.feeds.PandasData.__init__ = _patched_pandas_data_init
-
-# --- END MONKEY-PATCH FOR BACKTRADER ---
+from src.gui.snapshot_history import SnapshotHistoryModel, PreviewLoader
+from src.data.snapshot_store import SnapshotStore
+from src.backtester.analyzers import EquityRecorder, TradeRecorder
+from src.backtester.hotloop import collect_stats, profiled
+from src.backtester.metrics import (
+    drawdown_pct, equity_dates, equity_metrics, trade_metrics
+)
+from src.optimizer.pool import current_pool, shutdown_pool
+from src.utils.paths import database_path
+from src.utils.profiling import RunProfiler, phase
+from src.viz.dashboard import build_dashboard, dashboard_series
 
 
-# SQLite database file
-DB_PATH = 'snapshots.db'
+# SQLite database file, in the per-user data directory
+DB_NAME = 'snapshots.db'
 TABLE_NAME = 'snapshots'
 
 class ImagePreviewDialog(QDialog):
-    def __init__(self, eq_blob, dd_blob, hist_blob, parent=None):
+    def __init__(self, eq_img, dd_img, hist_img, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Snapshot Preview")
         # allow interaction
         scroll = QScrollArea(self)
         container = QWidget()
         layout = QHBoxLayout(container)
-        for blob, title in [(eq_blob, 'Equity'), (dd_blob, 'Drawdown'), (hist_blob, 'Histogram')]:
-            pix = QPixmap()
-            pix.loadFromData(blob)
+        # images arrive already decoded and scaled by PreviewLoader
+        for img, title in [(eq_img, 'Equity'), (dd_img, 'Drawdown'), (hist_img, 'Histogram')]:
             label = QLabel()
-            label.setPixmap(pix.scaled(1920, 1080, Qt.KeepAspectRatio))
+            label.setPixmap(QPixmap.fromImage(img))
             sub = QVBoxLayout()
             sub.addWidget(QLabel(title))
             sub.addWidget(label)
@@ -164,6 +141,37 @@ class MainWindow(QMainWindow):
         metrics_layout.addWidget(self.metrics_table)
         tabs.addTab(metrics_tab, "Metrics")
 
+        # Performance Tab: per-phase timings of the last backtest/report
+        perf_tab = QWidget()
+        perf_layout = QVBoxLayout(perf_tab)
+        perf_controls = QHBoxLayout()
+        self.capture_checkbox = QCheckBox("Capture cProfile")
+        perf_controls.addWidget(self.capture_checkbox)
+        self.hotloop_checkbox = QCheckBox("Profile strategy hot loop")
+        perf_controls.addWidget(self.hotloop_checkbox)
+        perf_controls.addStretch()
+        self.export_profile_button = QPushButton("Export JSON")
+        self.export_profile_button.clicked.connect(self._export_profile)
+        perf_controls.addWidget(self.export_profile_button)
+        perf_layout.addLayout(perf_controls)
+        self.perf_table = QTableWidget(0, 6)
+        self.perf_table.setHorizontalHeaderLabels(
+            ["Phase", "Wall (s)", "CPU (s)", "Bars/s", "RSS Δ (MB)", "Peak RSS (MB)"])
+        self.perf_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        perf_layout.addWidget(self.perf_table)
+        self.profile_text = QTextEdit()
+        self.profile_text.setReadOnly(True)
+        self.profile_text.setLineWrapMode(QTextEdit.NoWrap)
+        perf_layout.addWidget(self.profile_text)
+        # Health of the worker pool that runs sweeps and walk-forward tests
+        self.pool_label = QLabel("Worker pool: not started")
+        perf_layout.addWidget(self.pool_label)
+        self._pool_timer = QTimer(self)
+        self._pool_timer.timeout.connect(self._show_pool_health)
+        self._pool_timer.start(2000)
+        tabs.addTab(perf_tab, "Performance")
+        self.last_profile = None
+
         # Upload/History Tab
         upload_tab = QWidget()
         upload_layout = QVBoxLayout(upload_tab)
@@ -191,11 +199,24 @@ class MainWindow(QMainWindow):
         self.refresh_button.clicked.connect(self._load_history)
         btn_layout.addWidget(self.refresh_button)
         upload_layout.addLayout(btn_layout)
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(['ID', 'Symbol', 'Date', 'Title', 'Live'])
+        # Search bar: free text plus metric filters, e.g. "SmaCross sharpe>1 symbol:SPY"
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search snapshots, e.g. SmaCross sharpe>1 symbol:SPY")
+        self.search_input.returnPressed.connect(self._search_history)
+        search_layout.addWidget(self.search_input)
+        self.search_button = QPushButton("Search")
+        self.search_button.clicked.connect(self._search_history)
+        search_layout.addWidget(self.search_button)
+        upload_layout.addLayout(search_layout)
+        # History view pages rows in from SQLite as the user scrolls
+        self.history_model = SnapshotHistoryModel(self.store, self)
+        self.table = QTableView()
+        self.table.setModel(self.history_model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.cellClicked.connect(self._on_table_click)
+        self.table.clicked.connect(self._on_table_click)
+        self._preview_loader = None
         upload_layout.addWidget(self.table)
         tabs.addTab(upload_tab, "Upload/History")
 
@@ -212,26 +233,25 @@ class MainWindow(QMainWindow):
         self._load_history()
 
     def _init_db(self):
-        self.conn = sqlite3.connect(DB_PATH)
-        cur = self.conn.cursor()
-        cur.execute(
-            f"""
-            CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
-                id INTEGER PRIMARY KEY,
-                symbol TEXT,
-                live INTEGER,
-                title TEXT,
-                description TEXT,
-                notes TEXT,
-                date TEXT,
-                equity_img BLOB,
-                drawdown_img BLOB,
-                histogram_img BLOB
-            )
-            """
-        )
-        self.conn.commit()
-        cur.close()
+        # Schema creation and migrations are handled by the store
+        self.store = SnapshotStore(database_path(DB_NAME), TABLE_NAME)
+
+    def closeEvent(self, event):
+        self.store.close()
+        self._pool_timer.stop()
+        shutdown_pool()
+        super().closeEvent(event)
+
+    def _show_pool_health(self):
+        pool = current_pool()
+        if pool is None:
+            return
+        h = pool.health()
+        self.pool_label.setText(
+            f"Worker pool: {h['ready']}/{h['workers']} ready, {h['busy']} busy, {h['queued']} queued | "
+            f"{h['completed']} tasks, {h['failed']} failed, {h['restarts']} restarts | "
+            f"utilization {h['utilization']:.0%} | {h['datasets']} datasets cached "
+            f"({h['dataset_hits']} hits, {h['dataset_misses']} misses)")
 
     def _setup_plots(self, layout):
         def make_canvas(title, ax_setup, xlabel, ylabel):
@@ -279,12 +299,21 @@ class MainWindow(QMainWindow):
         dlg.exec_()
 
     def _run_backtest(self):
-        self.last_pnl = {}
-        self.last_trade_analysis = None
         """
         Launches the backtest using the selected data source and strategy,
-        then plots results in the Results tab.
+        then plots results in the Results tab. Each phase is timed and shown
+        in the Performance tab.
         """
+        capture = 'cprofile' if self.capture_checkbox.isChecked() else None
+        with RunProfiler(capture=capture) as prof:
+            with phase('backtest'):
+                self._execute_backtest()
+        self._show_profile(prof)
+
+    def _execute_backtest(self):
+        self.last_equity = None
+        self.last_trades = None
+        self.last_run_summary = {}
         # 1) Retrieve strategy and params
         try:
             strat_cls, params = self.strategy_selector.get_strategy()
@@ -294,140 +323,75 @@ class MainWindow(QMainWindow):
 
         # 2) Get data feeds
         try:
-            if self.data_source_widget.current_source == self.data_source_widget.OPTION_CSV:
-                feeds = self.csv_widget.get_datafeed()
-            else:
-                feeds = self.ws_widget.get_datafeed()
+            with phase('build_feed'):
+                if self.data_source_widget.current_source == self.data_source_widget.OPTION_CSV:
+                    feeds = self.csv_widget.get_datafeed()
+                else:
+                    feeds = self.ws_widget.get_datafeed()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Data feed error: {e}")
             return
 
         # 3) Setup Cerebro
         cerebro = bt.Cerebro()
-        print("RUNNING BACKTEST WITH FEEDS:", feeds)
         for fd in feeds:
             cerebro.adddata(fd)
+        if self.hotloop_checkbox.isChecked():
+            strat_cls = profiled(strat_cls)
         cerebro.addstrategy(strat_cls, **params)
-        cerebro.addanalyzer(bt.analyzers.TimeReturn, _name='returns')
-        cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-
-        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trade')
+        # Equity/cash/position per bar and one row per closed trade, as arrays
+        cerebro.addanalyzer(EquityRecorder, _name='equity')
+        cerebro.addanalyzer(TradeRecorder, _name='trades')
         # 4) Run and collect results
         try:
-            res = cerebro.run()[0]
+            with phase('cerebro.run') as rec:
+                res = cerebro.run()[0]
+                rec['bars'] = len(cerebro.datas[0])
+                if self.hotloop_checkbox.isChecked():
+                    rec['strategies'] = collect_stats([res])
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Backtest failed: {e}")
             return
 
-        pnl = res.analyzers.returns.get_analysis()
-        # --- BEGIN FALLBACK FOR EMPTY PNL ---
-        if not pnl:
-            # No return series (e.g. flat data) → use starting and ending cash
-            start_cash = cerebro.broker.startingcash if hasattr(cerebro.broker,'startingcash') else cerebro.broker.getcash()
-            end_cash = res.broker.getvalue()
-            pnl = {0: start_cash, 1: end_cash}
-        # --- END FALLBACK ---
-        self.last_pnl = pnl
-        dd  = res.analyzers.drawdown.get_analysis()
-        ta = res.analyzers.trade.get_analysis()
-        self.last_trade_analysis = res.analyzers.trade.get_analysis()
-
-        # dates = list(pnl.keys())
-        # vals  = list(pnl.values())
+        with phase('analyzers'):
+            equity = res.analyzers.equity.get_analysis()
+            trades = res.analyzers.trades.get_analysis()
+        self.last_equity, self.last_trades = equity, trades
 
         # Prepare series
-        dates = list(pnl.keys())
-        equity_vals = np.array(list(pnl.values()))
-        # Safe drawdown calculation: avoid divide-by-zero
-        cummax = np.maximum.accumulate(equity_vals)
-        drawdown_pct = np.where(cummax > 0, (equity_vals - cummax) / cummax * 100, 0)
-
-        # Returns series and rolling metrics
-        returns = np.diff(equity_vals)
-        rolling_sharpe = []
-        window = 20  # 20-period rolling
-        for i in range(len(returns)):
-            if i < window:
-                rolling_sharpe.append(None)
-            else:
-                rw = returns[i - window + 1:i + 1]
-                sr = (np.mean(rw) / np.std(rw, ddof=1)) * np.sqrt(window) if np.std(rw, ddof=1) != 0 else 0
-                rolling_sharpe.append(sr)
-        # pad to full length
-        rolling_sharpe = [None] + rolling_sharpe  # align length with dates
-
-        # Build a 2x2 dashboard: equity, drawdown, returns hist, rolling Sharpe
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Equity Curve', 'Drawdown (%)', 'Returns Distribution', 'Rolling Sharpe'),
-            vertical_spacing=0.2, horizontal_spacing=0.1
-        )
-        # Equity Curve
-        fig.add_trace(go.Scatter(x=dates, y=equity_vals, mode='lines', name='Equity'), row=1, col=1)
-        # Drawdown
-        fig.add_trace(go.Bar(x=dates, y=drawdown_pct, name='Drawdown'), row=1, col=2)
-        # Returns Histogram
-        fig.add_trace(go.Histogram(x=returns, nbinsx=30, name='Returns'), row=2, col=1)
-        # Rolling Sharpe
-        fig.add_trace(go.Scatter(x=dates, y=rolling_sharpe, mode='lines', name='Rolling Sharpe'), row=2, col=2)
-
-        fig.update_layout(
-            title='Backtest Performance Dashboard',
-            height=800, width=1200,
-            showlegend=False
-        )
-
-        # Render and display
-        html_str = fig.to_html(include_plotlyjs='cdn')
-        self.plotly_view.setHtml(html_str)
-
-        self.eq_plot = go.Figure(go.Scatter(x=dates, y=equity_vals, mode='lines'))
-        self.dd_plot = go.Figure(go.Bar(x=dates, y=drawdown_pct))
-        self.ret_plot = go.Figure(go.Histogram(x=np.diff(equity_vals), nbinsx=30))
-
-
-        # Compute metrics
-        total_trades = getattr(getattr(ta, 'total', {}), 'closed', 0)
-        wins = getattr(getattr(ta, 'won', {}), 'total', 0)
-        losses = getattr(getattr(ta, 'lost', {}), 'total', 0)
-        win_rate = (wins / total_trades * 100) if total_trades else 0
-        # Gather per-trade durations and profits if available
-        hold_times = []
-        profits = []
-        try:
-            trades = ta.trades  # may KeyError if not present
-        except KeyError:
-            trades = {}
-        for t in trades.values():
-            hold_times.append(t.get('duration', 0))
-            profits.append(t.get('profit', 0))
-        avg_hold = (sum(hold_times) / len(hold_times)) if hold_times else 0
-        # average profit/loss
-        avg_profit = (sum(p for p in profits if p > 0) / wins) if wins else 0
-        avg_loss = (sum(p for p in profits if p < 0) / losses) if losses else 0
-        # expectancy = win_rate% * avg_profit + loss_rate% * avg_loss
-        expectancy = ((wins / total_trades) * avg_profit + (losses / total_trades) * avg_loss) if total_trades else 0
-
-        # max consecutive losses
-        def get_attr_safe(obj, name):
-            try:
-                return getattr(obj, name)
-            except Exception:
-                return 0
-
-        max_consec_loss = get_attr_safe(getattr(ta, 'streak', {}), 'down')
+        start_value = cerebro.broker.startingcash
+        with phase('metrics', bars=len(equity)):
+            series = dashboard_series(equity)
+            em = equity_metrics(series['equity_vals'], start_value=start_value)
+            tm = trade_metrics(trades)
+
+        with phase('plotly', bars=len(equity)):
+            fig = build_dashboard(**series)
+            html_str = fig.to_html(include_plotlyjs='cdn')
+        with phase('setHtml'):
+            self.plotly_view.setHtml(html_str)
+
+        # Headline numbers saved with snapshots (searchable in Upload/History)
+        self.last_run_summary = {
+            'strategy': strat_cls.__name__,
+            'final_value': res.broker.getvalue(),
+            'total_return': em['total_return'],
+            'sharpe': em['sharpe'],
+            'max_drawdown': em['max_drawdown'],
+            'total_trades': tm['total_trades'],
+        }
 
         # 4. Populate metrics table:
         # ---------------------------
         self.metrics_table.setRowCount(0)
         metrics = [
-            ("Total Trades", total_trades),
-            ("Winning Trades", wins),
-            ("Losing Trades", losses),
-            ("Win Rate (%)", f"{win_rate:.2f}"),
-            ("Avg Hold Time (bars)", f"{avg_hold:.1f}"),
-            ("Expectancy", f"{expectancy:.2f}"),
-            ("Max Consecutive Losses", max_consec_loss)
+            ("Total Trades", tm['total_trades']),
+            ("Winning Trades", tm['wins']),
+            ("Losing Trades", tm['losses']),
+            ("Win Rate (%)", f"{tm['win_rate']:.2f}"),
+            ("Avg Hold Time (bars)", f"{tm['avg_hold']:.1f}"),
+            ("Expectancy", f"{tm['expectancy']:.2f}"),
+            ("Max Consecutive Losses", tm['max_consec_losses'])
         ]
         for i, (label, value) in enumerate(metrics):
             self.metrics_table.insertRow(i)
@@ -442,62 +406,88 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+    def _show_profile(self, prof):
+        """Fill the Performance tab from a finished RunProfiler."""
+        self.last_profile = prof
+        self.perf_table.setRowCount(0)
+
+        def fmt(value, spec):
+            return '' if value is None else format(value, spec)
+
+        for i, rec in enumerate(prof.phases):
+            self.perf_table.insertRow(i)
+            row = [
+                '    ' * rec['depth'] + rec['name'],
+                fmt(rec.get('wall_s'), '.3f'),
+                fmt(rec.get('cpu_s'), '.3f'),
+                fmt(rec.get('bars_per_s'), ',.0f'),
+                fmt(rec.get('rss_delta_mb'), '.1f'),
+                fmt(rec.get('peak_rss_mb'), '.0f'),
+            ]
+            for col, text in enumerate(row):
+                self.perf_table.setItem(i, col, QTableWidgetItem(text))
+
+        # Per-strategy hot-loop breakdown (if recorded), then the cProfile text
+        lines = []
+        for rec in prof.phases:
+            for st in rec.get('strategies', ()):
+                lines.append(
+                    f"{st['strategy']}: next {st['next_s']:.4f}s ({st['next_us_per_bar']:.2f} us/bar), "
+                    f"notify_order {st['notify_order_s']:.4f}s ({st['notify_order_calls']} calls), "
+                    f"notify_trade {st['notify_trade_s']:.4f}s ({st['notify_trade_calls']} calls), "
+                    f"orders/bar {st['orders_per_bar']:.4f}, cancels/bar {st['cancels_per_bar']:.4f}"
+                )
+        if lines:
+            lines.append('')
+        self.profile_text.setPlainText('\n'.join(lines) + prof.capture_text)
+
+    def _export_profile(self):
+        """Save the last run's phase timings (and cProfile text) as JSON."""
+        if self.last_profile is None:
+            QMessageBox.warning(self, "No Data", "Run a backtest before exporting its profile.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Profile", "run_profile.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.last_profile.to_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, 'Export Error', str(e))
+
     def _export_report(self):
         """
         Gather the latest backtest data (equity, drawdown, returns, metrics, trades) and generate HTML and PDF reports.
         """
         # Ensure we have run results
-        if not hasattr(self, 'last_pnl') or not self.last_pnl:
+        equity = getattr(self, 'last_equity', None)
+        if equity is None or not len(equity):
             QMessageBox.warning(self, "No Data", "Run a backtest before exporting a report.")
             return
 
         # Prepare series
-        dates = list(self.last_pnl.keys())
-        equity_vals = list(self.last_pnl.values())
-
-        # Drawdown and returns
-        import numpy as np
-        equity_arr = np.array(equity_vals)
-        cummax = np.maximum.accumulate(equity_arr)
-        drawdown_pct = np.where(cummax > 0,
-                                (equity_arr - cummax) / cummax * 100,
-                                0).tolist()
-        returns = np.diff(equity_arr).tolist()
+        dates = equity_dates(equity).tolist()
+        equity_vals = equity['equity'].tolist()
+        drawdown = drawdown_pct(equity['equity'])
 
         # Trade metrics and log
-        ta = getattr(self, 'last_trade_analysis', None)
-        metrics = {}
-        trades_table = []
-        if ta:
-            total = getattr(getattr(ta, 'total', {}), 'closed', 0)
-            won = getattr(getattr(ta, 'won', {}), 'total', 0)
-            lost = getattr(getattr(ta, 'lost', {}), 'total', 0)
-            win_rate = (won / total * 100) if total else 0
-            metrics = {
-                'Total Trades': total,
-                'Winning Trades': won,
-                'Losing Trades': lost,
-                'Win Rate (%)': f"{win_rate:.2f}"
+        trades = self.last_trades
+        tm = trade_metrics(trades)
+        metrics = {
+            'Total Trades': tm['total_trades'],
+            'Winning Trades': tm['wins'],
+            'Losing Trades': tm['losses'],
+            'Win Rate (%)': f"{tm['win_rate']:.2f}"
+        }
+        trades_table = [
+            {
+                'Trade ID': int(t['ref']),
+                'Entry Bar': int(t['entry_bar']),
+                'Exit Bar': int(t['exit_bar']),
+                'Profit': round(float(t['pnlcomm']), 2),
+                'Duration': int(t['duration'])
             }
-            try:
-                trades_dict = ta.trades
-            except KeyError:
-                trades_dict = {}
-            for tradeid, t in trades_dict.items():
-                entry = t.get('entrybar', '')
-                exit_ = t.get('exitbar', '')
-                profit = t.get('profit', 0)
-                duration = t.get('duration', 0)
-                trades_table.append({
-                    'Trade ID': tradeid,
-                    'Entry Bar': entry,
-                    'Exit Bar': exit_,
-                    'Profit': profit,
-                    'Duration': duration
-                })
-        else:
-            metrics = {self.metrics_table.item(i, 0).text(): self.metrics_table.item(i, 1).text()
-                       for i in range(self.metrics_table.rowCount())}
+            for t in trades
+        ]
 
         # Ask user where to save
         pdf_path, _ = QFileDialog.getSaveFileName(self, "Save Report", "", "PDF Files (*.pdf)")
@@ -506,33 +496,29 @@ class MainWindow(QMainWindow):
         if not pdf_path.lower().endswith('.pdf'):
             pdf_path += '.pdf'
 
-        # Generate embedded Plotly divs from stored figures
-        equity_div = self.eq_plot.to_html(full_html=False, include_plotlyjs='cdn') if hasattr(self,
-                                                                                              'eq_plot') else "<p>No Equity Chart</p>"
-        drawdown_div = self.dd_plot.to_html(full_html=False, include_plotlyjs='cdn') if hasattr(self,
-                                                                                                'dd_plot') else "<p>No Drawdown Chart</p>"
-        returns_div = self.ret_plot.to_html(full_html=False, include_plotlyjs='cdn') if hasattr(self,
-                                                                                                'ret_plot') else "<p>No Returns Chart</p>"
-
-        # Build context for report
+        # Build context for report; ReportGenerator renders the charts as
+        # static images from dates/equity_vals (PDFs cannot run Plotly JS)
         context = {
             'title': f"Backtest Report: {self.title_input.text()}",
             'date': self.date_input.date().toString('yyyy-MM-dd'),
-            'equity_div': equity_div,
-            'drawdown_div': drawdown_div,
-            'returns_div': returns_div,
+            'dates': dates,
+            'equity_vals': equity_vals,
             'metrics': metrics,
             'trades_table': trades_table,
             'final_value': f"{equity_vals[-1]:.2f}",
-            'max_drawdown': f"{min(drawdown_pct):.2f}%",
+            'max_drawdown': f"{drawdown.min():.2f}%",
             'cagr': (lambda ev: f"{(((ev[-1]/ev[0])**(1/(len(ev)-1))) - 1)*100:.2f}%" if len(ev)>1 and ev[0]!=0 else "0.00%")(equity_vals)
         }
 
         # Generate and save report
+        # (report phases replace the backtest's in the Performance tab)
         rg = ReportGenerator(template_dir=os.path.join(os.path.dirname(__file__), '../../templates'))
         try:
-            html_file, pdf_file = rg.generate_report(context, output_dir=os.getcwd(),
-                                                     filename=os.path.basename(pdf_path))
+            capture = 'cprofile' if self.capture_checkbox.isChecked() else None
+            with RunProfiler(capture=capture) as prof:
+                html_file, pdf_file = rg.generate_report(context, output_dir=os.getcwd(),
+                                                         filename=os.path.basename(pdf_path))
+            self._show_profile(prof)
             QMessageBox.information(self, 'Report Saved', f"Report saved as:{pdf_file}")
 
             # # Optional: export CSV of trades
@@ -551,27 +537,19 @@ class MainWindow(QMainWindow):
         Capture the last run’s charts (equity, drawdown, returns) via Plotly
         and save them to the SQLite database as PNG blobs.
         """
-        import numpy as np
         import plotly.graph_objs as go
         import plotly.io as pio
-        from io import BytesIO
 
-        # 1) Validate that we've run a backtest and have PnL
-        if not hasattr(self, 'last_pnl') or not self.last_pnl:
+        # 1) Validate that we've run a backtest
+        equity = getattr(self, 'last_equity', None)
+        if equity is None or not len(equity):
             QMessageBox.warning(self, "No Backtest", "Please run a backtest before saving a snapshot.")
             return
 
         # 2) Prepare series
-        dates = list(self.last_pnl.keys())
-        equity_vals = np.array(list(self.last_pnl.values()))
-
-        # Drawdown series (%)
-        cummax = np.maximum.accumulate(equity_vals)
-        drawdown_pct = np.where(cummax > 0,
-                                (equity_vals - cummax) / cummax * 100,
-                                0)
-
-        # Returns series
+        dates = equity_dates(equity)
+        equity_vals = equity['equity']
+        drawdown = drawdown_pct(equity_vals)
         returns = np.diff(equity_vals)
 
         # 3) Build Plotly figures
@@ -587,7 +565,7 @@ class MainWindow(QMainWindow):
 
         # 3.2 Drawdown
         dd_fig = go.Figure(go.Bar(
-            x=dates, y=drawdown_pct.tolist(), name='Drawdown'
+            x=dates, y=drawdown, name='Drawdown'
         ))
         dd_fig.update_layout(
             title='Drawdown (%)',
@@ -611,47 +589,63 @@ class MainWindow(QMainWindow):
         dd_blob   = pio.to_image(dd_fig, format='png', width=1080, height=700, scale=2)
         hist_blob = pio.to_image(hist_fig, format='png', width=1080, height=700, scale=2)
 
-        # 5) Write to SQLite
-        cur = self.conn.cursor()
-        cur.execute(
-            f"INSERT INTO {TABLE_NAME} "
-            "(symbol, live, title, description, notes, date, equity_img, drawdown_img, histogram_img) "
-            "VALUES (?,?,?,?,?,?,?,?,?)",
-            (
-                self.symbol_input.text(),
-                int(self.live_checkbox.isChecked()),
-                self.title_input.text(),
-                self.desc_input.text(),
-                self.notes_input.toPlainText(),
-                self.date_input.date().toString('yyyy-MM-dd'),
-                eq_blob, dd_blob, hist_blob
-            )
-        )
-        self.conn.commit()
-        cur.close()
+        # 5) Queue for the store's writer thread; wait only for this row
+        self.store.insert({
+            'symbol': self.symbol_input.text(),
+            'live': int(self.live_checkbox.isChecked()),
+            'title': self.title_input.text(),
+            'description': self.desc_input.text(),
+            'notes': self.notes_input.toPlainText(),
+            'date': self.date_input.date().toString('yyyy-MM-dd'),
+            'equity_img': eq_blob,
+            'drawdown_img': dd_blob,
+            'histogram_img': hist_blob,
+            **getattr(self, 'last_run_summary', {}),
+        })
+        try:
+            saved = self.store.flush(timeout=5)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, 'Save Error', f'Snapshot could not be saved: {e}')
+            return
+        if not saved:
+            QMessageBox.critical(self, 'Save Error',
+                                 'The database did not confirm the snapshot within 5 seconds.')
+            return
 
         QMessageBox.information(self, 'Saved', 'Snapshot saved to database.')
         self._load_history()
 
     def _load_history(self):
-        cur = self.conn.cursor()
-        cur.execute(f"SELECT id, symbol, date, title, live FROM {TABLE_NAME} ORDER BY date DESC")
-        rows = cur.fetchall()
-        self.table.setRowCount(len(rows))
-        for i, row in enumerate(rows):
-            for j, val in enumerate(row):
-                self.table.setItem(i, j, QTableWidgetItem(str(val)))
-        cur.close()
-
-    def _on_table_click(self, row, col):
-        cur = self.conn.cursor()
-        snapshot_id = int(self.table.item(row, 0).text())
-        cur.execute(f"SELECT equity_img, drawdown_img, histogram_img FROM {TABLE_NAME} WHERE id = ?", (snapshot_id,))
-        eq, dd, hist = cur.fetchone()
-        cur.close()
-        dlg = ImagePreviewDialog(eq, dd, hist, self)
+        # Only the first page is queried; the view fetches more on scroll
+        self.history_model.refresh()
+
+    def _search_history(self):
+        try:
+            self.history_model.set_query(self.search_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Search", str(e))
+
+    def _on_table_click(self, index):
+        snapshot_id = self.history_model.snapshot_id(index.row())
+        # Images are read and decoded on a worker; the dialog opens when ready
+        loader = PreviewLoader(self.store, snapshot_id)
+        loader.signals.loaded.connect(self._on_preview_loaded)
+        loader.signals.failed.connect(self._on_preview_failed)
+        self._preview_loader = loader
+        QThreadPool.globalInstance().start(loader)
+
+    def _on_preview_loaded(self, snapshot_id, images):
+        # Ignore results for a row the user has already clicked away from
+        if self._preview_loader is None or self._preview_loader.snapshot_id != snapshot_id:
+            return
+        self._preview_loader = None
+        dlg = ImagePreviewDialog(*images, parent=self)
         dlg.exec()
 
+    def _on_preview_failed(self, snapshot_id, message):
+        self._preview_loader = None
+        QMessageBox.critical(self, "Preview Error", f"Could not load snapshot {snapshot_id}: {message}")
+
     def _on_pick(self, event):
         """
         Handler for matplotlib pick events; currently no-op.
@@ -1,23 +1,48 @@
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QLabel,
-    QSpinBox, QDoubleSpinBox, QPushButton, QTableWidget,
-    QTableWidgetItem, QHBoxLayout, QMessageBox
+    QSpinBox, QDoubleSpinBox, QPushButton, QTableView, QLineEdit,
+    QHBoxLayout, QMessageBox, QFileDialog, QComboBox, QCheckBox, QTabWidget
 )
-from PySide6.QtCore import Qt
-import backtrader as bt
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QApplication
+from src.gui.pareto_view import ParetoView
+from src.gui.report_generator import ReportGenerator, build_sweep_context
+from src.gui.sensitivity_view import SensitivityView
+from src.gui.results_model import ResultsTableModel
 from src.gui.strategy_selector_widget import StrategySelectorWidget
+from src.gui.walkforward_view import WalkForwardView
+from src.optimizer.checkpoint import SweepStore, sweep_definition, sweep_key
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.halving import hyperband, successive_halving, summary
+from src.optimizer.pool import default_processes, get_pool, warm_pool
+from src.optimizer.samplers import make_sampler
+from src.optimizer.space import Param, ParamSpace
+from src.optimizer.walkforward import walk_forward
 from src.utils.logger import logger
-import itertools
+from src.utils.paths import database_path
+
+# Search modes offered in the dialog: label -> sampler name
+SEARCH_MODES = {
+    'Grid (exhaustive)': 'grid',
+    'Random': 'random',
+    'Latin hypercube': 'lhs',
+    'Adaptive (TPE)': 'tpe',
+}
 
+# Completed combos of every sweep are checkpointed here, so an
+# interrupted sweep resumes when it is run again (in the per-user data directory)
+SWEEP_DB_NAME = 'sweeps.db'
 
-def _frange(start, stop, step):
-    """Helper to generate float ranges inclusive."""
-    vals = []
-    x = start
-    while x <= stop:
-        vals.append(round(x, 8))
-        x += step
-    return vals
+# Early pruning of losing combos on a prefix of the history
+PRUNING_MODES = {
+    'Off': None,
+    'Successive halving': 'halving',
+    'Hyperband': 'hyperband',
+}
 
 
 class OptimizationDialog(QDialog):
@@ -47,28 +72,153 @@ class OptimizationDialog(QDialog):
         # Initial build
         self.build_range_inputs(self.strategy_widget.combo.currentText())
 
+        # Search mode: exhaustive grid or a fixed budget of sampled combos
+        search_form = QFormLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(SEARCH_MODES.keys())
+        self.mode_combo.currentTextChanged.connect(self._on_mode_changed)
+        search_form.addRow("Search:", self.mode_combo)
+        self.budget_spin = QSpinBox()
+        self.budget_spin.setRange(1, 1_000_000)
+        self.budget_spin.setValue(50)
+        search_form.addRow("Evaluations:", self.budget_spin)
+        self.seed_spin = QSpinBox()
+        self.seed_spin.setRange(0, 2**31 - 1)
+        self.seed_spin.setValue(42)
+        search_form.addRow("Seed:", self.seed_spin)
+        self.pruning_combo = QComboBox()
+        self.pruning_combo.addItems(PRUNING_MODES.keys())
+        self.pruning_combo.currentTextChanged.connect(self._on_mode_changed)
+        search_form.addRow("Early pruning:", self.pruning_combo)
+        self.eta_spin = QSpinBox()
+        self.eta_spin.setRange(2, 10)
+        self.eta_spin.setValue(3)
+        self.eta_spin.setPrefix("1/")
+        search_form.addRow("Keep best per round:", self.eta_spin)
+        # Sweeps and walk-forward runs go to the app's warm worker pool
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_spin.setValue(default_processes())
+        search_form.addRow("Processes:", self.workers_spin)
+        self.layout.addLayout(search_form)
+        self._on_mode_changed()
+
+        # Walk-forward: fit on each training window, trade the following test window
+        wf_form = QFormLayout()
+        wf_row = QHBoxLayout()
+        self.train_spin = QSpinBox()
+        self.train_spin.setRange(1, 10_000_000)
+        self.train_spin.setValue(500)
+        self.test_spin = QSpinBox()
+        self.test_spin.setRange(1, 10_000_000)
+        self.test_spin.setValue(100)
+        self.anchored_check = QCheckBox("Anchored")
+        wf_row.addWidget(QLabel("Train bars"))
+        wf_row.addWidget(self.train_spin)
+        wf_row.addWidget(QLabel("Test bars"))
+        wf_row.addWidget(self.test_spin)
+        wf_row.addWidget(self.anchored_check)
+        wf_form.addRow("Walk-forward:", wf_row)
+        self.layout.addLayout(wf_form)
+
         # Run button
         btn_layout = QHBoxLayout()
         self.run_btn = QPushButton("Run Optimization")
         self.run_btn.clicked.connect(self.run_optimization)
         btn_layout.addWidget(self.run_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.clicked.connect(self.stop_optimization)
+        self.stop_btn.setEnabled(False)
+        btn_layout.addWidget(self.stop_btn)
+        self.load_btn = QPushButton("Load Saved Results")
+        self.load_btn.clicked.connect(self.load_saved_results)
+        btn_layout.addWidget(self.load_btn)
+        self.wf_btn = QPushButton("Run Walk-Forward")
+        self.wf_btn.clicked.connect(self.run_walk_forward)
+        btn_layout.addWidget(self.wf_btn)
+        self.report_btn = QPushButton("Export Sweep Report")
+        self.report_btn.clicked.connect(self.export_sweep_report)
+        self.report_btn.setEnabled(False)
+        btn_layout.addWidget(self.report_btn)
         self.layout.addLayout(btn_layout)
 
-        # Results table
-        self.results_table = QTableWidget()
-        self.layout.addWidget(self.results_table)
+        # Results table (plus a summary of pruning decisions)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        self.layout.addWidget(self.summary_label)
+        # Filter/rank the results, e.g. "FinalValue top 100 where sma_long > 50"
+        filter_row = QHBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter, e.g. FinalValue top 100 where sma_long > 50")
+        self.filter_input.returnPressed.connect(self.apply_filter)
+        filter_row.addWidget(self.filter_input)
+        self.filter_btn = QPushButton("Apply")
+        self.filter_btn.clicked.connect(self.apply_filter)
+        filter_row.addWidget(self.filter_btn)
+        self.export_table_btn = QPushButton("Export Table")
+        self.export_table_btn.clicked.connect(self.export_results_table)
+        filter_row.addWidget(self.export_table_btn)
+        self.layout.addLayout(filter_row)
+        # Columnar model: the view only asks for the cells it paints
+        self.results_model = ResultsTableModel(parent=self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
+        # No sort until a header is clicked: rows stay in completion order
+        self.results_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.results_table.setSortingEnabled(True)
+        # Pareto front over return, drawdown, Sharpe and trades of the same runs
+        self.pareto_view = ParetoView()
+        self.pareto_view.set_store(self.results_model.store)
+        self.pareto_view.frontChanged.connect(self._on_front_changed)
+        self.pareto_view.frontOnlyToggled.connect(self._show_front_only)
+        self._pareto_timer = QTimer(self)
+        self._pareto_timer.setSingleShot(True)
+        self._pareto_timer.setInterval(300)
+        self._pareto_timer.timeout.connect(self.pareto_view.redraw)
+        self.results_tabs = QTabWidget()
+        self.results_tabs.addTab(self.results_table, "Table")
+        self.results_tabs.addTab(self.pareto_view, "Pareto front")
+        # Parameter sensitivity, from the stored results only
+        self.sensitivity_view = SensitivityView()
+        self.sensitivity_view.set_store(self.results_model.store)
+        self.results_tabs.addTab(self.sensitivity_view, "Sensitivity")
+        # Walk-forward windows and out-of-sample equity, apart from the sweep results
+        self.walkforward_view = WalkForwardView()
+        self.results_tabs.addTab(self.walkforward_view, "Walk-forward")
+        self.layout.addWidget(self.results_tabs)
 
         # Data feeds placeholder
         self._feeds = []
 
+        # Stored run data of the last sweep (for the sweep report)
+        self.results = []
+        self._equities = []
+        self._dates = []
+        self.walkforward = None
+
+        # Sweep checkpoints (opened on first use) and run state
+        self._store = None
+        self._stop_requested = False
+        self._load_timer = None
+
+        # First use of the optimizer: start the shared workers in the
+        # background while the sweep is being set up
+        if self.workers_spin.value() > 1:
+            warm_pool(self.workers_spin.value())
+
     def set_datafeeds(self, feeds):
         """Supply the data feeds for optimization."""
+        # Each run gets a clone of these; the underlying data is shared
         self._feeds = feeds
-        # Grab the actual DataFrames so we can rebuild feeds later
-        self._raw_dfs = [f.p.dataname.copy() for f in feeds]
         # Now rebuild the range inputs (so barcount is right)
         current = self.strategy_widget.combo.currentText()
         self.build_range_inputs(current)
+        if feeds:
+            # Default walk-forward split: half the history to train on first,
+            # then five test windows
+            barcount = len(feeds[0].p.dataname)
+            self.train_spin.setValue(max(1, barcount // 2))
+            self.test_spin.setValue(max(1, barcount // 10))
 
     def build_range_inputs(self, name: str):
         # Clear old inputs
@@ -82,7 +232,7 @@ class OptimizationDialog(QDialog):
             barcount = 9999
 
         # Load strategy specs
-        _, specs = StrategySelectorWidget.STRATEGIES[name]
+        _, specs, _ = StrategySelectorWidget.STRATEGIES[name]
         self.param_ranges = {}
 
         for key, ptype, default, minimum, step, precision in specs:
@@ -131,57 +281,102 @@ class OptimizationDialog(QDialog):
             # Store references
             self.param_ranges[key] = (start, end, stepb)
 
+    def _on_mode_changed(self, *_):
+        # The grid evaluates every combo, so budget and seed do not apply;
+        # Hyperband always draws a fixed budget of candidates
+        sampled = SEARCH_MODES[self.mode_combo.currentText()] != 'grid'
+        pruning = PRUNING_MODES[self.pruning_combo.currentText()]
+        self.budget_spin.setEnabled(sampled or pruning == 'hyperband')
+        self.seed_spin.setEnabled(sampled)
+        self.eta_spin.setEnabled(pruning is not None)
+
+    def build_space(self, bars: int = None) -> ParamSpace:
+        """
+        ParamSpace from the current range inputs and the strategy's
+        constraints; bars defaults to the loaded data's length.
+        """
+        params = []
+        for key, (start, end, step) in self.param_ranges.items():
+            is_int = isinstance(start, QSpinBox)
+            precision = 0 if is_int else start.decimals()
+            params.append(Param(key, start.value(), end.value(), step.value(), is_int, precision))
+
+        _, _, constraints = StrategySelectorWidget.STRATEGIES[self.strategy_widget.combo.currentText()]
+        if bars is None and self._feeds:
+            bars = len(self._feeds[0].p.dataname)
+        return ParamSpace(params, constraints=constraints, bars=bars)
+
+    @property
+    def store(self) -> SweepStore:
+        if self._store is None:
+            self._store = SweepStore(database_path(SWEEP_DB_NAME))
+        return self._store
+
+    def _sweep_definition(self, space: ParamSpace = None):
+        """(key, definition) of the sweep the current inputs describe."""
+        strat_cls, _, _ = StrategySelectorWidget.STRATEGIES[self.strategy_widget.combo.currentText()]
+        mode = SEARCH_MODES[self.mode_combo.currentText()]
+        definition = sweep_definition(strat_cls, self._feeds, space or self.build_space(), mode,
+                                      seed=self.seed_spin.value(), budget=self.budget_spin.value())
+        return sweep_key(definition), definition
+
+    def stop_optimization(self):
+        """Stop after the combo in flight; everything finished so far is kept."""
+        self._stop_requested = True
+
+    def closeEvent(self, event):
+        self._stop_requested = True
+        if self._load_timer is not None:
+            self._load_timer.stop()
+        super().closeEvent(event)
+
+    def reject(self):
+        self._stop_requested = True
+        super().reject()
+
+    def done(self, result):
+        # Commit the checkpoint writes still queued before the dialog goes away
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        super().done(result)
+
     def run_optimization(self):
         try:
             strat_name = self.strategy_widget.combo.currentText()
-            strat_cls, _ = StrategySelectorWidget.STRATEGIES[strat_name]
-
-            # 1) Build the param grid
-            grid = {
-                key: _frange(start.value(), end.value(), step.value())
-                for key, (start, end, step) in self.param_ranges.items()
-            }
-            names = list(grid.keys())
-            values = [grid[n] for n in names]
-
-            results = []
-
-            # 2) Loop over every parameter combination
-            for combo in itertools.product(*values):
-                params = dict(zip(names, combo))
-
-                # Optionally skip invalid combos (e.g. sma_short >= sma_long)
-                if 'sma_short' in params and 'sma_long' in params:
-                    if params['sma_short'] >= params['sma_long']:
-                        continue
-
-                try:
-                    cerebro = bt.Cerebro()
-
-                    # Re-create each feed exactly as the original
-                    for df, orig_feed in zip(self._raw_dfs, self._feeds):
-                        feed_kwargs = orig_feed.p._getkwargs().copy()
-                        # Remove dataname so we can pass our df
-                        feed_kwargs.pop('dataname', None)
-
-                        feed = bt.feeds.PandasData(
-                            dataname=df,
-                            **feed_kwargs
-                        )
-                        cerebro.adddata(feed)
-
-                    # Add the strategy with the current params
-                    cerebro.addstrategy(strat_cls, **params)
-
-                    # Run and collect result
-                    runstrat = cerebro.run(maxcpus=1)[0]
-                    final_val = round(runstrat.broker.getvalue(), 2)
-                    results.append({**params, "FinalValue": final_val})
-
-                except IndexError as ie:
-                    # Skip combos that still require more bars than available
-                    logger.warning(f"Skipping {params}: {ie}")
-                    continue
+            strat_cls, _, _ = StrategySelectorWidget.STRATEGIES[strat_name]
+
+            # 1) Build the parameter space and the search strategy
+            space = self.build_space()
+            mode = SEARCH_MODES[self.mode_combo.currentText()]
+            sampler = make_sampler(mode, space, seed=self.seed_spin.value())
+            pruning = PRUNING_MODES[self.pruning_combo.currentText()]
+            budget = None if mode == 'grid' and pruning != 'hyperband' else self.budget_spin.value()
+
+            # 2) Evaluate the proposed combos
+            executor = SweepExecutor(strat_cls, self._feeds)
+            eta = self.eta_spin.value()
+            streaming = dict(on_result=self._stream_row, should_stop=lambda: self._stop_requested)
+            if pruning == 'hyperband':
+                self._clear_results()
+                with self._running():
+                    sweep = hyperband(executor, sampler, budget, eta=eta, **streaming)
+            elif pruning == 'halving':
+                candidates = list(space.grid()) if budget is None else sampler.ask(budget)
+                self._clear_results()
+                with self._running():
+                    sweep = successive_halving(executor, candidates, eta=eta, sampler=sampler, **streaming)
+            else:
+                sweep = self._run_checkpointed(executor, sampler, budget, space)
+            logger.info(f"{mode} search: {len(sweep)} runs, {len(sweep.skipped)} skipped "
+                        f"(space of {space.size} combos)")
+            if pruning:
+                stopped = "Stopped before the last round. " if self._stop_requested else ""
+                self.summary_label.setText(stopped + summary(sweep))
+            results = sweep.rows
+
+            self.results, self._equities, self._dates = results, sweep.equities, sweep.dates
+            self.report_btn.setEnabled(bool(results))
 
             # 3) Display results
             if not results:
@@ -197,19 +392,214 @@ class OptimizationDialog(QDialog):
             logger.exception("Optimization failed")
             QMessageBox.critical(self, "Optimization Error", str(e))
 
+    def _run_checkpointed(self, executor, sampler, budget, space):
+        """Run the sweep, resuming its checkpoint and showing rows as they finish."""
+        key, definition = self._sweep_definition(space)
+        checkpoint = self.store.checkpoint(key, definition)
+        if len(checkpoint):
+            logger.info(f"Resuming sweep {key[:10]}: {len(checkpoint)} combos already done")
+
+        self._clear_results()
+        workers = self.workers_spin.value()
+        pool = get_pool(workers) if workers > 1 else None
+        with self._running():
+            sweep = executor.run(sampler, budget=budget, on_result=self._stream_row,
+                                 should_stop=lambda: self._stop_requested, checkpoint=checkpoint,
+                                 pool=pool)
+        state = "stopped" if self._stop_requested else "complete"
+        self.summary_label.setText(
+            f"Sweep {state}: {len(sweep)} results ({sweep.resumed} resumed from a saved run), "
+            f"{len(sweep.skipped)} skipped")
+        return sweep
+
+    def _stream_row(self, row: dict):
+        """on_result of a running sweep: show the row, keep the table and Stop responsive."""
+        self._append_rows([row])
+        QApplication.processEvents()
+
+    @contextmanager
+    def _running(self):
+        """
+        Hold a sweep run on the GUI thread. _stream_row() lets clicks
+        through, so anything that replaces the results or starts another
+        run is disabled until it ends; Stop is enabled meanwhile.
+        """
+        self._stop_requested = False
+        if self._load_timer is not None:
+            self._load_timer.stop()
+            self._load_timer = None
+        locked = (self.run_btn, self.wf_btn, self.load_btn, self.report_btn,
+                  self.filter_input, self.filter_btn)
+        for widget in locked:
+            widget.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        try:
+            yield
+        finally:
+            for widget in locked:
+                widget.setEnabled(widget is not self.report_btn)
+            self.stop_btn.setEnabled(False)
+
+    def load_saved_results(self):
+        """Show the saved (possibly partial) results of the sweep the inputs describe."""
+        try:
+            key, _ = self._sweep_definition()
+            info = self.store.info(key)
+            if info is None or not info['done']:
+                QMessageBox.information(self, "No Saved Results",
+                                        "No results are saved for this strategy, data and parameter ranges.")
+                return
+        except Exception as e:
+            logger.exception("Loading saved sweep failed")
+            QMessageBox.critical(self, "Load Error", str(e))
+            return
+
+        self.results, self._equities, self._dates = [], [], self.store.dates(key)
+        self._clear_results()
+        state = "complete" if info['complete'] else "partial"
+        chunks = self.store.iter_results(key, chunk=500)
+
+        # One chunk per timer tick so large sweeps fill in without blocking the UI
+        def load_next():
+            batch = next(chunks, None)
+            if batch is None:
+                self._load_timer.stop()
+                self._load_timer = None
+                self.report_btn.setEnabled(bool(self.results))
+                return
+            rows = [row for _, row, _ in batch]
+            self.results.extend(rows)
+            self._equities.extend(eq for _, _, eq in batch)
+            self._append_rows(rows)
+            self.summary_label.setText(f"Saved {state} sweep from {info['updated']}: "
+                                       f"{len(self.results)} results loaded")
+
+        if self._load_timer is not None:
+            self._load_timer.stop()
+        self._load_timer = QTimer(self)
+        self._load_timer.timeout.connect(load_next)
+        self._load_timer.start(0)
+
+    def run_walk_forward(self):
+        try:
+            strat_name = self.strategy_widget.combo.currentText()
+            strat_cls, _, _ = StrategySelectorWidget.STRATEGIES[strat_name]
+
+            # The same candidates are tried in every training window, so
+            # they must warm up within one
+            space = self.build_space(bars=self.train_spin.value())
+            mode = SEARCH_MODES[self.mode_combo.currentText()]
+            if mode == 'grid':
+                candidates = list(space.grid())
+            else:
+                candidates = make_sampler(mode, space, seed=self.seed_spin.value()).ask(self.budget_spin.value())
+
+            wf = walk_forward(strat_cls, self._feeds, candidates,
+                              train=self.train_spin.value(), test=self.test_spin.value(),
+                              anchored=self.anchored_check.isChecked(),
+                              max_workers=self.workers_spin.value())
+            self.walkforward = wf
+            if not len(wf):
+                QMessageBox.information(self, "No Results",
+                                        "The data is too short for one training plus one test window.")
+                return
+
+            self.summary_label.setText(
+                f"Walk-forward over {len(wf)} windows, {len(candidates)} candidates each: "
+                f"out-of-sample return {wf.oos_return:+.2f}%")
+            self.walkforward_view.set_result(wf, space.names)
+            self.results_tabs.setCurrentWidget(self.walkforward_view)
+
+        except Exception as e:
+            logger.exception("Walk-forward failed")
+            QMessageBox.critical(self, "Walk-Forward Error", str(e))
+
+    def _append_rows(self, rows: list):
+        """Stream rows into the end of the results table and the Pareto front."""
+        start = len(self.results_model.store)
+        self.results_model.append_rows(rows)
+        self.pareto_view.extend(start)
+        self.sensitivity_view.invalidate()
+        # Redraw the scatter at most a few times a second while rows stream in
+        if not self._pareto_timer.isActive():
+            self._pareto_timer.start()
+
+    def _clear_results(self):
+        self.results_model.clear()
+        self.pareto_view.rebuild()
+        self.sensitivity_view.set_store(self.results_model.store, self.param_ranges)
+
+    def _on_front_changed(self):
+        if self.pareto_view.front_only_check.isChecked():
+            self.results_model.show_only(self.pareto_view.front_ids())
+
+    def _show_front_only(self, checked: bool):
+        self.results_model.show_only(self.pareto_view.front_ids() if checked else None)
+
     def show_results(self, data: list):
         if not data:
             QMessageBox.information(self, "No Results", "No optimization results to show.")
             return
+        self.results_model.set_rows(data)
+        self.pareto_view.rebuild()
+        self.sensitivity_view.set_store(self.results_model.store, self.param_ranges)
+
+    def apply_filter(self):
+        """Show the rows selected by the filter box (empty: every row)."""
+        try:
+            self.results_model.set_query(self.filter_input.text())
+        except (KeyError, ValueError) as e:
+            QMessageBox.warning(self, "Filter", str(e).strip("'\""))
+            return
+        shown = self.results_model.rowCount()
+        if self.filter_input.text().strip():
+            self.summary_label.setText(f"Filter shows {shown} of {len(self.results_model.store)} results")
+
+    def export_results_table(self):
+        """Write every result row (not just the filtered ones) to CSV or Parquet."""
+        if not len(self.results_model.store):
+            QMessageBox.warning(self, "No Data", "There are no results to export.")
+            return
+        path, chosen = QFileDialog.getSaveFileName(
+            self, "Export Results", "optimization_results.csv",
+            "CSV Files (*.csv);;Parquet Files (*.parquet)")
+        if not path:
+            return
+        if not path.lower().endswith(('.csv', '.parquet')):
+            path += '.parquet' if 'parquet' in chosen.lower() else '.csv'
+        try:
+            self.results_model.export(path)
+            QMessageBox.information(self, "Export", f"{len(self.results_model.store)} rows saved to {path}")
+        except ImportError:
+            QMessageBox.critical(self, "Export Error", "Parquet export needs pyarrow (pip install pyarrow).")
+        except Exception as e:
+            logger.exception("Results export failed")
+            QMessageBox.critical(self, "Export Error", str(e))
 
-        headers = list(data[0].keys())
-        self.results_table.clear()
-        self.results_table.setColumnCount(len(headers))
-        self.results_table.setHorizontalHeaderLabels(headers)
-        self.results_table.setRowCount(len(data))
+    def export_sweep_report(self):
+        """Write one HTML/PDF report covering every run of the last sweep."""
+        if not self.results:
+            QMessageBox.warning(self, "No Data", "Run an optimization before exporting a sweep report.")
+            return
 
-        for row_i, row in enumerate(data):
-            for col_i, key in enumerate(headers):
-                self.results_table.setItem(row_i, col_i, QTableWidgetItem(str(row[key])))
+        pdf_path, _ = QFileDialog.getSaveFileName(self, "Save Sweep Report", "", "PDF Files (*.pdf)")
+        if not pdf_path:
+            return
+        if not pdf_path.lower().endswith('.pdf'):
+            pdf_path += '.pdf'
 
-        self.results_table.resizeColumnsToContents()
+        try:
+            strat_name = self.strategy_widget.combo.currentText()
+            context = build_sweep_context(
+                self.results, self._equities, self._dates,
+                strategy=strat_name,
+                title=f"Optimization Sweep: {strat_name}",
+                date=datetime.now().strftime('%Y-%m-%d'),
+            )
+            rg = ReportGenerator(template_dir=os.path.join(os.path.dirname(__file__), '../../templates'))
+            _, pdf_file = rg.generate_sweep_report(context, output_dir=os.path.dirname(pdf_path) or os.getcwd(),
+                                                   filename=os.path.basename(pdf_path))
+            QMessageBox.information(self, 'Report Saved', f"Sweep report saved as: {pdf_file}")
+        except Exception as e:
+            logger.exception("Sweep report failed")
+            QMessageBox.critical(self, 'Export Error', str(e))
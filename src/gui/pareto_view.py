@@ -0,0 +1,149 @@
+# src/gui/pareto_view.py
+"""
+ParetoView: scatter of a sweep's runs with the Pareto front highlighted.
+
+Every objective can be maximized, minimized or left out; changing one
+rebuilds the front from the result columns in one vectorized pass. Any
+two result columns can be plotted. Large sweeps are drawn as a random
+sample of the runs (the front is always drawn in full).
+"""
+
+import numpy as np
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QCheckBox
+
+from src.optimizer.pareto import ParetoFront
+from src.optimizer.results import ResultStore
+
+# Objective -> default direction ('off' leaves it out of the front)
+PARETO_OBJECTIVES = {
+    'Return%': 'max',
+    'MaxDD%': 'min',
+    'Sharpe': 'max',
+    'Trades': 'min',
+}
+
+# Runs drawn behind the front at most
+MAX_SCATTER = 50_000
+
+
+class ParetoView(QWidget):
+    """
+    Maintains the ParetoFront of a ResultStore and plots it.
+    frontChanged is emitted after the front is rebuilt or grows.
+    """
+    frontChanged = Signal()
+    frontOnlyToggled = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = None
+        self.front = None
+        layout = QVBoxLayout(self)
+
+        # Objective directions
+        objectives_row = QHBoxLayout()
+        self.direction_combos = {}
+        for name, direction in PARETO_OBJECTIVES.items():
+            combo = QComboBox()
+            combo.addItems(['max', 'min', 'off'])
+            combo.setCurrentText(direction)
+            combo.currentTextChanged.connect(self.rebuild)
+            objectives_row.addWidget(QLabel(name))
+            objectives_row.addWidget(combo)
+            self.direction_combos[name] = combo
+        objectives_row.addStretch()
+        layout.addLayout(objectives_row)
+
+        # Axes
+        axes_row = QHBoxLayout()
+        self.x_combo = QComboBox()
+        self.y_combo = QComboBox()
+        for combo in (self.x_combo, self.y_combo):
+            combo.addItems(PARETO_OBJECTIVES)
+        self.x_combo.setCurrentText('MaxDD%')
+        self.y_combo.setCurrentText('Return%')
+        axes_row.addWidget(QLabel("X"))
+        axes_row.addWidget(self.x_combo)
+        axes_row.addWidget(QLabel("Y"))
+        axes_row.addWidget(self.y_combo)
+        self.front_only_check = QCheckBox("Show only the front in the table")
+        self.front_only_check.toggled.connect(self.frontOnlyToggled.emit)
+        axes_row.addWidget(self.front_only_check)
+        axes_row.addStretch()
+        layout.addLayout(axes_row)
+
+        self.canvas = FigureCanvas(Figure(figsize=(6, 4)))
+        self.ax = self.canvas.figure.subplots()
+        layout.addWidget(self.canvas)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        for combo in (self.x_combo, self.y_combo):
+            combo.currentTextChanged.connect(lambda _: self.redraw())
+
+    # -- front -------------------------------------------------------------
+    def objectives(self) -> dict:
+        return {name: combo.currentText() for name, combo in self.direction_combos.items()
+                if combo.currentText() != 'off'}
+
+    def _usable(self) -> bool:
+        return (self.store is not None and len(self.store) > 0
+                and all(name in self.store.columns for name in PARETO_OBJECTIVES))
+
+    def set_store(self, store: ResultStore):
+        self.store = store
+        self.rebuild()
+
+    def rebuild(self, *_):
+        """Recompute the front over every stored run."""
+        objectives = self.objectives()
+        self.front = ParetoFront(objectives) if objectives else None
+        if self.front is not None and self._usable():
+            self.front.add_points(np.column_stack([self.store.values(n) for n in objectives]))
+        self.frontChanged.emit()
+        self.redraw()
+
+    def extend(self, start: int):
+        """Add the runs stored from row `start` on to the front (streaming)."""
+        if self.front is None or not self._usable():
+            return
+        if self.front.seen != start:
+            # Out of step (e.g. the table was replaced): start over
+            self.rebuild()
+            return
+        joined, dropped = self.front.add_points(
+            np.column_stack([self.store.values(n)[start:] for n in self.front.names]))
+        if joined or dropped:
+            self.frontChanged.emit()
+
+    def front_ids(self) -> np.ndarray:
+        return self.front.ids if self.front is not None else np.empty(0, dtype=np.int64)
+
+    # -- plot --------------------------------------------------------------
+    def redraw(self):
+        self.ax.clear()
+        self.ax.grid(True)
+        x_name, y_name = self.x_combo.currentText(), self.y_combo.currentText()
+        self.ax.set_xlabel(x_name)
+        self.ax.set_ylabel(y_name)
+        if not self._usable():
+            self.status_label.setText("No multi-objective results to show.")
+            self.canvas.draw_idle()
+            return
+        x, y = self.store.values(x_name), self.store.values(y_name)
+        n = len(x)
+        shown = np.arange(n)
+        if n > MAX_SCATTER:
+            shown = np.sort(np.random.default_rng(0).choice(n, MAX_SCATTER, replace=False))
+        self.ax.scatter(x[shown], y[shown], s=6, c='lightgray', label='runs', rasterized=True)
+        ids = self.front_ids()
+        if len(ids):
+            order = ids[np.argsort(x[ids], kind='stable')]
+            self.ax.scatter(x[order], y[order], s=18, c='tab:red', label='Pareto front', zorder=3)
+        self.ax.legend(loc='best')
+        self.canvas.draw_idle()
+        sampled = f" (plotting {MAX_SCATTER} of them)" if n > MAX_SCATTER else ""
+        objectives = ', '.join(f"{k} {v}" for k, v in self.objectives().items()) or "none"
+        self.status_label.setText(f"{len(ids)} of {n} runs on the front{sampled}; objectives: {objectives}")
@@ -1,22 +1,126 @@
 # New module: generates HTML via Jinja2 and exports PDF via WeasyPrint
-
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
 from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
+
+from src.optimizer.executor import RUN_METRICS
+from src.viz.static_charts import render_run_charts, render_heatmap, render_equity_overlay
+from src.utils.logger import logger
+from src.utils.profiling import phase
+
+# Result columns that are metrics rather than strategy parameters
+SWEEP_METRICS = RUN_METRICS + ('Return (%)', 'Max DD (%)')
+
+
+@lru_cache(maxsize=None)
+def _environment(template_dir: str) -> Environment:
+    """One Jinja2 environment per template directory, shared process-wide so
+    compiled templates survive across ReportGenerator instances."""
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=True
+    )
+
+
+def _generate_one(template_dir, context, output_dir, filename, pdf):
+    """Process-pool entry point: build one report in a worker."""
+    rg = ReportGenerator(template_dir=template_dir)
+    html_file, pdf_path = rg.generate_report(context, output_dir=output_dir, filename=filename, pdf=pdf)
+    return html_file, pdf_path, rg.last_timings
+
+
+def _param_label(row, params):
+    return ", ".join(f"{p}={row[p]}" for p in params)
+
+
+def build_sweep_context(results, equities, dates, strategy: str = '', title: str = 'Optimization Sweep Report',
+                        date: str = '', top_k: int = 5, max_heatmaps: int = 6) -> dict:
+    """
+    Build the sweep_report.html context from stored sweep data in one pass.
+    -- results: list of dicts (parameters + 'FinalValue'), one per run
+    -- equities: per-run equity arrays in the same order (entries may be None)
+    -- dates: bar dates shared by every run
+    No backtests are re-run; all charts come from the stored arrays.
+    """
+    df = pd.DataFrame(results)
+    params = [c for c in df.columns if c not in SWEEP_METRICS]
+
+    # Return and max drawdown for every run at once from a (runs x bars) matrix
+    # (rows of current sweeps carry them already, see RUN_METRICS)
+    if equities and any(e is not None and len(e) for e in equities):
+        width = max(len(e) for e in equities if e is not None)
+        curves = np.full((len(equities), width), np.nan)
+        for i, e in enumerate(equities):
+            if e is not None and len(e):
+                curves[i, :len(e)] = e
+                curves[i, len(e):] = e[-1]
+        peaks = np.fmax.accumulate(curves, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dd = np.nanmin((curves - peaks) / peaks, axis=1) * 100
+            ret = (curves[:, -1] / curves[:, 0] - 1) * 100
+        if 'Return%' not in df.columns:
+            df['Return (%)'] = np.round(ret, 2)
+            df['Max DD (%)'] = np.round(-dd, 2)
+    else:
+        curves = None
+
+    order = df['FinalValue'].to_numpy().argsort(kind='stable')[::-1]
+    ranked = df.iloc[order]
+    top = ranked.head(top_k)
+
+    # Heatmaps: best FinalValue over every pair of varying parameters
+    varying = [p for p in params if df[p].nunique() > 1]
+    heatmaps = []
+    if len(varying) == 1:
+        best = df.groupby(varying[0])['FinalValue'].max()
+        heatmaps.append(render_heatmap([best.to_numpy()], list(best.index), ['FinalValue'],
+                                       varying[0], '', f"Best FinalValue by {varying[0]}"))
+    for x, y in list(combinations(varying, 2))[:max_heatmaps]:
+        pivot = df.pivot_table(index=y, columns=x, values='FinalValue', aggfunc='max')
+        heatmaps.append(render_heatmap(pivot.to_numpy(), list(pivot.columns), list(pivot.index),
+                                       x, y, f"Best FinalValue by {y} x {x}"))
+
+    overlay_div = ''
+    if curves is not None and len(top):
+        overlay_div = render_equity_overlay(
+            dates, curves[top.index.to_numpy()],
+            [_param_label(row, params) for _, row in top.iterrows()],
+            title=f"Top {len(top)} Equity Curves"
+        )
+
+    return {
+        'title': title,
+        'date': date,
+        'strategy': strategy,
+        'run_count': len(df),
+        'top_k': top_k,
+        'best': top.head(1).to_dict('records')[0] if len(top) else {},
+        'columns': list(ranked.columns),
+        'rows': [list(r) for r in ranked.itertuples(index=False)],
+        'heatmaps': heatmaps,
+        'overlay_div': overlay_div,
+    }
+
 
 class ReportGenerator:
     def __init__(self, template_dir: str = 'templates'):
         # Set up Jinja2 environment
-        self.env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=True
-        )
+        self.template_dir = os.path.abspath(template_dir)
+        self.env = _environment(self.template_dir)
+        # Per-stage wall times (seconds) of the most recent generate_report()
+        self.last_timings = {}
 
-    def generate_html(self, output_path: str, context: dict):
+    def generate_html(self, output_path: str, context: dict, template_name: str = 'report.html'):
         """
-        Renders an HTML report using the 'report.html' Jinja2 template and provided context.
+        Renders an HTML report using the given Jinja2 template (default 'report.html') and provided context.
         """
-        template = self.env.get_template('report.html')
+        template = self.env.get_template(template_name)
         html_content = template.render(**context)
 
         # Write HTML file
@@ -29,16 +133,90 @@ class ReportGenerator:
         """
         Converts HTML content to PDF using WeasyPrint.
         """
+        # Imported lazily: WeasyPrint loads native libraries on import
+        from weasyprint import HTML
         HTML(string=html_content).write_pdf(pdf_path)
         return pdf_path
 
-    def generate_report(self, context: dict, output_dir: str = 'reports', filename: str = 'backtest_report.pdf'):
+    def prepare_charts(self, context: dict) -> dict:
+        """
+        Fill equity_div/drawdown_div/returns_div with static chart images
+        rendered from context['dates'] and context['equity_vals'], unless the
+        caller already supplied them. Rendering is memoized per run.
+        """
+        if all(k in context for k in ('equity_div', 'drawdown_div', 'returns_div')):
+            return context
+        if 'equity_vals' not in context:
+            return context
+        charts = render_run_charts(context.get('dates', range(len(context['equity_vals']))),
+                                   context['equity_vals'])
+        return {**charts, **context}
+
+    def generate_report(self, context: dict, output_dir: str = 'reports', filename: str = 'backtest_report.pdf',
+                        pdf: bool = True):
         """
         Orchestrates HTML rendering and PDF conversion, returns output file paths.
         -- context should include keys: title, dates, equity_vals, drawdown_vals, metrics (dict), trades_table (list of dicts)
+        Stage timings are left in self.last_timings.
+        """
+        timings = {}
+        t0 = time.perf_counter()
+        os.makedirs(output_dir, exist_ok=True)
+        pdf_path = os.path.join(output_dir, filename)
+
+        with phase('report.charts'):
+            context = self.prepare_charts(context)
+        t1 = time.perf_counter()
+        timings['charts'] = t1 - t0
+
+        with phase('report.html'):
+            html_file, html_content = self.generate_html(pdf_path, context)
+        t2 = time.perf_counter()
+        timings['html'] = t2 - t1
+
+        if pdf:
+            with phase('report.pdf'):
+                self.html_to_pdf(html_content, pdf_path)
+        timings['pdf'] = time.perf_counter() - t2
+        timings['total'] = time.perf_counter() - t0
+
+        self.last_timings = timings
+        logger.info(f"Report {filename}: " + ", ".join(f"{k}={v:.3f}s" for k, v in timings.items()))
+        return html_file, pdf_path
+
+    def generate_sweep_report(self, context: dict, output_dir: str = 'reports',
+                              filename: str = 'sweep_report.pdf', pdf: bool = True):
         """
+        Render a whole optimization sweep (see build_sweep_context) into one
+        HTML/PDF document. Stage timings are left in self.last_timings.
+        """
+        t0 = time.perf_counter()
         os.makedirs(output_dir, exist_ok=True)
         pdf_path = os.path.join(output_dir, filename)
-        html_file, html_content = self.generate_html(pdf_path, context)
-        self.html_to_pdf(html_content, pdf_path)
+        html_file, html_content = self.generate_html(pdf_path, context, template_name='sweep_report.html')
+        t1 = time.perf_counter()
+        if pdf:
+            self.html_to_pdf(html_content, pdf_path)
+        t2 = time.perf_counter()
+        self.last_timings = {'html': t1 - t0, 'pdf': t2 - t1, 'total': t2 - t0}
         return html_file, pdf_path
+
+    def generate_reports(self, jobs, max_workers: int = None, pdf: bool = True):
+        """
+        Generate several reports in a process pool.
+        -- jobs: iterable of (context, output_dir, filename)
+        Returns a list of (html_file, pdf_path, timings) in job order.
+        """
+        jobs = list(jobs)
+        if len(jobs) <= 1 or max_workers == 1:
+            results = []
+            for context, output_dir, filename in jobs:
+                html_file, pdf_path = self.generate_report(context, output_dir, filename, pdf=pdf)
+                results.append((html_file, pdf_path, self.last_timings))
+            return results
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_generate_one, self.template_dir, context, output_dir, filename, pdf)
+                for context, output_dir, filename in jobs
+            ]
+            return [f.result() for f in futures]
@@ -0,0 +1,194 @@
+# src/gui/results_model.py
+"""
+ResultsTableModel: table model over a ResultStore.
+
+The view asks only for the cells it paints, so a sweep of millions of
+rows costs one column array each instead of a QTableWidgetItem per cell.
+Rows stream in through append_rows(); a query (see ResultStore.query)
+and a header-click sort select and order rows with vectorized column
+operations, and only the selected row indices are kept. While a query
+or sort is active, streamed rows are filtered on their own and merged
+into the shown rows (searchsorted on the cached sort keys), so each
+append costs about its own size, not a new selection of every row.
+"""
+
+import numpy as np
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from src.optimizer.results import ResultStore, split_query
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    -- store: ResultStore to show (a new one when None)
+
+    Without a query or sort, rows appear in insertion order and appending
+    inserts them at the end. With one, appended rows are merged into the
+    current selection.
+    """
+
+    def __init__(self, store: ResultStore = None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else ResultStore()
+        self._columns = self.store.columns
+        self._view = None          # row indices shown, None: every row in order
+        self._keys = None          # sort keys of _view (numeric sort column only)
+        self._query = ''
+        self._sort = None          # (column name, descending)
+        self._subset = None        # row indices to restrict to (e.g. a Pareto front)
+
+    # -- content -----------------------------------------------------------
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self._columns = []
+        self._subset = None
+        self._set_view(None)
+        self.endResetModel()
+
+    def set_rows(self, rows: list):
+        """Replace the table with `rows` (dicts)."""
+        self.beginResetModel()
+        self.store.clear()
+        self.store.append(rows)
+        self._columns = self.store.columns
+        self._set_view(self._select())
+        self.endResetModel()
+
+    def append_rows(self, rows: list):
+        """Add streamed rows at the end of the table."""
+        if not rows:
+            return
+        first = len(self.store)
+        if self._view is not None or not self._columns:
+            self.beginResetModel()
+            self.store.append(rows)
+            self._columns = self.store.columns
+            if self._view is None:
+                self._set_view(self._select())
+            else:
+                self._merge(first)
+            self.endResetModel()
+            return
+        known = len(self.store.columns)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.store.append(rows)
+        self.endInsertRows()
+        if len(self.store.columns) != known:
+            self.beginInsertColumns(QModelIndex(), known, len(self.store.columns) - 1)
+            self._columns = self.store.columns
+            self.endInsertColumns()
+
+    def set_query(self, text: str):
+        """Show the rows a query selects ('' shows every row); raises ValueError/KeyError."""
+        text = text.strip()
+        view = self._select(text)
+        self.beginResetModel()
+        self._query = text
+        self._set_view(view)
+        self.endResetModel()
+
+    def show_only(self, indices):
+        """Restrict the table to these store rows (None shows every row again)."""
+        self.beginResetModel()
+        self._subset = None if indices is None else np.unique(np.asarray(indices, dtype=np.int64))
+        self._set_view(self._select())
+        self.endResetModel()
+
+    def visible_indices(self) -> np.ndarray:
+        """Store row indices in display order."""
+        return np.arange(len(self.store)) if self._view is None else self._view
+
+    def export(self, path: str, visible_only: bool = False):
+        """Write the full table (or just the shown rows, in order) as CSV or Parquet."""
+        self.store.export(path, self._view if visible_only else None)
+
+    def _select(self, query: str = None):
+        query = self._query if query is None else query
+        if not query and self._sort is None and self._subset is None:
+            return None
+        # A subset (e.g. a Pareto front) is small; start from it rather than every row
+        indices = self._subset
+        if indices is not None:
+            indices = indices[indices < len(self.store)]
+        if query:
+            indices = self.store.query(query, indices)
+        elif indices is None:
+            indices = np.arange(len(self.store))
+        return self._ordered(indices)
+
+    def _ordered(self, indices):
+        if self._sort is not None and self._sort[0] in self.store.columns:
+            return self.store.order(indices, *self._sort)
+        return indices
+
+    def _sort_numeric(self) -> bool:
+        return (self._sort is not None and self._sort[0] in self.store.columns
+                and self.store.is_numeric(self._sort[0]))
+
+    def _set_view(self, view):
+        self._view = view
+        self._keys = self.store.sort_key(self._sort[0], view, self._sort[1]) \
+            if view is not None and self._sort_numeric() else None
+
+    def _merge(self, first: int):
+        """Fold the rows stored from `first` on into the current selection."""
+        new = np.arange(first, len(self.store))
+        if self._subset is not None:
+            new = new[np.isin(new, self._subset)]
+        if self._query:
+            if split_query(self._query)[0].strip():
+                # Ranked query: the best N of the old selection plus the new rows
+                self._set_view(self._ordered(self.store.query(self._query, np.concatenate([self._view, new]))))
+                return
+            new = self.store.query(self._query, new)
+        if self._sort is None or self._sort[0] not in self.store.columns:
+            self._set_view(np.concatenate([self._view, new]))
+        elif self._keys is None or not self._sort_numeric():
+            # Object columns rank by text over the whole selection
+            self._set_view(self._ordered(np.concatenate([self._view, new])))
+        elif len(new):
+            keys = self.store.sort_key(self._sort[0], new, self._sort[1])
+            order = np.argsort(keys, kind='stable')
+            # side='right' keeps equal keys in insertion order, as a stable sort would
+            at = np.searchsorted(self._keys, keys[order], side='right')
+            self._view = np.insert(self._view, at, new[order])
+            self._keys = np.insert(self._keys, at, keys[order])
+
+    # -- model interface ---------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store) if self._view is None else len(self._view)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self._columns[index.column()]
+        row = index.row() if self._view is None else int(self._view[index.row()])
+        if role == Qt.DisplayRole:
+            value = self.store.cell(row, name)
+            return '' if value is None else str(value)
+        if role == Qt.TextAlignmentRole and self.store.is_numeric(name):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section] if section < len(self._columns) else None
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Header click: sort the shown rows by one column (column < 0: insertion order)."""
+        self.layoutAboutToBeChanged.emit()
+        if 0 <= column < len(self._columns):
+            self._sort = (self._columns[column], order == Qt.DescendingOrder)
+        else:
+            self._sort = None
+        self._set_view(self._select())
+        self.layoutChanged.emit()
@@ -0,0 +1,210 @@
+# src/gui/sensitivity_view.py
+"""
+SensitivityView: heatmap and marginals of one metric over the parameters
+of a finished sweep, read from the result columns (nothing is re-run).
+
+The heatmap shows the best run (or the mean) per pair of parameter
+values, or, with "Smoothed" on, the neighborhood robustness score of the
+best cell along the other parameters. The marginal plot shows the best,
+mean and smoothed metric along the X parameter. Results that keep
+streaming in only mark the view stale; it recomputes when shown.
+"""
+
+import numpy as np
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QCheckBox, QSpinBox
+)
+
+from src.gui.pareto_view import PARETO_OBJECTIVES
+from src.optimizer.results import ResultStore
+from src.optimizer.sensitivity import Sensitivity, STATS
+
+# Tick labels per heatmap axis at most
+MAX_TICKS = 12
+
+
+class SensitivityView(QWidget):
+    """
+    Sensitivity of a ResultStore's metric columns to its `params`
+    (set by the owner to the sweep's parameter names).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = None
+        self.params = []
+        self._stale = True
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(1000)
+        self._refresh_timer.timeout.connect(self.refresh)
+        layout = QVBoxLayout(self)
+
+        row = QHBoxLayout()
+        self.metric_combo = QComboBox()
+        self.higher_check = QCheckBox("Higher is better")
+        self.x_combo = QComboBox()
+        self.y_combo = QComboBox()
+        self.stat_combo = QComboBox()
+        self.stat_combo.addItems(STATS)
+        self.radius_spin = QSpinBox()
+        self.radius_spin.setRange(0, 10)
+        self.radius_spin.setValue(1)
+        self.smooth_check = QCheckBox("Smoothed")
+        for label, widget in (("Metric", self.metric_combo), (None, self.higher_check),
+                              ("X", self.x_combo), ("Y", self.y_combo), ("Stat", self.stat_combo),
+                              ("Radius", self.radius_spin), (None, self.smooth_check)):
+            if label:
+                row.addWidget(QLabel(label))
+            row.addWidget(widget)
+        row.addStretch()
+        layout.addLayout(row)
+
+        self.canvas = FigureCanvas(Figure(figsize=(8, 4)))
+        self.heat_ax, self.marginal_ax = self.canvas.figure.subplots(1, 2)
+        layout.addWidget(self.canvas)
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.metric_combo.currentTextChanged.connect(self._on_metric_changed)
+        for combo in (self.x_combo, self.y_combo, self.stat_combo):
+            combo.currentTextChanged.connect(lambda _: self.refresh())
+        self.radius_spin.valueChanged.connect(lambda _: self.refresh())
+        self.higher_check.toggled.connect(lambda _: self.refresh())
+        self.smooth_check.toggled.connect(lambda _: self.refresh())
+
+    # -- data --------------------------------------------------------------
+    def set_store(self, store: ResultStore, params: list = ()):
+        self.store = store
+        self.params = list(params)
+        self.invalidate()
+
+    def invalidate(self):
+        """The results changed; recompute now if shown (throttled), else when shown."""
+        self._stale = True
+        if self.isVisible() and not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
+
+    def _usable_params(self) -> list:
+        """Numeric parameters with more than one value."""
+        store = self.store
+        return [n for n in self.params if n in store.columns and store.is_numeric(n)
+                and len(np.unique(store.values(n))) > 1]
+
+    def _sync_choices(self, params: list):
+        """Refill the combos when the available columns changed; keep the selections."""
+        metrics = [n for n in self.store.columns if n not in self.params and self.store.is_numeric(n)]
+        for combo, items, default in ((self.metric_combo, metrics, 'Sharpe'),
+                                      (self.x_combo, params, params[0] if params else ''),
+                                      (self.y_combo, params, params[1] if len(params) > 1 else '')):
+            if [combo.itemText(i) for i in range(combo.count())] == items:
+                continue
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(items)
+            combo.setCurrentText(current if current in items else default)
+            combo.blockSignals(False)
+            if combo is self.metric_combo and combo.currentText() != current:
+                self._on_metric_changed(combo.currentText(), refresh=False)
+
+    def _on_metric_changed(self, metric: str, refresh: bool = True):
+        self.higher_check.blockSignals(True)
+        self.higher_check.setChecked(PARETO_OBJECTIVES.get(metric, 'max') == 'max')
+        self.higher_check.blockSignals(False)
+        if refresh:
+            self.refresh()
+
+    # -- analysis ----------------------------------------------------------
+    def analysis(self):
+        """Sensitivity of the chosen metric, or None when the results cannot show one."""
+        if self.store is None or not len(self.store):
+            return None
+        params = self._usable_params()
+        self._sync_choices(params)
+        metric = self.metric_combo.currentText()
+        if not params or not metric:
+            return None
+        return Sensitivity.from_store(self.store, params, metric, self.higher_check.isChecked())
+
+    def refresh(self):
+        self._stale = False
+        self._refresh_timer.stop()
+        # Start from a fresh figure so the heatmap's colorbar goes too
+        self.canvas.figure.clear()
+        self.heat_ax, self.marginal_ax = self.canvas.figure.subplots(1, 2)
+        s = self.analysis()
+        if s is None:
+            self.status_label.setText("Sensitivity needs results that vary at least one parameter.")
+            self.canvas.draw_idle()
+            return
+
+        x, y = self.x_combo.currentText(), self.y_combo.currentText()
+        stat, radius = self.stat_combo.currentText(), self.radius_spin.value()
+        try:
+            smooth = s.robustness(radius)
+        except ValueError as e:
+            smooth = None
+            note = f" Robustness unavailable: {e}."
+        else:
+            note = ""
+
+        # Marginal along X: best, mean and best smoothed score per value
+        values, best = s.marginal(x, 'best')
+        self.marginal_ax.plot(values, best, marker='.', label='best')
+        self.marginal_ax.plot(values, s.marginal(x, 'mean')[1], marker='.', label='mean')
+        if smooth is not None:
+            self.marginal_ax.plot(values, s.project(smooth, x), marker='.', label=f'smoothed (r={radius})')
+        self.marginal_ax.set_xlabel(x)
+        self.marginal_ax.set_ylabel(s.metric)
+        self.marginal_ax.grid(True)
+        self.marginal_ax.legend(loc='best')
+
+        # Heatmap of X against Y
+        if y and y != x:
+            smoothed = self.smooth_check.isChecked() and smooth is not None
+            grid = s.project(smooth, y, x) if smoothed else s.heatmap(x, y, stat)
+            image = self.heat_ax.imshow(grid, origin='lower', aspect='auto', interpolation='nearest',
+                                        cmap='viridis' if s.maximize else 'viridis_r')
+            colorbar = self.canvas.figure.colorbar(image, ax=self.heat_ax)
+            colorbar.set_label(f"{s.metric} ({'smoothed' if smoothed else stat})")
+            for set_ticks, set_labels, axis in ((self.heat_ax.set_xticks, self.heat_ax.set_xticklabels, x),
+                                                (self.heat_ax.set_yticks, self.heat_ax.set_yticklabels, y)):
+                ticks = np.unique(np.linspace(0, len(s.axes[axis]) - 1, MAX_TICKS).astype(int))
+                set_ticks(ticks)
+                set_labels([f"{v:g}" for v in s.axes[axis][ticks]])
+            self.heat_ax.set_xlabel(x)
+            self.heat_ax.set_ylabel(y)
+        else:
+            self.heat_ax.text(0.5, 0.5, "Pick two different parameters", ha='center', va='center',
+                              transform=self.heat_ax.transAxes)
+        self.canvas.draw_idle()
+        self.status_label.setText(self._describe(s, radius) + note if smooth is not None else
+                                  f"{len(s)} runs over {', '.join(s.params)}." + note)
+
+    @staticmethod
+    def _describe(s: Sensitivity, radius: int) -> str:
+        summary = s.summary(radius)
+        if summary is None:
+            return f"No run has a {s.metric} value."
+
+        def at(params):
+            return ', '.join(f"{k}={v:g}" for k, v in params.items())
+
+        text = (f"{len(s)} runs. Best {s.metric} {summary['best_value']:.4g} at {at(summary['best'])} "
+                f"(neighborhood score {summary['best_score']:.4g}, radius {radius}).")
+        if summary['robust'] != summary['best']:
+            text += (f" Most robust: {at(summary['robust'])} with score {summary['robust_score']:.4g} "
+                     f"({s.metric} {summary['robust_value']:.4g}).")
+        else:
+            text += " The optimum is also the most robust cell."
+        return text
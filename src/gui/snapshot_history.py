@@ -0,0 +1,175 @@
+# src/gui/snapshot_history.py
+"""
+SnapshotHistoryModel: lazy, paginated view over the snapshots table.
+PreviewLoader: reads and decodes snapshot images off the UI thread.
+"""
+
+import sqlite3
+
+from PySide6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, Signal
+)
+from PySide6.QtGui import QImage
+from src.data.snapshot_store import search_clause
+
+# (column, header) pairs shown in the history view
+HISTORY_COLUMNS = [
+    ('id', 'ID'),
+    ('symbol', 'Symbol'),
+    ('date', 'Date'),
+    ('title', 'Title'),
+    ('strategy', 'Strategy'),
+    ('sharpe', 'Sharpe'),
+    ('live', 'Live'),
+]
+
+# BLOB columns holding the three preview charts
+IMAGE_COLUMNS = ('equity_img', 'drawdown_img', 'histogram_img')
+
+
+def read_blob(conn: sqlite3.Connection, table: str, column: str, rowid: int) -> bytes:
+    """
+    Read a single BLOB cell. Uses incremental BLOB I/O (Python 3.11+) so the
+    value is streamed straight from the page cache; falls back to a SELECT
+    on older interpreters. Returns b'' for NULL or missing cells.
+    """
+    if hasattr(conn, 'blobopen'):
+        try:
+            with conn.blobopen(table, column, rowid, readonly=True) as blob:
+                return blob.read()
+        except sqlite3.OperationalError:
+            # NULL / zero-length cells cannot be opened as blobs
+            return b''
+    row = conn.execute(f"SELECT {column} FROM {table} WHERE id = ?", (rowid,)).fetchone()
+    return bytes(row[0]) if row and row[0] else b''
+
+
+class SnapshotHistoryModel(QAbstractTableModel):
+    """
+    Table model that pages through snapshots newest-first.
+
+    Rows are fetched PAGE_SIZE at a time with keyset pagination on
+    (date, id), so each page is an index range scan regardless of how
+    many snapshots are stored. Qt views call fetchMore() as the user
+    scrolls towards the end of the loaded rows. set_query() narrows the
+    rows with a search-bar query (see snapshot_store.search_clause).
+    """
+    PAGE_SIZE = 200
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.table = store.table
+        self._rows = []
+        self._exhausted = False
+        self._where, self._where_args = '', []
+
+    def set_query(self, query: str):
+        """Filter by a search query and reload from the first page."""
+        self._where, self._where_args = search_clause(query, self.table)
+        self.refresh()
+
+    # -- pagination -------------------------------------------------------
+    def refresh(self):
+        """Drop all loaded rows and fetch the first page again."""
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = False
+        self._rows.extend(self._query_page())
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        page = self._query_page()
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def _query_page(self):
+        cols = ", ".join(c for c, _ in HISTORY_COLUMNS)
+        clauses, args = [], []
+        if self._where:
+            clauses.append(self._where)
+            args += self._where_args
+        if self._rows:
+            # Continue strictly after the last row already loaded
+            last_id, last_date = self._rows[-1][0], self._rows[-1][2]
+            clauses.append("(date < ? OR (date = ? AND id < ?))")
+            args += [last_date, last_date, last_id]
+        sql = f"SELECT {cols} FROM {self.table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date DESC, id DESC LIMIT ?"
+        args.append(self.PAGE_SIZE)
+        with self.store.reader() as conn:
+            page = conn.execute(sql, args).fetchall()
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        return page
+
+    # -- model interface --------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HISTORY_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        val = self._rows[index.row()][index.column()]
+        if val is None:
+            return ""
+        if isinstance(val, float):
+            return f"{val:.2f}"
+        return str(val)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HISTORY_COLUMNS[section][1]
+        return None
+
+    def snapshot_id(self, row: int) -> int:
+        """Return the database id of the snapshot shown at `row`."""
+        return int(self._rows[row][0])
+
+
+class PreviewSignals(QObject):
+    loaded = Signal(int, list)   # snapshot id, [QImage, QImage, QImage]
+    failed = Signal(int, str)    # snapshot id, error message
+
+
+class PreviewLoader(QRunnable):
+    """
+    Read the three chart BLOBs of one snapshot and decode them into
+    QImages on a QThreadPool worker. QImage (unlike QPixmap) is safe to
+    build outside the GUI thread; the dialog converts to QPixmap on receipt.
+    """
+
+    def __init__(self, store, snapshot_id: int, max_size=(1920, 1080)):
+        super().__init__()
+        self.store = store
+        self.snapshot_id = snapshot_id
+        self.max_size = max_size
+        self.signals = PreviewSignals()
+
+    def run(self):
+        try:
+            with self.store.reader() as conn:
+                blobs = [read_blob(conn, self.store.table, col, self.snapshot_id) for col in IMAGE_COLUMNS]
+            images = []
+            for blob in blobs:
+                img = QImage.fromData(blob)
+                if not img.isNull():
+                    img = img.scaled(*self.max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                images.append(img)
+            self.signals.loaded.emit(self.snapshot_id, images)
+        except Exception as e:
+            self.signals.failed.emit(self.snapshot_id, str(e))
@@ -10,12 +10,14 @@ from src.backtester.strategies import (
     SmaCross, SmaWithTrailing, AtrPositionSizing,
     TimedExitSma, MultiTimeframeSma
 )
+from src.optimizer.constraints import Ordered, Saturates, WarmUp
 
 class StrategySelectorWidget(QWidget):
     strategyChanged = Signal(str)
 
-    # Map display names to (class, parameter specs)
+    # Map display names to (class, parameter specs, optimization constraints)
     # Each param spec: (param_key, type, default, min, step, precision)
+    # Constraints (see src/optimizer/constraints.py) prune sweep grids
     STRATEGIES = {
         'SMA Crossover': (
             SmaCross,
@@ -25,7 +27,8 @@ class StrategySelectorWidget(QWidget):
                 ('stop_loss_pct',   float, 0.02, 0.01,0.01,2),
                 ('take_profit_pct', float, 0.05, 0.01,0.01,2),
                 ('risk_per_trade_pct', float,0.01,0.01,0.01,2)
-            ]
+            ],
+            [Ordered('sma_short', 'sma_long'), WarmUp('sma_short', 'sma_long')]
         ),
         'SMA with Trailing': (
             SmaWithTrailing,
@@ -33,7 +36,8 @@ class StrategySelectorWidget(QWidget):
                 ('fast',    int,    10,   1,   1, 0),
                 ('slow',    int,    30,   1,   1, 0),
                 ('trail_pct', float, 0.03, 0.01,0.01,2)
-            ]
+            ],
+            [Ordered('fast', 'slow'), WarmUp('fast', 'slow')]
         ),
         'ATR Position Sizing': (
             AtrPositionSizing,
@@ -43,7 +47,8 @@ class StrategySelectorWidget(QWidget):
                 ('atr_period', int,    14,   1,   1, 0),
                 ('atr_mult',   float,  3.0,  0.1, 0.1,1),
                 ('risk_perc',  float,  0.01, 0.01,0.01,2)
-            ]
+            ],
+            [Ordered('fast', 'slow'), WarmUp('fast', 'slow', 'atr_period')]
         ),
         'Timed Exit SMA': (
             TimedExitSma,
@@ -51,14 +56,17 @@ class StrategySelectorWidget(QWidget):
                 ('fast',    int,    10,   1,   1, 0),
                 ('slow',    int,    30,   1,   1, 0),
                 ('max_hold',int,    20,   1,   1, 0)
-            ]
+            ],
+            # A trade cannot last longer than the bars after the warm-up
+            [Ordered('fast', 'slow'), WarmUp('fast', 'slow'), Saturates('max_hold', 'slow')]
         ),
         'Multi Timeframe SMA': (
             MultiTimeframeSma,
             [
                 ('fast',    int,    10,   1,   1, 0),
                 ('slow',    int,    30,   1,   1, 0)
-            ]
+            ],
+            [Ordered('fast', 'slow'), WarmUp('fast', 'slow')]
         )
     }
 
@@ -92,7 +100,7 @@ class StrategySelectorWidget(QWidget):
                 w.deleteLater()
 
         self.inputs = {}
-        cls, specs = self.STRATEGIES[name]
+        cls, specs, _ = self.STRATEGIES[name]
         for key, ptype, default, minimum, step, precision in specs:
             label = key.replace('_', ' ').title()
             if ptype is int:
@@ -119,6 +127,6 @@ class StrategySelectorWidget(QWidget):
         Returns (strategy_class, parameters_dict).
         """
         name = self.combo.currentText()
-        cls, _ = self.STRATEGIES[name]
+        cls, _, _ = self.STRATEGIES[name]
         params = self.get_parameters()
         return cls, params
\ No newline at end of file
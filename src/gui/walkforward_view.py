@@ -0,0 +1,107 @@
+# src/gui/walkforward_view.py
+"""
+WalkForwardView: the result of a walk-forward run, kept apart from the
+sweep results (their columns, Pareto front and report differ).
+
+The table lists one row per window: its train and test dates, the
+chosen parameters, their in-sample score and the out-of-sample return.
+The plot shows the stitched out-of-sample equity curve, with a dashed
+line where each test window starts. Export writes that curve to CSV.
+"""
+
+import pandas as pd
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView, QSplitter, QFileDialog,
+    QMessageBox
+)
+from PySide6.QtCore import Qt
+
+from src.gui.results_model import ResultsTableModel
+from src.optimizer.walkforward import WalkForwardResult
+from src.utils.logger import logger
+
+
+def window_rows(wf: WalkForwardResult, param_names: list) -> list:
+    """One table row per window ('-' where no candidate could run)."""
+    rows = []
+    for w in wf.windows:
+        rows.append({
+            'Train': f"{w['train_start']:%Y-%m-%d %H:%M} – {w['train_end']:%Y-%m-%d %H:%M}",
+            'Test': f"{w['test_start']:%Y-%m-%d %H:%M} – {w['test_end']:%Y-%m-%d %H:%M}",
+            **(w['params'] or {name: '-' for name in param_names}),
+            'InSample': '-' if w['in_sample'] is None else round(w['in_sample'], 2),
+            'OOS %': round(w['oos_return'], 2),
+        })
+    return rows
+
+
+class WalkForwardView(QWidget):
+    """Per-window table and out-of-sample equity of one WalkForwardResult."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result = None
+        layout = QVBoxLayout(self)
+
+        row = QHBoxLayout()
+        self.status_label = QLabel("Run a walk-forward to see its out-of-sample results.")
+        self.status_label.setWordWrap(True)
+        row.addWidget(self.status_label, 1)
+        self.export_btn = QPushButton("Export Equity")
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self.export_equity)
+        row.addWidget(self.export_btn)
+        layout.addLayout(row)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.model = ResultsTableModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        splitter.addWidget(self.table)
+        self.canvas = FigureCanvas(Figure(figsize=(8, 3)))
+        self.ax = self.canvas.figure.add_subplot(111)
+        splitter.addWidget(self.canvas)
+        layout.addWidget(splitter)
+
+    def set_result(self, wf: WalkForwardResult, param_names: list):
+        self.result = wf
+        self.model.set_rows(window_rows(wf, param_names))
+        self.status_label.setText(
+            f"Walk-forward over {len(wf)} windows: out-of-sample return {wf.oos_return:+.2f}%")
+        self.export_btn.setEnabled(bool(len(wf.equity)))
+        self.redraw()
+
+    def redraw(self):
+        self.ax.clear()
+        wf = self.result
+        if wf is not None and len(wf.equity):
+            self.ax.plot(wf.dates, wf.equity, lw=1.2, label='Out-of-sample equity')
+            for w in wf.windows[1:]:
+                self.ax.axvline(w['test_start'], color='grey', lw=0.6, ls='--')
+            self.ax.axhline(wf.start_value, color='black', lw=0.6)
+            self.ax.set_ylabel('Equity')
+            self.ax.legend(loc='best')
+            self.ax.grid(True)
+            self.canvas.figure.autofmt_xdate()
+        self.canvas.draw_idle()
+
+    def equity_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'Date': list(self.result.dates), 'Equity': self.result.equity})
+
+    def export_equity(self):
+        if self.result is None or not len(self.result.equity):
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Walk-Forward Equity",
+                                              "walkforward_equity.csv", "CSV Files (*.csv)")
+        if not path:
+            return
+        if not path.lower().endswith('.csv'):
+            path += '.csv'
+        try:
+            self.equity_frame().to_csv(path, index=False)
+            QMessageBox.information(self, "Export", f"{len(self.result.equity)} bars saved to {path}")
+        except Exception as e:
+            logger.exception("Walk-forward export failed")
+            QMessageBox.critical(self, "Export Error", str(e))
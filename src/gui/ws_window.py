@@ -2,13 +2,13 @@
 
 import pandas as pd
 import yfinance as yf
-import backtrader as bt
 from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout,
     QPushButton, QFileDialog, QMessageBox,
     QTableWidget, QTableWidgetItem, QLabel, QLineEdit, QSpinBox
 )
+from src.data.feeds import ArrayData
 from src.utils.logger import logger
 
 class WsBacktestWindow(QWidget):
@@ -21,6 +21,10 @@ class WsBacktestWindow(QWidget):
         self.live_df = pd.DataFrame(columns=["Date","Open","High","Low","Close","Volume"])
         self.poll_timer = None
         self.engine = None
+        # Optional LiveBarStore fed by a BarAggregator (see bind_bar_store)
+        self.bar_store = None
+        # Optional MarketRecorder; polled candles are appended to it
+        self.recorder = None
 
         # Default parameters
         self.ticker = "SPY"
@@ -112,6 +116,8 @@ class WsBacktestWindow(QWidget):
             df = df.reset_index()
             df = df[["Date","Open","High","Low","Close","Volume"]].dropna()
             # Volume zero indicates index or no trades
+            if self.recorder is not None:
+                self.recorder.record_frame(self.ticker, df)
 
             # Append and dedupe
             self.live_df = pd.concat([self.live_df, df])\
@@ -125,6 +131,26 @@ class WsBacktestWindow(QWidget):
             logger.exception(e)
             QMessageBox.critical(self, "Fetch Error", str(e))
 
+    def bind_bar_store(self, store):
+        """
+        Show bars completed by a streaming BarAggregator instead of polling
+        yfinance. Bars for the current ticker replace live_df as they arrive;
+        feed the aggregator from QtStreamBridge.batch_ready so that happens
+        on the GUI thread.
+        """
+        if self.bar_store is not None:
+            self.bar_store.unsubscribe(self._on_live_bar)
+        self.bar_store = store
+        store.subscribe(self._on_live_bar)
+
+    def _on_live_bar(self, symbol, bar):
+        if symbol.upper() != self.ticker:
+            return
+        self.live_df = self.bar_store.to_dataframe(symbol)
+        self.data_rows = len(self.live_df)
+        self.rowcount.setText(f"Rows: {self.data_rows}")
+        self._refresh_table()
+
     def on_browse_csv(self):
         # Fallback to CSV
         if self.poll_timer and self.poll_timer.isActive():
@@ -166,22 +192,9 @@ class WsBacktestWindow(QWidget):
                 self.table.setItem(i, j, QTableWidgetItem(txt))
 
     def get_datafeed(self):
-        """Return a list containing a single Backtrader PandasData feed"""
+        """Return a list containing a single Backtrader ArrayData feed"""
         if self.data_rows == 0 or self.live_df.empty:
             raise RuntimeError("No data loaded – start live feed or browse for CSV first.")
 
-        df = self.live_df.copy()
-        df.rename(columns={"Date": "datetime"}, inplace=True)
-        df.set_index("datetime", inplace=True)
-        df["openinterest"] = 0
-        feed = bt.feeds.PandasData(
-            dataname=df,
-            datetime=None,
-            open="Open",
-            high="High",
-            low="Low",
-            close="Close",
-            volume="Volume",
-            openinterest="openinterest"
-        )
+        feed = ArrayData.from_dataframe(self.live_df)
         return [feed]
\ No newline at end of file
@@ -0,0 +1,266 @@
+# src/optimizer/checkpoint.py
+"""
+SweepStore: SQLite checkpoints for optimization sweeps.
+
+Every completed combo (result row plus float32 equity curve) is queued
+to a BatchWriter as soon as it finishes, which commits whatever is
+waiting in one transaction, under a key derived from the sweep definition:
+strategy, parameter ladders, search mode, seed, budget, objective and a
+fingerprint of the data. Running the same definition again resumes it:
+
+    store = SweepStore('sweeps.db')
+    definition = sweep_definition(strat_cls, feeds, space, mode, seed, budget)
+    ckpt = store.checkpoint(sweep_key(definition), definition)
+    executor.run(sampler, budget, checkpoint=ckpt)   # stored combos are not rerun
+
+Stored combos are replayed to the sampler in the order it proposes them,
+so seeded (and adaptive) searches continue exactly where they stopped.
+Combos that could not run are stored too and are not retried.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+import backtrader as bt
+import numpy as np
+
+from src.data.snapshot_store import PRAGMAS, BatchWriter
+from src.optimizer.executor import RUN_METRICS
+from src.optimizer.space import ParamSpace
+from src.utils.logger import logger
+
+
+def _migration_1(conn):
+    """Sweeps and their per-combo results."""
+    conn.execute(
+        """
+        CREATE TABLE sweeps (
+            key TEXT PRIMARY KEY,
+            definition TEXT,
+            created TEXT,
+            updated TEXT,
+            complete INTEGER DEFAULT 0,
+            dates BLOB
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE sweep_results (
+            sweep TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            combo TEXT NOT NULL,
+            row TEXT,
+            equity BLOB,
+            PRIMARY KEY (sweep, combo)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX idx_sweep_results_seq ON sweep_results (sweep, seq)")
+
+
+# Ordered list of (version, callable(conn)); append, never edit
+MIGRATIONS = [
+    (1, _migration_1),
+]
+
+
+def combo_key(params: dict) -> str:
+    """Canonical text of one combo (values are already rounded by the space)."""
+    return json.dumps(params, sort_keys=True)
+
+
+def sweep_definition(strat_cls: type, feeds: list, space: ParamSpace, mode: str,
+                     seed: int = None, budget: int = None, objective: str = 'FinalValue',
+                     **extra) -> dict:
+    """Everything that determines a sweep's combos and results, as plain data."""
+    return {
+        'strategy': f"{strat_cls.__module__}.{strat_cls.__qualname__}",
+        'data': [f.p.dataname.fingerprint() for f in feeds],
+        'params': [[p.name, p.low, p.high, p.step, p.is_int, p.precision] for p in space.params],
+        'constraints': [repr(c) for c in space.constraints],
+        'mode': mode,
+        # The grid ignores seed and budget
+        'seed': None if mode == 'grid' else seed,
+        'budget': None if mode == 'grid' else budget,
+        'objective': objective,
+        # Rows saved with other result columns are not resumed
+        'columns': list(RUN_METRICS),
+        **extra,
+    }
+
+
+def sweep_key(definition: dict) -> str:
+    return hashlib.sha1(json.dumps(definition, sort_keys=True).encode()).hexdigest()
+
+
+class SweepStore:
+    """Owns the connection to the sweep checkpoint database."""
+
+    def __init__(self, db_path: str = 'sweeps.db', batch_size: int = 64):
+        self.db_path = db_path
+        # Reads share one connection; every write goes through the writer thread
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._migrate()
+        self._writer = BatchWriter(self._connect, "SweepStoreWriter", batch_size)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued write is committed (see BatchWriter.flush)."""
+        return self._writer.flush(timeout)
+
+    def _migrate(self):
+        conn = self._conn
+        conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+        current = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+        for version, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            conn.execute("BEGIN")
+            try:
+                migrate(conn)
+                conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            logger.info(f"SweepStore: migrated {self.db_path} to schema v{version}")
+
+    # -- sweeps -----------------------------------------------------------
+    def checkpoint(self, key: str, definition: dict = None) -> 'SweepCheckpoint':
+        """Open (creating if needed) the sweep `key` for resuming and writing."""
+        now = datetime.now().isoformat(timespec='seconds')
+        self._writer.put("INSERT OR IGNORE INTO sweeps (key, definition, created, updated) VALUES (?, ?, ?, ?)",
+                         (key, json.dumps(definition, sort_keys=True), now, now))
+        self.flush()
+        return SweepCheckpoint(self, key)
+
+    def info(self, key: str) -> Optional[dict]:
+        """Definition, progress and timestamps of a stored sweep (None if unknown)."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT definition, created, updated, complete, "
+                "(SELECT COUNT(*) FROM sweep_results WHERE sweep = key), "
+                "(SELECT COUNT(*) FROM sweep_results WHERE sweep = key AND row IS NULL) "
+                "FROM sweeps WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {'definition': json.loads(row[0]) if row[0] else None, 'created': row[1],
+                'updated': row[2], 'complete': bool(row[3]), 'done': row[4], 'skipped': row[5]}
+
+    def dates(self, key: str) -> list:
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT dates FROM sweeps WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] is None:
+            return []
+        return [bt.num2date(x) for x in np.frombuffer(row[0], dtype=np.float64)]
+
+    def iter_results(self, key: str, chunk: int = 1000,
+                     after: int = -1) -> Iterator[List[Tuple[int, dict, np.ndarray]]]:
+        """
+        Completed combos in the order they finished, `chunk` at a time, as
+        lists of (seq, row, equity). after: only combos with a larger seq.
+        Combos that could not run are left out.
+        """
+        self.flush()
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, row, equity FROM sweep_results "
+                    "WHERE sweep = ? AND seq > ? AND row IS NOT NULL ORDER BY seq LIMIT ?",
+                    (key, after, chunk)).fetchall()
+            if not rows:
+                return
+            yield [(seq, json.loads(row), np.frombuffer(eq, dtype=np.float32)) for seq, row, eq in rows]
+            after = rows[-1][0]
+
+    def delete(self, key: str):
+        self._writer.put("DELETE FROM sweep_results WHERE sweep = ?", (key,))
+        self._writer.put("DELETE FROM sweeps WHERE key = ?", (key,))
+        self.flush()
+
+    def close(self):
+        """Write what is queued and close both connections."""
+        self._writer.close()
+        with self._lock:
+            self._conn.close()
+
+
+class SweepCheckpoint:
+    """
+    One sweep's view of the store, handed to SweepExecutor.run().
+    get() looks up a combo; put()/skip() queue one combo each for the
+    store's writer, so if the process dies only the combos still queued
+    (typically the last few) are lost and rerun on resume.
+    """
+
+    def __init__(self, store: SweepStore, key: str):
+        self.store = store
+        self.key = key
+        conn = store._conn
+        with store._lock:
+            stored = conn.execute("SELECT combo, row, equity FROM sweep_results WHERE sweep = ?",
+                                  (key,)).fetchall()
+            self._seq = conn.execute("SELECT COALESCE(MAX(seq), -1) FROM sweep_results WHERE sweep = ?",
+                                     (key,)).fetchone()[0]
+            has_dates = conn.execute("SELECT dates IS NOT NULL FROM sweeps WHERE key = ?",
+                                     (key,)).fetchone()[0]
+        # combo -> (row or None, equity or None); equity blobs stay as bytes until used
+        self._done = {combo: (json.loads(row) if row else None, equity) for combo, row, equity in stored}
+        self._has_dates = bool(has_dates)
+
+    def __len__(self):
+        return len(self._done)
+
+    def get(self, params: dict):
+        """None if the combo is not stored, else (row, equity); row None means it could not run."""
+        hit = self._done.get(combo_key(params))
+        if hit is None:
+            return None
+        row, equity = hit
+        return row, None if equity is None else np.frombuffer(equity, dtype=np.float32)
+
+    def dates(self) -> list:
+        return self.store.dates(self.key)
+
+    def put(self, params: dict, row: dict, equity: np.ndarray, datenums=None):
+        """Queue one completed combo (datenums: the run's dates, stored once per sweep)."""
+        blob = np.asarray(equity, dtype=np.float32).tobytes()
+        self._write(params, json.dumps(row), blob, datenums)
+        self._done[combo_key(params)] = (row, blob)
+
+    def skip(self, params: dict):
+        """Queue a combo that could not run, so a resume does not retry it."""
+        self._write(params, None, None, None)
+        self._done[combo_key(params)] = (None, None)
+
+    def finish(self):
+        """Mark the sweep as run to the end and wait until everything is committed."""
+        now = datetime.now().isoformat(timespec='seconds')
+        self.store._writer.put("UPDATE sweeps SET updated = ?, complete = 1 WHERE key = ?", (now, self.key))
+        self.store.flush()
+
+    def _write(self, params, row, blob, datenums):
+        writer = self.store._writer
+        now = datetime.now().isoformat(timespec='seconds')
+        self._seq += 1
+        writer.put("INSERT OR REPLACE INTO sweep_results (sweep, seq, combo, row, equity) VALUES (?, ?, ?, ?, ?)",
+                   (self.key, self._seq, combo_key(params), row, blob))
+        if datenums is not None and not self._has_dates:
+            writer.put("UPDATE sweeps SET dates = ? WHERE key = ?",
+                       (np.asarray(datenums, dtype=np.float64).tobytes(), self.key))
+            self._has_dates = True
+        writer.put("UPDATE sweeps SET updated = ? WHERE key = ?", (now, self.key))
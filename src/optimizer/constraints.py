@@ -0,0 +1,102 @@
+# src/optimizer/constraints.py
+"""
+Declarative constraints on a ParamSpace.
+
+Strategies list their constraints next to their parameter specs (see
+StrategySelectorWidget.STRATEGIES). Constraints work on whole columns of
+candidate values, so a grid of millions of combos is filtered with a
+few array operations before any run is dispatched:
+
+  Ordered('fast', 'slow')          fast < slow
+  WarmUp('fast', 'slow')           the longest look-back is shorter than
+                                   the data (longer ones cannot run)
+  Saturates('max_hold', 'slow')    every max_hold past the bars left after
+                                   the slow warm-up behaves the same
+
+mask() marks the feasible rows. key() maps values to a representative of
+their equivalence class; combos with equal keys give identical runs, so
+only the first of them is kept. WarmUp and Saturates need the bar count
+and do nothing without it. A constraint naming a parameter the space
+lacks is ignored.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class Constraint:
+    """Base class; `names` are the parameters a constraint reads."""
+    names = ()
+
+    def applies(self, names) -> bool:
+        return all(n in names for n in self.names)
+
+    def mask(self, cols: Dict[str, np.ndarray], bars: Optional[int]) -> np.ndarray:
+        """Feasible rows of `cols` (name -> values, equal lengths)."""
+        return np.ones(len(cols[self.names[0]]), dtype=bool)
+
+    def key(self, cols: Dict[str, np.ndarray], bars: Optional[int]) -> Dict[str, np.ndarray]:
+        """Columns to replace by their class representative (none by default)."""
+        return {}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(map(repr, self.names))})"
+
+
+class Ordered(Constraint):
+    """Each parameter is strictly below the next one."""
+
+    def __init__(self, *names: str):
+        if len(names) < 2:
+            raise ValueError("Ordered needs at least two parameters")
+        self.names = names
+
+    def mask(self, cols, bars):
+        ok = super().mask(cols, bars)
+        for a, b in zip(self.names, self.names[1:]):
+            ok &= cols[a] < cols[b]
+        return ok
+
+
+class WarmUp(Constraint):
+    """
+    The longest of these look-backs (plus `extra` bars) is below the bar
+    count; a run whose indicators cannot warm up fails with IndexError.
+    """
+
+    def __init__(self, *names: str, extra: int = 0):
+        if not names:
+            raise ValueError("WarmUp needs at least one parameter")
+        self.names = names
+        self.extra = extra
+
+    def mask(self, cols, bars):
+        ok = super().mask(cols, bars)
+        if bars is None:
+            return ok
+        longest = np.max([cols[n] for n in self.names], axis=0)
+        return ok & (longest + self.extra < bars)
+
+    def __repr__(self):
+        extra = f", extra={self.extra}" if self.extra else ""
+        return f"WarmUp({', '.join(map(repr, self.names))}{extra})"
+
+
+class Saturates(Constraint):
+    """
+    `name` counts bars (e.g. a maximum holding period) and can never be
+    reached past the bars left after the warm-up of `after`; all such
+    values form one class.
+    """
+
+    def __init__(self, name: str, *after: str):
+        self.name = name
+        self.after = after
+        self.names = (name, *after)
+
+    def key(self, cols, bars):
+        if bars is None:
+            return {}
+        left = bars - np.max([cols[n] for n in self.after], axis=0) if self.after else bars
+        return {self.name: np.minimum(cols[self.name], left)}
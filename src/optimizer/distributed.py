@@ -0,0 +1,741 @@
+# src/optimizer/distributed.py
+"""
+Distributed sweeps: one coordinator, any number of headless TCP workers.
+
+The coordinator splits the candidate combos into work units and serves
+them to workers that connect over TCP:
+
+    worker -> hello (token, cached dataset fingerprints)
+    worker -> request             <- unit (strategy, datasets, combos, lease)
+                                  <- wait (nothing free right now) / done
+    worker -> fetch fingerprint   <- dataset (only when not cached)
+    worker -> renew unit          <- ok / revoked      (after every combo or pool task)
+    worker -> result unit         <- ack               (rows + equity curves)
+    worker -> error unit          <- ack
+
+Every message is a length-prefixed JSON header plus an optional binary
+payload (dataset columns, equity curves); nothing is unpickled. A unit is
+leased to one worker at a time. When the worker disconnects, or its lease
+runs out without a renewal, the unit goes back to the queue, up to
+max_attempts leases. Results are accepted once per unit; late duplicates
+from a worker that lost its lease are ignored. A message with a missing
+or invalid field gets an error reply and changes nothing.
+
+The coordinator binds to 127.0.0.1 unless told otherwise, and refuses
+to listen on any other address without a token.
+
+Workers run each combo through BacktestEngine with the coordinator's cash
+and commission (by default Cerebro's, matching SweepExecutor) and keep
+datasets by content fingerprint, in memory and optionally in a cache
+directory, so a dataset crosses the network once per worker. With
+--processes N a worker spreads each unit over a local warm WorkerPool.
+
+    python -m src.optimizer.distributed coordinator --csv data.csv --strategy SmaCross \\
+        --range sma_short=5:50:5 --range sma_long=20:200:10 --host 0.0.0.0 --port 5555 \\
+        --token SECRET --out results.csv
+    python -m src.optimizer.distributed worker --connect host:5555 --token SECRET \\
+        [--cache-dir DIR] [--processes N]
+"""
+
+import argparse
+import hmac
+import importlib
+import ipaddress
+import json
+import math
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Callable, List, Optional
+
+import backtrader as bt
+import numpy as np
+
+from src.backtester.engine import BacktestEngine
+from src.data.feeds import FEED_LINES, ArrayData, OHLCVArrays, clone_feed
+from src.optimizer.executor import SweepResult, add_recorders, run_metrics
+from src.optimizer.pool import build_feeds, feed_specs, get_pool
+from src.utils.logger import logger
+
+_FRAME = struct.Struct('!IQ')   # header bytes, payload bytes
+
+# Feed parameters sent to workers (others keep their defaults)
+_FEED_PARAMS = (int, float, str, bool, type(None))
+
+
+# --- framing ----------------------------------------------------------------
+
+def send_msg(sock: socket.socket, header: dict, payload: bytes = b''):
+    data = json.dumps(header).encode()
+    sock.sendall(_FRAME.pack(len(data), len(payload)) + data)
+    if payload:
+        sock.sendall(payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if not k:
+            raise ConnectionError("connection closed")
+        got += k
+    return bytes(buf)
+
+
+def recv_msg(sock: socket.socket):
+    """(header dict, payload bytes); ConnectionError when the peer is gone."""
+    n_header, n_payload = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    header = json.loads(_recv_exact(sock, n_header))
+    if not isinstance(header, dict):
+        raise ValueError("message header is not a JSON object")
+    payload = _recv_exact(sock, n_payload) if n_payload else b''
+    return header, payload
+
+
+def _pack_arrays(arrays: OHLCVArrays) -> bytes:
+    return b''.join(getattr(arrays, name).tobytes() for name in FEED_LINES)
+
+
+def _unpack_arrays(payload, bars: int) -> OHLCVArrays:
+    block = np.frombuffer(payload, dtype=np.float64).reshape(len(FEED_LINES), bars)
+    return OHLCVArrays(*block)
+
+
+# --- coordinator --------------------------------------------------------------
+
+def is_loopback(host: str) -> bool:
+    """True if binding `host` only accepts connections from this machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class BadMessage(ValueError):
+    """A worker message with a missing or invalid field."""
+
+
+class _Unit:
+    __slots__ = ('id', 'combos', 'attempts', 'worker', 'deadline')
+
+    def __init__(self, uid: int, combos: List[dict]):
+        self.id = uid
+        self.combos = combos
+        self.attempts = 0
+        self.worker = None
+        self.deadline = None
+
+
+class Coordinator:
+    """
+    -- strat_cls: strategy class (workers import it by module and name)
+    -- feeds: ArrayData feeds every combo runs on
+    -- candidates: params dicts to evaluate
+    -- unit_size: combos per work unit
+    -- lease: seconds a worker may go without renewing its unit
+    -- max_attempts: leases per unit before its combos are given up
+    -- token: shared secret workers must present (None: no check, which
+       is only allowed on a loopback host)
+    -- cash, commission: broker settings of every run
+    """
+
+    def __init__(self, strat_cls: type, feeds: list, candidates: List[dict],
+                 objective: str = 'FinalValue', unit_size: int = 8, lease: float = 60.0,
+                 max_attempts: int = 3, host: str = '127.0.0.1', port: int = 0,
+                 token: str = None, cash: float = None, commission: float = 0.0):
+        if token is None and not is_loopback(host):
+            raise ValueError(f"refusing to serve on {host!r} without a token")
+        self.strategy = f"{strat_cls.__module__}:{strat_cls.__qualname__}"
+        self.objective = objective
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.token = token
+        self.cash = bt.Cerebro().broker.startingcash if cash is None else cash
+        self.commission = commission
+        self.datasets = {}
+        self.dataset_specs = []
+        for feed in feeds:
+            arrays = feed.p.dataname
+            fp = arrays.fingerprint()
+            self.datasets[fp] = arrays
+            params = {k: v for k, v in feed.p._getkwargs().items()
+                      if k != 'dataname' and isinstance(v, _FEED_PARAMS)}
+            self.dataset_specs.append({'fingerprint': fp, 'bars': len(arrays), 'params': params})
+        self.dates = [bt.num2date(x) for x in feeds[0].p.dataname.datetime]
+
+        self.units = [_Unit(i, candidates[s:s + unit_size])
+                      for i, s in enumerate(range(0, len(candidates), unit_size))]
+        self._pending = deque(self.units)
+        self._done = {}                 # unit id -> (rows, skipped, equities)
+        self.failed = []                # units given up after max_attempts
+        self.workers = {}               # worker id -> {'address', 'units', 'connected'}
+        self._lock = threading.Lock()
+        self._completed = queue.Queue()  # unit ids, for wait()
+
+        coordinator = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                coordinator._serve(self.request, self.client_address)
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler, bind_and_activate=False)
+        self._server.allow_reuse_address = True
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def start(self):
+        self._server.server_bind()
+        self._server.server_activate()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="SweepCoordinator",
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"Coordinator on {self.address[0]}:{self.address[1]}: "
+                    f"{len(self.units)} units of up to {len(self.units[0].combos) if self.units else 0} combos")
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return len(self._done) + len(self.failed) == len(self.units)
+
+    def status(self) -> dict:
+        """Unit counts by state and per-worker progress."""
+        with self._lock:
+            leased = sum(1 for u in self.units if u.worker is not None)
+            return {'units': len(self.units), 'done': len(self._done), 'failed': len(self.failed),
+                    'leased': leased, 'pending': len(self._pending),
+                    'workers': {w: dict(info) for w, info in self.workers.items()}}
+
+    def wait(self, timeout: float = None, on_result: Callable[[dict], None] = None,
+             should_stop: Callable[[], bool] = None) -> SweepResult:
+        """
+        Block until every unit is done or given up (or timeout/should_stop),
+        calling on_result(row) in this thread as results arrive. Rows come
+        back in candidate order whatever order the units finished in.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while not self.finished:
+            if should_stop is not None and should_stop():
+                break
+            if end is not None and time.monotonic() >= end:
+                break
+            self._expire_leases()
+            try:
+                uid = self._completed.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if on_result is not None and uid is not None:
+                for row in self._done[uid][0]:
+                    on_result(row)
+        return self.result()
+
+    def result(self) -> SweepResult:
+        result = SweepResult('distributed')
+        with self._lock:
+            for unit in self.units:
+                if unit.id in self._done:
+                    rows, skipped, equities = self._done[unit.id]
+                    result.rows.extend(rows)
+                    result.skipped.extend(skipped)
+                    result.equities.extend(equities)
+                elif unit in self.failed:
+                    result.skipped.extend(unit.combos)
+        if result.rows:
+            result.dates = self.dates
+        return result
+
+    # -- unit bookkeeping (callers hold no lock) -------------------------
+    def _expire_leases(self):
+        now = time.monotonic()
+        with self._lock:
+            for unit in self.units:
+                if unit.worker is not None and unit.deadline < now:
+                    logger.warning(f"Unit {unit.id}: lease of worker {unit.worker} expired")
+                    self._requeue(unit)
+
+    def _requeue(self, unit: _Unit):
+        # Lock held
+        if unit.worker in self.workers:
+            self.workers[unit.worker]['units'] = [u for u in self.workers[unit.worker]['units'] if u != unit.id]
+        unit.worker = unit.deadline = None
+        if unit.attempts >= self.max_attempts:
+            logger.error(f"Unit {unit.id}: giving up after {unit.attempts} attempts")
+            self.failed.append(unit)
+            self._completed.put(None)
+        else:
+            self._pending.appendleft(unit)
+
+    def _lease_unit(self, worker: str) -> Optional[_Unit]:
+        self._expire_leases()
+        with self._lock:
+            while self._pending:
+                unit = self._pending.popleft()
+                if unit.id in self._done:
+                    continue
+                unit.attempts += 1
+                unit.worker = worker
+                unit.deadline = time.monotonic() + self.lease
+                self.workers[worker]['units'].append(unit.id)
+                return unit
+        return None
+
+    def _renew(self, worker: str, uid: int) -> bool:
+        with self._lock:
+            unit = self.units[uid]
+            if unit.worker != worker:
+                return False
+            unit.deadline = time.monotonic() + self.lease
+            return True
+
+    def _complete(self, worker: str, uid: int, rows, skipped, equities):
+        with self._lock:
+            unit = self.units[uid]
+            if uid in self._done or unit in self.failed:
+                return
+            if unit.worker not in (None, worker) and unit.worker in self.workers:
+                # Our lease had expired and the unit was handed on; keep this
+                # result; the new holder is revoked at its next renewal
+                other = self.workers[unit.worker]
+                other['units'] = [u for u in other['units'] if u != uid]
+            self._done[uid] = (rows, skipped, equities)
+            if worker in self.workers:
+                info = self.workers[worker]
+                info['units'] = [u for u in info['units'] if u != uid]
+                info['completed'] += 1
+            unit.worker = unit.deadline = None
+        self._completed.put(uid)
+
+    def _release_worker(self, worker: str):
+        with self._lock:
+            info = self.workers.get(worker)
+            if info is None:
+                return
+            info['connected'] = False
+            for uid in list(info['units']):
+                unit = self.units[uid]
+                if unit.worker == worker:
+                    logger.warning(f"Unit {uid}: worker {worker} disconnected, requeueing")
+                    self._requeue(unit)
+            info['units'] = []
+
+    def _unit_id(self, msg: dict) -> int:
+        uid = msg.get('unit')
+        if type(uid) is not int or not 0 <= uid < len(self.units):
+            raise BadMessage(f"unknown unit {uid!r}")
+        return uid
+
+    @staticmethod
+    def _result_fields(msg: dict, payload: bytes):
+        """(rows, skipped, equities) of a result message."""
+        rows, skipped, lengths = msg.get('rows'), msg.get('skipped'), msg.get('lengths')
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise BadMessage("rows must be a list of objects")
+        if not isinstance(skipped, list):
+            raise BadMessage("skipped must be a list")
+        if (not isinstance(lengths, list) or len(lengths) != len(rows)
+                or not all(type(n) is int and n >= 0 for n in lengths)):
+            raise BadMessage("lengths must hold one count per row")
+        if sum(lengths) * 4 != len(payload):
+            raise BadMessage(f"payload of {len(payload)} bytes does not match the lengths")
+        flat = np.frombuffer(payload, dtype=np.float32)
+        offsets = np.cumsum([0] + lengths)
+        return rows, skipped, [flat[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+    # -- connection handler ------------------------------------------------
+    def _serve(self, sock: socket.socket, address):
+        worker = None
+        try:
+            hello, _ = recv_msg(sock)
+            if hello.get('type') != 'hello':
+                return
+            if self.token is not None and not hmac.compare_digest(str(hello.get('token', '')), self.token):
+                send_msg(sock, {'type': 'denied'})
+                logger.warning(f"Worker at {address[0]} rejected: bad token")
+                return
+            worker = f"{hello.get('name') or address[0]}-{uuid.uuid4().hex[:6]}"
+            with self._lock:
+                self.workers[worker] = {'address': f"{address[0]}:{address[1]}", 'units': [],
+                                        'completed': 0, 'connected': True}
+            send_msg(sock, {'type': 'welcome', 'worker': worker})
+            cached = hello.get('datasets')
+            logger.info(f"Worker {worker} connected from {address[0]} "
+                        f"({len(cached) if isinstance(cached, list) else 0} datasets cached)")
+
+            while True:
+                msg, payload = recv_msg(sock)
+                kind = msg.get('type')
+                try:
+                    if not self._reply(sock, worker, kind, msg, payload):
+                        return
+                except BadMessage as e:
+                    logger.warning(f"Worker {worker}: bad {kind!r} message: {e}")
+                    send_msg(sock, {'type': 'error', 'message': str(e)})
+        except (ConnectionError, OSError, ValueError) as e:
+            logger.info(f"Worker {worker or address[0]} disconnected: {e}")
+        finally:
+            if worker is not None:
+                self._release_worker(worker)
+
+    def _reply(self, sock, worker: str, kind, msg: dict, payload: bytes) -> bool:
+        """Answer one message; False ends the connection."""
+        if kind == 'request':
+            unit = self._lease_unit(worker)
+            if unit is not None:
+                send_msg(sock, {'type': 'unit', 'unit': unit.id, 'lease': self.lease,
+                                'strategy': self.strategy, 'objective': self.objective,
+                                'cash': self.cash, 'commission': self.commission,
+                                'datasets': self.dataset_specs, 'combos': unit.combos})
+            elif self.finished:
+                send_msg(sock, {'type': 'done'})
+                return False
+            else:
+                # Everything is leased; a lost worker may free a unit later
+                send_msg(sock, {'type': 'wait', 'delay': min(1.0, self.lease / 4)})
+        elif kind == 'fetch':
+            fp = msg.get('fingerprint')
+            if not isinstance(fp, str) or fp not in self.datasets:
+                raise BadMessage(f"unknown dataset {fp!r}")
+            arrays = self.datasets[fp]
+            send_msg(sock, {'type': 'dataset', 'fingerprint': fp, 'bars': len(arrays)},
+                     _pack_arrays(arrays))
+        elif kind == 'renew':
+            ok = self._renew(worker, self._unit_id(msg))
+            send_msg(sock, {'type': 'ok' if ok else 'revoked'})
+        elif kind == 'result':
+            uid = self._unit_id(msg)
+            self._complete(worker, uid, *self._result_fields(msg, payload))
+            send_msg(sock, {'type': 'ack'})
+        elif kind == 'error':
+            uid = self._unit_id(msg)
+            logger.error(f"Unit {uid} failed on worker {worker}: {msg.get('message')}")
+            with self._lock:
+                unit = self.units[uid]
+                if unit.worker == worker:
+                    self._requeue(unit)
+            send_msg(sock, {'type': 'ack'})
+        else:
+            logger.warning(f"Worker {worker}: unknown message {kind!r}")
+            return False
+        return True
+
+
+def run_distributed(strat_cls: type, feeds: list, candidates: List[dict], **kwargs) -> SweepResult:
+    """Start a Coordinator, wait for workers to finish every unit and stop it."""
+    wait_kwargs = {k: kwargs.pop(k) for k in ('timeout', 'on_result', 'should_stop') if k in kwargs}
+    with Coordinator(strat_cls, feeds, candidates, **kwargs) as coord:
+        return coord.wait(**wait_kwargs)
+
+
+# --- worker -------------------------------------------------------------------
+
+def _resolve_strategy(path: str) -> type:
+    module, _, name = path.partition(':')
+    obj = importlib.import_module(module)
+    for part in name.split('.'):
+        obj = getattr(obj, part)
+    if not (isinstance(obj, type) and issubclass(obj, bt.Strategy)):
+        raise TypeError(f"{path} is not a backtrader Strategy")
+    return obj
+
+
+class Worker:
+    """
+    Headless worker: pulls units from a Coordinator until it is done.
+    -- cache_dir: also keep datasets as <fingerprint>.npy files here
+       (memory-mapped when loaded), so restarts do not refetch them
+    -- max_cached: datasets kept in memory (least recently used dropped)
+    -- pool: WorkerPool (src/optimizer/pool.py) that runs each unit's
+       combos in parallel; None runs them in this process
+    """
+
+    def __init__(self, host: str, port: int, token: str = None, name: str = None,
+                 cache_dir: str = None, max_cached: int = 8, pool=None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.name = name or socket.gethostname()
+        self.cache_dir = cache_dir
+        self.max_cached = max_cached
+        self.pool = pool
+        self._cache = OrderedDict()
+        self.units_done = 0
+        self.fetched = 0
+
+    # -- datasets ---------------------------------------------------------
+    def _cached(self, fingerprint: str) -> Optional[OHLCVArrays]:
+        arrays = self._cache.get(fingerprint)
+        if arrays is not None:
+            self._cache.move_to_end(fingerprint)
+            return arrays
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{fingerprint}.npy")
+            if os.path.exists(path):
+                arrays = OHLCVArrays(*np.load(path, mmap_mode='r'))
+                self._remember(fingerprint, arrays)
+                return arrays
+        return None
+
+    def _remember(self, fingerprint: str, arrays: OHLCVArrays):
+        self._cache[fingerprint] = arrays
+        self._cache.move_to_end(fingerprint)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _dataset(self, sock, spec: dict) -> OHLCVArrays:
+        fp = spec['fingerprint']
+        arrays = self._cached(fp)
+        if arrays is not None:
+            return arrays
+        send_msg(sock, {'type': 'fetch', 'fingerprint': fp})
+        msg, payload = recv_msg(sock)
+        arrays = _unpack_arrays(payload, msg['bars'])
+        if arrays.fingerprint() != fp:
+            raise ValueError(f"dataset {fp} arrived corrupted")
+        self.fetched += 1
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.save(os.path.join(self.cache_dir, f"{fp}.npy"),
+                    np.stack([getattr(arrays, n) for n in FEED_LINES]))
+        self._remember(fp, arrays)
+        return arrays
+
+    def cached_fingerprints(self) -> List[str]:
+        fps = set(self._cache)
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            fps.update(f[:-4] for f in os.listdir(self.cache_dir) if f.endswith('.npy'))
+        return sorted(fps)
+
+    # -- work -------------------------------------------------------------
+    def _connect(self, timeout: float) -> socket.socket:
+        end = time.monotonic() + timeout
+        while True:
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=30)
+                sock.settimeout(None)
+                return sock
+            except OSError:
+                if time.monotonic() >= end:
+                    raise
+                time.sleep(0.5)
+
+    def run(self, connect_timeout: float = 30.0) -> int:
+        """Work until the coordinator reports done; returns the number of units completed."""
+        sock = self._connect(connect_timeout)
+        try:
+            send_msg(sock, {'type': 'hello', 'name': self.name, 'token': self.token,
+                            'datasets': self.cached_fingerprints()})
+            msg, _ = recv_msg(sock)
+            if msg.get('type') != 'welcome':
+                raise PermissionError("coordinator refused this worker")
+            worker_id = msg['worker']
+            while True:
+                send_msg(sock, {'type': 'request'})
+                msg, _ = recv_msg(sock)
+                kind = msg['type']
+                if kind == 'done':
+                    break
+                if kind == 'wait':
+                    time.sleep(msg.get('delay', 1.0))
+                    continue
+                self._run_unit(sock, msg)
+            logger.info(f"Worker {worker_id}: done after {self.units_done} units")
+        finally:
+            sock.close()
+        return self.units_done
+
+    def _run_unit(self, sock, unit: dict):
+        uid = unit['unit']
+        try:
+            strat_cls = _resolve_strategy(unit['strategy'])
+            feeds = [ArrayData(dataname=self._dataset(sock, spec), **spec['params'])
+                     for spec in unit['datasets']]
+        except Exception as e:
+            logger.exception(f"Unit {uid}: cannot set up")
+            send_msg(sock, {'type': 'error', 'unit': uid, 'message': str(e)})
+            recv_msg(sock)
+            return
+
+        # One combo per part in this process, one part per pool worker otherwise
+        combos = unit['combos']
+        size = 1 if self.pool is None else max(1, math.ceil(len(combos) / self.pool.size))
+        chunks = [combos[i:i + size] for i in range(0, len(combos), size)]
+        futures = []
+        if self.pool is None:
+            parts = (_evaluate_combos(strat_cls, feeds, chunk, unit) for chunk in chunks)
+        else:
+            sources = [self.pool.publish(f.p.dataname) for f in feeds]
+            specs = feed_specs(feeds)
+            futures = [self.pool.submit(_evaluate_shared, strat_cls, sources, specs, chunk, unit)
+                       for chunk in chunks]
+            parts = (f.result() for f in futures)
+
+        rows, skipped, equities = [], [], []
+        try:
+            for part in parts:
+                for params, row, equity, error in part:
+                    if error is None:
+                        rows.append(row)
+                        equities.append(equity)
+                    elif isinstance(error, IndexError):
+                        # Look-back longer than the data, as in SweepExecutor.run
+                        skipped.append(params)
+                    else:
+                        logger.error(f"Unit {uid}: {params} failed: {error}")
+                        send_msg(sock, {'type': 'error', 'unit': uid, 'message': f"{params}: {error}"})
+                        recv_msg(sock)
+                        return
+                send_msg(sock, {'type': 'renew', 'unit': uid})
+                reply, _ = recv_msg(sock)
+                if reply['type'] == 'revoked':
+                    # Lease lost (we were too slow); someone else has the unit now
+                    logger.warning(f"Unit {uid}: lease revoked, abandoning")
+                    return
+        finally:
+            for future in futures:
+                future.cancel()
+        send_msg(sock, {'type': 'result', 'unit': uid, 'rows': rows, 'skipped': skipped,
+                        'lengths': [len(e) for e in equities]},
+                 b''.join(e.tobytes() for e in equities))
+        recv_msg(sock)
+        self.units_done += 1
+
+    @staticmethod
+    def _evaluate(strat_cls, feeds, params: dict, unit: dict):
+        engine = BacktestEngine(cash=unit['cash'], commission=unit['commission'])
+        for feed in feeds:
+            engine.add_data(clone_feed(feed))
+        engine.set_strategy(strat_cls, **params)
+        add_recorders(engine.cerebro)
+        strat = engine.run()[0]
+        equity = strat.analyzers.equity.get_analysis()
+        row = {**params, **run_metrics(strat)}
+        row.setdefault(unit['objective'], row['FinalValue'])
+        return row, equity['equity'].astype(np.float32)
+
+
+def _evaluate_combos(strat_cls, feeds, combos: List[dict], unit: dict) -> list:
+    """(params, row, equity, error) per combo; error is the IndexError or message of a failed run."""
+    out = []
+    for params in combos:
+        try:
+            row, equity = Worker._evaluate(strat_cls, feeds, params, unit)
+            out.append((params, row, equity, None))
+        except IndexError as ie:
+            out.append((params, None, None, ie))
+        except Exception as e:
+            logger.exception(f"{params} failed")
+            out.append((params, None, None, str(e)))
+    return out
+
+
+def _evaluate_shared(strat_cls, sources, specs, combos: List[dict], unit: dict) -> list:
+    """Pool task: _evaluate_combos over feeds rebuilt around shared arrays."""
+    return _evaluate_combos(strat_cls, build_feeds(sources, specs), combos, unit)
+
+
+def run_worker(host: str, port: int, **kwargs) -> int:
+    """Entry point for worker processes (e.g. multiprocessing targets)."""
+    return Worker(host, port, **kwargs).run()
+
+
+# --- command line -------------------------------------------------------------
+
+def _parse_range(text: str):
+    name, _, spec = text.partition('=')
+    parts = spec.split(':')
+    if not name or len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"expected name=low:high:step, got {text!r}")
+    nums = [int(p) if p.lstrip('-').isdigit() else float(p) for p in parts]
+    return name, tuple(nums)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distributed optimization sweeps")
+    sub = parser.add_subparsers(dest='role', required=True)
+
+    c = sub.add_parser('coordinator', help="serve a grid sweep to workers")
+    c.add_argument('--csv', required=True, help="OHLCV CSV file")
+    c.add_argument('--strategy', required=True, help="class name in src.backtester.strategies")
+    c.add_argument('--range', action='append', type=_parse_range, default=[],
+                   help="parameter ladder name=low:high:step (repeatable)")
+    c.add_argument('--host', default='127.0.0.1',
+                   help="address to listen on; anything but loopback needs --token")
+    c.add_argument('--port', type=int, default=5555)
+    c.add_argument('--token', default=os.environ.get('SWEEP_TOKEN'))
+    c.add_argument('--unit-size', type=int, default=8)
+    c.add_argument('--lease', type=float, default=120.0)
+    c.add_argument('--out', default='sweep_results.csv')
+
+    w = sub.add_parser('worker', help="run units for a coordinator")
+    w.add_argument('--connect', required=True, help="host:port of the coordinator")
+    w.add_argument('--token', default=os.environ.get('SWEEP_TOKEN'))
+    w.add_argument('--cache-dir', default=None)
+    w.add_argument('--forever', action='store_true', help="reconnect for the next sweep when done")
+    w.add_argument('--processes', type=int, default=1,
+                   help="run each unit on this many local worker processes")
+
+    args = parser.parse_args(argv)
+    if args.role == 'worker':
+        host, _, port = args.connect.rpartition(':')
+        # Started once, so the processes stay warm across units and sweeps
+        pool = get_pool(args.processes) if args.processes > 1 else None
+        while True:
+            try:
+                Worker(host, int(port), token=args.token, cache_dir=args.cache_dir, pool=pool).run(
+                    connect_timeout=3600 if args.forever else 30)
+            except (ConnectionError, OSError) as e:
+                logger.warning(f"Worker: {e}")
+                if not args.forever:
+                    raise
+            if not args.forever:
+                return
+            time.sleep(5)
+
+    import pandas as pd
+    from src.backtester import strategies
+    from src.data.loader import DataLoader
+    from src.optimizer.space import ParamSpace
+
+    if args.token is None and not is_loopback(args.host):
+        parser.error(f"--host {args.host} accepts remote workers; set --token or SWEEP_TOKEN")
+    feed, _ = DataLoader.from_csv(args.csv)
+    space = ParamSpace.from_ranges(dict(args.range))
+    candidates = list(space.grid())
+    with Coordinator(getattr(strategies, args.strategy), [feed], candidates,
+                     unit_size=args.unit_size, lease=args.lease, host=args.host,
+                     port=args.port, token=args.token) as coord:
+        print(f"Serving {len(candidates)} combos on {args.host}:{coord.address[1]}")
+        result = coord.wait()
+    pd.DataFrame(result.rows).to_csv(args.out, index=False)
+    print(f"{len(result.rows)} results written to {args.out}, {len(result.skipped)} skipped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+# src/optimizer/executor.py
+"""
+SweepExecutor: evaluates parameter combos proposed by a Sampler.
+
+Each combo runs in a fresh Cerebro over clones of the sweep's feeds (the
+underlying arrays are shared) and yields one result row (params plus the
+RUN_METRICS columns) and the run's equity curve. The sampler is told every score,
+so adaptive modes steer the rest of the budget.
+
+evaluate() can also run a combo on just the first `bars` bars of the
+history (see src/optimizer/halving.py); this needs ArrayData feeds.
+
+run(pool=...) evaluates each batch on a WorkerPool (src/optimizer/pool.py)
+in chunks, and still tells the sampler and the checkpoint in order.
+"""
+
+import math
+from typing import Callable, Optional
+
+import backtrader as bt
+
+from src.backtester.analyzers import EquityRecorder, TradeRecorder
+from src.backtester.metrics import equity_metrics
+from src.data.feeds import clone_feed, feed_length, slice_feeds
+from src.optimizer.pool import build_feeds, feed_specs
+from src.optimizer.samplers import Sampler
+from src.utils.logger import logger
+
+# Result columns of every run besides its params: final broker value,
+# total return and max drawdown in percent, annualized Sharpe, closed trades
+RUN_METRICS = ('FinalValue', 'Return%', 'MaxDD%', 'Sharpe', 'Trades')
+
+
+def add_recorders(cerebro: bt.Cerebro):
+    """Attach the analyzers run_metrics() reads: EquityRecorder 'equity', TradeRecorder 'trades'."""
+    cerebro.addanalyzer(EquityRecorder, _name='equity')
+    cerebro.addanalyzer(TradeRecorder, _name='trades')
+
+
+def run_metrics(strat) -> dict:
+    """RUN_METRICS of a finished strategy that ran with add_recorders()."""
+    equity = strat.analyzers.equity.get_analysis()
+    m = equity_metrics(equity['equity'], strat.broker.startingcash)
+    return {
+        'FinalValue': round(strat.broker.getvalue(), 2),
+        'Return%': round(m['total_return'], 2),
+        'MaxDD%': round(m['max_drawdown'], 2),
+        'Sharpe': round(m['sharpe'], 3),
+        'Trades': len(strat.analyzers.trades.get_analysis()),
+    }
+
+
+class SweepResult:
+    """Rows, equity curves (float32) and shared dates of one sweep."""
+
+    def __init__(self, mode: str = '', seed: int = None):
+        self.mode = mode
+        self.seed = seed
+        self.rows = []
+        self.equities = []
+        self.dates = []
+        self.skipped = []     # combos that could not run (e.g. not enough bars)
+        self.resumed = 0      # combos taken from a checkpoint instead of being run
+        # Early pruning (successive halving / Hyperband): one dict per rung
+        # and the combos dropped before reaching the full history
+        self.rounds = []
+        self.pruned = []
+        # Bars simulated, and what running every candidate in full would cost
+        self.bars_evaluated = 0
+        self.bars_exhaustive = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def compute_saved(self) -> float:
+        """Fraction of bar evaluations saved versus running every candidate in full."""
+        if not self.bars_exhaustive:
+            return 0.0
+        return 1.0 - self.bars_evaluated / self.bars_exhaustive
+
+    def best(self, objective: str = 'FinalValue') -> Optional[dict]:
+        return max(self.rows, key=lambda r: r[objective]) if self.rows else None
+
+
+class SweepExecutor:
+    """
+    -- strat_cls: strategy class to optimize
+    -- feeds: data feeds; every run gets clones of these
+    -- objective: result column the sampler maximizes
+    """
+
+    def __init__(self, strat_cls: type, feeds: list, objective: str = 'FinalValue'):
+        self.strat_cls = strat_cls
+        self.feeds = list(feeds)
+        self.objective = objective
+
+    @property
+    def total_bars(self) -> int:
+        """Bars in the first feed (ArrayData only)."""
+        return feed_length(self.feeds[0])
+
+    def evaluate(self, params: dict, bars: int = None):
+        """
+        Run one combo; returns (row, equity float32 array, datetime array).
+        bars: only simulate the first `bars` bars (None: the full history).
+        """
+        cerebro = bt.Cerebro()
+        if bars is None or bars >= self.total_bars:
+            # Fresh feed objects per run over the same (read-only) arrays
+            feeds = [clone_feed(feed) for feed in self.feeds]
+        else:
+            feeds = slice_feeds(self.feeds, 0, bars)
+        for feed in feeds:
+            cerebro.adddata(feed)
+        cerebro.addstrategy(self.strat_cls, **params)
+        # Keep each run's equity curve for the sweep report
+        add_recorders(cerebro)
+        strat = cerebro.run(maxcpus=1)[0]
+        equity = strat.analyzers.equity.get_analysis()
+        row = {**params, **run_metrics(strat)}
+        return row, equity['equity'].astype('float32'), equity['datetime']
+
+    def run(self, sampler: Sampler, budget: int = None,
+            on_result: Callable[[dict], None] = None,
+            should_stop: Callable[[], bool] = None, checkpoint=None,
+            pool=None, chunk_size: int = None) -> SweepResult:
+        """
+        Evaluate up to `budget` combos (None: until the sampler runs dry).
+        on_result(row) is called after every completed run; should_stop()
+        is polled between runs. checkpoint (see src/optimizer/checkpoint.py)
+        supplies combos finished by an earlier run of the same sweep and
+        stores every new one as it completes. pool: a WorkerPool that runs
+        each batch `chunk_size` combos per task (None: about four tasks per
+        worker); feeds must be ArrayData. Adaptive samplers ask one combo
+        at a time, so they gain nothing from a pool.
+        """
+        result = SweepResult(sampler.name, sampler.seed)
+        if checkpoint is not None and len(checkpoint):
+            result.dates = checkpoint.dates()
+        attempted = 0
+        while budget is None or attempted < budget:
+            remaining = None if budget is None else budget - attempted
+            n = sampler.batch_size or remaining or 256
+            if remaining is not None:
+                n = min(n, remaining)
+            batch = sampler.ask(n)
+            if not batch:
+                break
+            attempted += len(batch)
+            pooled = None
+            if pool is not None:
+                todo = [p for p in batch if checkpoint is None or checkpoint.get(p) is None]
+                pooled = self._pooled(pool, todo, chunk_size)
+            try:
+                done = self._run_batch(batch, result, sampler, on_result, should_stop,
+                                       checkpoint, pooled)
+            finally:
+                if pooled is not None:
+                    pooled.close()
+            if not done:
+                return result
+        if checkpoint is not None:
+            checkpoint.finish()
+        return result
+
+    def _run_batch(self, batch, result, sampler, on_result, should_stop, checkpoint, pooled) -> bool:
+        """Record one batch in order; False when should_stop() cut it short."""
+        for params in batch:
+            if should_stop is not None and should_stop():
+                return False
+            stored = checkpoint.get(params) if checkpoint is not None else None
+            if stored is not None:
+                # Finished by an earlier run: replay it instead
+                row, equity = stored
+                result.resumed += 1
+                if row is None:
+                    result.skipped.append(params)
+                    sampler.tell(params, None)
+                    continue
+                dt = None
+            else:
+                try:
+                    row, equity, dt = self.evaluate(params) if pooled is None else _outcome(next(pooled))
+                except IndexError as ie:
+                    # Combos that still require more bars than available
+                    logger.warning(f"Skipping {params}: {ie}")
+                    result.skipped.append(params)
+                    sampler.tell(params, None)
+                    if checkpoint is not None:
+                        checkpoint.skip(params)
+                    continue
+                if checkpoint is not None:
+                    checkpoint.put(params, row, equity, dt)
+            sampler.tell(params, row[self.objective])
+            result.rows.append(row)
+            result.equities.append(equity)
+            if not len(result.dates) and dt is not None:
+                # Every run shares the same feed, so dates are stored once
+                result.dates = [bt.num2date(x) for x in dt]
+            if on_result is not None:
+                on_result(row)
+        return True
+
+    def _pooled(self, pool, combos: list, chunk_size: int = None):
+        """Outcomes of `combos` run on `pool`, in order (see _evaluate_chunk)."""
+        if not combos:
+            return
+        sources = [pool.publish(f.p.dataname) for f in self.feeds]
+        specs = feed_specs(self.feeds)
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(combos) / (4 * pool.size)))
+        futures = [pool.submit(_evaluate_chunk, self.strat_cls, sources, specs, self.objective,
+                               combos[i:i + chunk_size])
+                   for i in range(0, len(combos), chunk_size)]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            # Stopped early: drop the chunks not started yet
+            for future in futures:
+                future.cancel()
+
+
+def _outcome(outcome):
+    if isinstance(outcome, IndexError):
+        raise outcome
+    return outcome
+
+
+def _evaluate_chunk(strat_cls, sources, specs, objective, combos) -> list:
+    """
+    Pool task: (row, equity, datetimes) per combo, or the IndexError of a
+    combo that could not run. Datetimes come with the first run only.
+    """
+    executor = SweepExecutor(strat_cls, build_feeds(sources, specs), objective)
+    out, dated = [], False
+    for params in combos:
+        try:
+            row, equity, dt = executor.evaluate(params)
+        except IndexError as ie:
+            out.append(ie)
+            continue
+        out.append((row, equity, None if dated else dt))
+        dated = True
+    return out
@@ -0,0 +1,182 @@
+# src/optimizer/halving.py
+"""
+Successive halving and Hyperband: prune losing combos on a short history.
+
+Successive halving runs every candidate on the first `min_fraction` of the
+history, keeps the best 1/eta and runs those on eta times as many bars,
+until the survivors run on the full history. With 81 candidates, eta=3
+and min_fraction=1/9:
+
+    rung  history  candidates
+       0     1/9          81
+       1     1/3          27
+       2     all           9
+
+Scores are only compared within a rung, where every candidate sees the
+same bars. A candidate that cannot run on a rung's prefix (its look-back
+needs more bars) or never held a position there (flat equity) is not
+judged on it and moves up undecided.
+
+Hyperband runs several such brackets, from aggressive (many candidates,
+short first prefix) to none at all (few candidates, full history), which
+hedges against strategies whose early results say little about the full run.
+
+Only full-history runs become result rows. Pruned combos go to
+result.pruned with the score and history fraction they were dropped at,
+and every rung's decision is logged and kept in result.rounds.
+"""
+
+import math
+from typing import Callable, List
+
+import backtrader as bt
+import numpy as np
+
+from src.optimizer.executor import SweepExecutor, SweepResult
+from src.optimizer.samplers import Sampler
+from src.utils.logger import logger
+
+
+def rung_fractions(eta: int, min_fraction: float) -> List[float]:
+    """History fractions of the rungs: min_fraction, * eta, ..., 1."""
+    fractions = []
+    f = min_fraction
+    while f < 1.0 - 1e-9:
+        fractions.append(f)
+        f *= eta
+    return fractions + [1.0]
+
+
+def default_min_fraction(n: int, eta: int) -> float:
+    """Shortest prefix that still leaves one candidate for the full history."""
+    return float(eta) ** -int(math.floor(math.log(max(n, 1)) / math.log(eta) + 1e-9))
+
+
+def successive_halving(executor: SweepExecutor, candidates: List[dict], eta: int = 3,
+                       min_fraction: float = None, min_bars: int = 100,
+                       sampler: Sampler = None, result: SweepResult = None,
+                       bracket: int = 0, on_result: Callable[[dict], None] = None,
+                       should_stop: Callable[[], bool] = None) -> SweepResult:
+    """
+    -- candidates: params dicts to race against each other
+    -- eta: keep the best 1/eta of each rung
+    -- min_fraction: history fraction of the first rung (None: enough rungs
+       to narrow the candidates down to about one)
+    -- min_bars: no rung is shorter than this many bars
+    -- sampler: told the full-history score of survivors and a failed run
+       (ranked worst) for pruned combos
+    -- result: SweepResult to add to (Hyperband shares one across brackets)
+    """
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    total = executor.total_bars
+    if result is None:
+        result = SweepResult('halving', getattr(sampler, 'seed', None))
+    result.bars_exhaustive += len(candidates) * total
+    if min_fraction is None:
+        min_fraction = default_min_fraction(len(candidates), eta)
+    fractions = rung_fractions(eta, max(min_fraction, min(1.0, min_bars / total)))
+    objective = executor.objective
+
+    alive = list(candidates)
+    for rung, fraction in enumerate(fractions):
+        if not alive:
+            break
+        final = rung == len(fractions) - 1
+        bars = total if final else max(1, int(round(fraction * total)))
+        scored, undecided, completed = [], [], 0
+        for params in alive:
+            if should_stop is not None and should_stop():
+                return result
+            result.bars_evaluated += bars
+            try:
+                row, equity, dt = executor.evaluate(params, bars=None if final else bars)
+            except IndexError as ie:
+                if final:
+                    logger.warning(f"Skipping {params}: {ie}")
+                    result.skipped.append(params)
+                    if sampler is not None:
+                        sampler.tell(params, None)
+                else:
+                    # Too few bars for this combo's look-back: judge it later
+                    undecided.append(params)
+                continue
+            if final:
+                completed += 1
+                result.rows.append(row)
+                result.equities.append(equity)
+                if not len(result.dates):
+                    result.dates = [bt.num2date(x) for x in dt]
+                if sampler is not None:
+                    sampler.tell(params, row[objective])
+                if on_result is not None:
+                    on_result(row)
+            elif not np.ptp(equity):
+                # Never in the market on this prefix: nothing to judge yet
+                undecided.append(params)
+            else:
+                scored.append((row[objective], params))
+
+        info = {'bracket': bracket, 'rung': rung, 'fraction': fraction, 'bars': bars,
+                'evaluated': len(alive), 'kept': 0, 'pruned': 0,
+                'undecided': len(undecided), 'threshold': None}
+        result.rounds.append(info)
+        if final:
+            info['kept'] = completed
+            break
+
+        # Stable sort keeps the candidates' order among equal scores
+        scored.sort(key=lambda s: -s[0])
+        n_keep = max(1, math.ceil(len(scored) / eta)) if scored else 0
+        kept, dropped = scored[:n_keep], scored[n_keep:]
+        for score, params in dropped:
+            result.pruned.append({**params, objective: score, 'Fraction': round(fraction, 4),
+                                  'Bracket': bracket, 'Rung': rung})
+            if sampler is not None:
+                sampler.tell(params, None)
+        info.update(kept=len(kept), pruned=len(dropped),
+                    threshold=kept[-1][0] if kept else None)
+        logger.info(f"Halving bracket {bracket} rung {rung}: {len(alive)} combos on {bars} bars, "
+                    f"kept {len(kept)} ({objective} >= {info['threshold']}), "
+                    f"pruned {len(dropped)}, undecided {len(undecided)}")
+        alive = [params for _, params in kept] + undecided
+
+    return result
+
+
+def hyperband(executor: SweepExecutor, sampler: Sampler, budget: int, eta: int = 3,
+              min_fraction: float = 1 / 9, min_bars: int = 100,
+              on_result: Callable[[dict], None] = None,
+              should_stop: Callable[[], bool] = None) -> SweepResult:
+    """
+    Successive halving brackets over `budget` candidates drawn from sampler.
+
+    Bracket s starts on eta**-s of the history (s = s_max .. 0, with
+    eta**-s_max ~ min_fraction) and gets candidates in the usual Hyperband
+    proportion eta**s / (s + 1), so each bracket costs about the same.
+    """
+    result = SweepResult(f'hyperband/{sampler.name}', sampler.seed)
+    s_max = max(0, int(round(math.log(1 / min_fraction) / math.log(eta))))
+    shares = [eta ** s / (s + 1) for s in range(s_max, -1, -1)]
+    drawn = 0
+    for bracket, (s, share) in enumerate(zip(range(s_max, -1, -1), shares)):
+        n = max(1, int(round(budget * share / sum(shares))))
+        n = min(n, budget - drawn)
+        candidates = sampler.ask(n)
+        if not candidates:
+            break
+        drawn += len(candidates)
+        successive_halving(executor, candidates, eta=eta, min_fraction=float(eta) ** -s,
+                           min_bars=min_bars, sampler=sampler, result=result,
+                           bracket=bracket, on_result=on_result, should_stop=should_stop)
+        if should_stop is not None and should_stop():
+            break
+    return result
+
+
+def summary(result: SweepResult) -> str:
+    """One-line description of a pruned sweep, for logs and the dialog."""
+    n = len(result.rows) + len(result.pruned) + len(result.skipped)
+    return (f"{n} candidates: {len(result.rows)} ran on the full history, "
+            f"{len(result.pruned)} pruned early, {len(result.skipped)} skipped; "
+            f"{result.compute_saved:.0%} of bar evaluations saved")
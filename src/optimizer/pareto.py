@@ -0,0 +1,139 @@
+# src/optimizer/pareto.py
+"""
+ParetoFront: the non-dominated runs of a sweep, kept up to date as
+results stream in.
+
+A run dominates another when it is at least as good on every objective
+and strictly better on one. Objectives are result columns with a
+direction:
+
+    front = ParetoFront({'Return%': 'max', 'MaxDD%': 'min', 'Sharpe': 'max'})
+    front.add(rows)                  # row ids 0, 1, 2, ... in arrival order
+    front.ids                        # ids of the non-dominated runs
+
+Points are stored sign-flipped so every objective is maximized. Each
+batch is first reduced to its own non-dominated points, then compared
+with the current front in one broadcast, so the work per point is
+proportional to the front's size, not to the number of runs seen.
+Missing (NaN) objectives count as the worst possible value.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Columns compared per broadcast block; bounds the (block x front x k) temporaries
+_BLOCK = 1024
+
+
+def _dominated_by(points: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """For each of `points`, whether some row of `others` dominates it."""
+    out = np.zeros(len(points), dtype=bool)
+    if not len(others):
+        return out
+    for i in range(0, len(points), _BLOCK):
+        block = points[i:i + _BLOCK]
+        # One (block x others) comparison per objective; k is small
+        ge = np.ones((len(block), len(others)), dtype=bool)
+        gt = np.zeros((len(block), len(others)), dtype=bool)
+        for j in range(points.shape[1]):
+            p, o = block[:, j, None], others[None, :, j]
+            ge &= o >= p
+            gt |= o > p
+        out[i:i + _BLOCK] = (ge & gt).any(axis=1)
+    return out
+
+
+def non_dominated(points: np.ndarray) -> np.ndarray:
+    """Boolean mask of the rows of `points` (all maximized) that no other row dominates."""
+    n = len(points)
+    keep = np.ones(n, dtype=bool)
+    if n < 2:
+        return keep
+    # Visit points best-first: fewest missing (-inf) objectives, then the
+    # largest sum of the rest. A dominating point always comes earlier, so
+    # comparing with the survivors found so far suffices
+    finite = np.isfinite(points)
+    order = np.lexsort((-np.where(finite, points, 0.0).sum(axis=1), (~finite).sum(axis=1)))
+    survivors = np.empty((0, points.shape[1]))
+    for i in range(0, n, _BLOCK):
+        block = order[i:i + _BLOCK]
+        pts = points[block]
+        beaten = _dominated_by(pts, survivors)
+        # Within the block, compare the remaining points with each other
+        rest = np.flatnonzero(~beaten)
+        if len(rest) > 1:
+            beaten[rest] = _dominated_by(pts[rest], pts[rest])
+        keep[block] = ~beaten
+        survivors = np.vstack([survivors, pts[~beaten]])
+    return keep
+
+
+class ParetoFront:
+    """
+    -- objectives: result column -> 'max' or 'min'
+    """
+
+    def __init__(self, objectives: Dict[str, str]):
+        if not objectives:
+            raise ValueError("ParetoFront needs at least one objective")
+        for name, direction in objectives.items():
+            if direction not in ('max', 'min'):
+                raise ValueError(f"Objective '{name}': direction must be 'max' or 'min', not {direction!r}")
+        self.objectives = dict(objectives)
+        self._signs = np.array([1.0 if d == 'max' else -1.0 for d in self.objectives.values()])
+        self._points = np.empty((0, len(self.objectives)))
+        self._ids = np.empty(0, dtype=np.int64)
+        self.seen = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.objectives)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Row ids of the front, in arrival order."""
+        order = np.argsort(self._ids, kind='stable')
+        return self._ids[order]
+
+    @property
+    def points(self) -> np.ndarray:
+        """Objective values of the front (original signs), in the order of ids."""
+        order = np.argsort(self._ids, kind='stable')
+        return self._points[order] * self._signs
+
+    def add(self, rows: List[dict], ids=None) -> Tuple[int, int]:
+        """Add result rows (ids default to arrival order); returns (joined, dropped)."""
+        values = np.array([[np.nan if row.get(name) is None else row[name] for name in self.objectives]
+                           for row in rows], dtype=np.float64).reshape(len(rows), len(self.objectives))
+        return self.add_points(values, ids)
+
+    def add_points(self, values: np.ndarray, ids=None) -> Tuple[int, int]:
+        """Add an (n x objectives) array in the objectives' order; returns (joined, dropped)."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.objectives))
+        if ids is None:
+            ids = np.arange(self.seen, self.seen + len(values))
+        ids = np.asarray(ids, dtype=np.int64)
+        self.seen += len(values)
+        if not len(values):
+            return 0, 0
+        points = values * self._signs
+        points[np.isnan(points)] = -np.inf
+
+        # 1) The batch's own front, 2) minus what the current front dominates
+        keep = non_dominated(points)
+        keep[keep] = ~_dominated_by(points[keep], self._points)
+        new_points, new_ids = points[keep], ids[keep]
+        if not len(new_points):
+            return 0, 0
+        # 3) Drop current members that a newcomer dominates
+        stale = _dominated_by(self._points, new_points)
+        self._points = np.vstack([self._points[~stale], new_points])
+        self._ids = np.concatenate([self._ids[~stale], new_ids])
+        return len(new_ids), int(stale.sum())
+
+    def clear(self):
+        self.__init__(self.objectives)
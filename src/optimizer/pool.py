@@ -0,0 +1,470 @@
+# src/optimizer/pool.py
+"""
+WorkerPool: long-lived worker processes shared by every sweep in the app.
+
+Spawning a process pool per sweep pays for interpreter start-up and for
+importing backtrader, pandas and the strategies on every click. The pool
+is started once (get_pool() returns the process-wide instance) and its
+workers stay warm between runs:
+
+    pool = get_pool()
+    future = pool.submit(fn, *args)        # fn must be importable by name
+    handle = pool.publish(feed.p.dataname) # dataset in shared memory, by fingerprint
+
+Datasets are published once as SharedOHLCV blocks keyed by fingerprint
+and kept resident (least recently used first out) in the pool and in each
+worker, so repeated runs over the same bars neither copy nor re-attach
+them. Tasks go to an idle worker that already holds their data when there
+is one. A worker that dies is replaced and its task retried once.
+
+health() reports workers, queue depth, utilization and cache use.
+
+Every worker preloads pandas, backtrader and the strategies, so the
+default size is capped at DEFAULT_MAX_PROCESSES; callers that want more
+ask for them. The GUI starts the pool when the optimizer is first
+opened (warm_pool()), not at application start.
+"""
+
+import atexit
+import importlib
+import itertools
+import multiprocessing as mp
+import os
+import pickle
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import List
+
+from src.data import shared
+from src.data.feeds import OHLCVArrays
+from src.data.shared import SharedHandle, SharedOHLCV, attach
+from src.utils.logger import logger
+
+# Workers started when no size is given (fewer on smaller machines)
+DEFAULT_MAX_PROCESSES = 4
+
+# Imported by each worker at start-up, before it takes any task
+PRELOAD = (
+    'numpy', 'pandas', 'backtrader',
+    'src.data.feeds', 'src.backtester.analyzers', 'src.backtester.strategies',
+    'src.optimizer.executor',
+)
+
+
+# --- worker side -------------------------------------------------------------
+
+def _worker_main(wid: int, tasks, results, preload, max_datasets: int):
+    t0 = time.perf_counter()
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            results.put(('log', wid, f"preload of {name} failed: {e}"))
+    shared.MAX_ATTACHED = max_datasets
+    results.put(('ready', wid, os.getpid(), time.perf_counter() - t0))
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        tid, fn, args, kwargs = item
+        t0 = time.perf_counter()
+        try:
+            value, ok = fn(*args, **kwargs), True
+        except Exception as e:
+            value, ok = _portable(e), False
+        results.put(('done', wid, tid, ok, value, time.perf_counter() - t0))
+
+
+def _portable(exc: Exception) -> Exception:
+    """The exception itself if it pickles, else a RuntimeError carrying its text."""
+    text = ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        exc = RuntimeError(f"{type(exc).__name__}: {exc}")
+    exc.remote_traceback = text
+    return exc
+
+
+def build_feeds(sources, specs) -> list:
+    """Feeds around SharedHandles (attached in this process) or OHLCVArrays."""
+    feeds = []
+    for src, (cls, kwargs) in zip(sources, specs):
+        arrays = attach(src) if isinstance(src, SharedHandle) else src
+        feeds.append(cls(dataname=arrays, **kwargs))
+    return feeds
+
+
+def feed_specs(feeds) -> list:
+    """Feed class and parameters; workers rebuild the feeds around the shared arrays."""
+    return [(type(f), {k: v for k, v in f.p._getkwargs().items() if k != 'dataname'})
+            for f in feeds]
+
+
+# --- pool side ---------------------------------------------------------------
+
+class _Task:
+    __slots__ = ('tid', 'fn', 'args', 'kwargs', 'datasets', 'future', 'attempts')
+
+    def __init__(self, tid, fn, args, kwargs, datasets):
+        self.tid = tid
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.datasets = datasets   # shared block names the task reads
+        self.future = Future()
+        self.attempts = 0
+
+
+class _Worker:
+    def __init__(self, wid, process, tasks):
+        self.wid = wid
+        self.process = process
+        self.tasks = tasks
+        self.pid = None
+        self.ready = False
+        self.retiring = False
+        self.task = None           # _Task in flight
+        self.task_started = 0.0
+        self.done = 0
+        self.busy_seconds = 0.0
+        self.resident = OrderedDict()   # block names the worker has attached (LRU)
+
+    def busy_now(self, now: float) -> float:
+        return self.busy_seconds + (now - self.task_started if self.task is not None else 0.0)
+
+
+class WorkerPool:
+    """
+    -- processes: worker count (None: default_processes())
+    -- max_datasets: datasets kept resident, in the pool and in each worker
+    -- preload: modules each worker imports before taking tasks
+    """
+
+    def __init__(self, processes: int = None, max_datasets: int = 4, preload=PRELOAD):
+        self.size = max(1, processes or default_processes())
+        self.max_datasets = max(1, max_datasets)
+        self.preload = tuple(preload)
+        # spawn: the same behaviour on every platform, and no forked Qt state
+        self._ctx = mp.get_context('spawn')
+        self._results = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self._workers = {}
+        self._pending = deque()
+        self._ids = itertools.count()
+        self._tids = itertools.count()
+        # fingerprint -> (SharedOHLCV, arrays); id(arrays) -> (arrays, fingerprint)
+        self._datasets = OrderedDict()
+        self._fingerprints = {}
+        self._in_use = {}              # block name -> tasks queued or running
+        self._started = time.monotonic()
+        self._retired_busy = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.hits = 0
+        self.misses = 0
+        self._closed = False
+        with self._lock:
+            for _ in range(self.size):
+                self._spawn()
+        self._collector = threading.Thread(target=self._collect, name='WorkerPool', daemon=True)
+        self._collector.start()
+        logger.info(f"WorkerPool: started {self.size} workers")
+
+    # -- datasets ----------------------------------------------------------
+    def publish(self, arrays: OHLCVArrays) -> SharedHandle:
+        """Shared-memory handle for `arrays`, reusing the block of equal data."""
+        with self._lock:
+            known = self._fingerprints.get(id(arrays))
+            fp = known[1] if known is not None and known[0] is arrays else None
+        if fp is None:
+            fp = arrays.fingerprint()
+        with self._lock:
+            entry = self._datasets.get(fp)
+            if entry is None:
+                self.misses += 1
+                entry = self._datasets[fp] = (SharedOHLCV(arrays), arrays)
+                # Later publishes of this very object skip the hashing
+                self._fingerprints[id(arrays)] = (arrays, fp)
+                self._evict_datasets()
+            else:
+                self.hits += 1
+                self._datasets.move_to_end(fp)
+            return entry[0].handle
+
+    def _evict_datasets(self):
+        for fp in list(self._datasets):
+            if len(self._datasets) <= self.max_datasets:
+                break
+            block, arrays = self._datasets[fp]
+            if self._in_use.get(block.handle.name):
+                continue
+            del self._datasets[fp]
+            self._fingerprints.pop(id(arrays), None)
+            block.close()
+
+    # -- tasks -------------------------------------------------------------
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """
+        Run fn(*args, **kwargs) in a worker. fn and its arguments must
+        pickle; SharedHandles among the arguments (or inside lists/tuples
+        of them) mark the datasets the task reads.
+        """
+        if self._closed:
+            raise RuntimeError("WorkerPool is shut down")
+        names = tuple(h.name for h in _handles(args))
+        task = _Task(next(self._tids), fn, args, kwargs, names)
+        with self._lock:
+            for name in names:
+                self._in_use[name] = self._in_use.get(name, 0) + 1
+            self._pending.append(task)
+            self._dispatch()
+        return task.future
+
+    def map(self, fn, items, *args) -> List[Future]:
+        """One task fn(item, *args) per item."""
+        return [self.submit(fn, item, *args) for item in items]
+
+    def _dispatch(self):
+        """Hand queued tasks to idle workers (lock held)."""
+        idle = [w for w in self._workers.values() if w.task is None and not w.retiring]
+        while self._pending and idle:
+            task = self._pending.popleft()
+            if task.future.cancelled():
+                self._release(task)
+                continue
+            # Prefer the worker that already holds most of the task's data
+            worker = max(idle, key=lambda w: (sum(n in w.resident for n in task.datasets), w.ready))
+            idle.remove(worker)
+            for name in task.datasets:
+                worker.resident[name] = True
+                worker.resident.move_to_end(name)
+            while len(worker.resident) > self.max_datasets:
+                worker.resident.popitem(last=False)
+            task.attempts += 1
+            if task.attempts == 1:
+                task.future.set_running_or_notify_cancel()
+            worker.task, worker.task_started = task, time.monotonic()
+            worker.tasks.put((task.tid, task.fn, task.args, task.kwargs))
+
+    def _release(self, task: _Task):
+        for name in task.datasets:
+            self._in_use[name] -= 1
+            if not self._in_use[name]:
+                del self._in_use[name]
+
+    def _finish(self, worker: _Worker, ok: bool, value, seconds: float):
+        task = worker.task
+        worker.task = None
+        worker.done += 1
+        worker.busy_seconds += seconds
+        self._release(task)
+        if ok:
+            self.completed += 1
+            task.future.set_result(value)
+        else:
+            self.failed += 1
+            task.future.set_exception(value)
+
+    # -- collector thread --------------------------------------------------
+    def _collect(self):
+        while True:
+            try:
+                msg = self._results.get(timeout=0.5)
+            except Exception:
+                msg = None
+            with self._lock:
+                if self._closed:
+                    return
+                if msg is not None:
+                    self._handle(msg)
+                self._check_workers()
+                self._dispatch()
+
+    def _handle(self, msg):
+        kind, wid = msg[0], msg[1]
+        worker = self._workers.get(wid)
+        if kind == 'log':
+            logger.warning(f"WorkerPool worker {wid}: {msg[2]}")
+        elif kind == 'ready' and worker is not None:
+            worker.pid, worker.ready = msg[2], True
+            logger.info(f"WorkerPool: worker {wid} (pid {msg[2]}) warm in {msg[3]:.2f}s")
+        elif kind == 'done' and worker is not None and worker.task is not None:
+            _, _, tid, ok, value, seconds = msg
+            if worker.task.tid == tid:
+                self._finish(worker, ok, value, seconds)
+
+    def _check_workers(self):
+        for worker in list(self._workers.values()):
+            if worker.process.is_alive():
+                continue
+            del self._workers[worker.wid]
+            self._retired_busy += worker.busy_now(time.monotonic())
+            task = worker.task
+            if worker.retiring and task is None:
+                continue
+            logger.warning(f"WorkerPool: worker {worker.wid} exited "
+                           f"(code {worker.process.exitcode}); starting a replacement")
+            self.restarts += 1
+            if task is not None:
+                if task.attempts < 2:
+                    # Retry once on another worker
+                    self._pending.appendleft(task)
+                else:
+                    self._release(task)
+                    self.failed += 1
+                    task.future.set_exception(RuntimeError(
+                        f"Worker died twice running task {task.tid}"))
+            if not worker.retiring:
+                self._spawn()
+
+    def _spawn(self):
+        wid = next(self._ids)
+        tasks = self._ctx.SimpleQueue()
+        process = self._ctx.Process(target=_worker_main, name=f'PoolWorker-{wid}', daemon=True,
+                                    args=(wid, tasks, self._results, self.preload, self.max_datasets))
+        process.start()
+        self._workers[wid] = _Worker(wid, process, tasks)
+
+    # -- size and health ---------------------------------------------------
+    def resize(self, processes: int):
+        """Grow or shrink the pool; busy workers retire after their task."""
+        processes = max(1, processes)
+        with self._lock:
+            active = [w for w in self._workers.values() if not w.retiring]
+            for _ in range(processes - len(active)):
+                self._spawn()
+            # Idle workers go first
+            for worker in sorted(active, key=lambda w: w.task is not None)[:max(0, len(active) - processes)]:
+                worker.retiring = True
+                worker.tasks.put(None)
+            self.size = processes
+
+    def health(self) -> dict:
+        """Snapshot of the pool: workers, queue, utilization and dataset cache."""
+        now = time.monotonic()
+        with self._lock:
+            workers = list(self._workers.values())
+            uptime = now - self._started
+            busy = self._retired_busy + sum(w.busy_now(now) for w in workers)
+            return {
+                'workers': len(workers),
+                'alive': sum(w.process.is_alive() for w in workers),
+                'ready': sum(w.ready for w in workers),
+                'busy': sum(w.task is not None for w in workers),
+                'queued': len(self._pending),
+                'completed': self.completed,
+                'failed': self.failed,
+                'restarts': self.restarts,
+                'uptime': uptime,
+                # Share of worker time spent on tasks since the pool started
+                'utilization': busy / (uptime * max(1, self.size)) if uptime else 0.0,
+                'datasets': len(self._datasets),
+                'dataset_hits': self.hits,
+                'dataset_misses': self.misses,
+                'per_worker': [{'pid': w.pid, 'alive': w.process.is_alive(), 'ready': w.ready,
+                                'busy': w.task is not None, 'tasks': w.done,
+                                'busy_seconds': round(w.busy_now(now), 3),
+                                'resident': len(w.resident)} for w in workers],
+            }
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Block until every worker has finished its imports."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if all(w.ready for w in self._workers.values() if not w.retiring):
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the workers, fail queued tasks and free the shared datasets."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers.values())
+            for task in self._pending:
+                task.future.cancel()
+            self._pending.clear()
+            for worker in workers:
+                if worker.task is not None:
+                    worker.task.future.set_exception(RuntimeError("WorkerPool shut down"))
+                worker.tasks.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        for block, _ in self._datasets.values():
+            block.close()
+        self._datasets.clear()
+        self._fingerprints.clear()
+        logger.info("WorkerPool: shut down")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def _handles(args):
+    for arg in args:
+        if isinstance(arg, SharedHandle):
+            yield arg
+        elif isinstance(arg, (list, tuple)):
+            yield from _handles(arg)
+
+
+# The pool shared by the GUI and the command-line tools
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def default_processes() -> int:
+    """One worker per CPU, at most DEFAULT_MAX_PROCESSES."""
+    return max(1, min(mp.cpu_count() or 1, DEFAULT_MAX_PROCESSES))
+
+
+def get_pool(processes: int = None) -> WorkerPool:
+    """
+    The process-wide WorkerPool, started on first use. processes resizes
+    it (None keeps the current size, or default_processes()).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = WorkerPool(processes)
+            atexit.register(_pool.shutdown)
+        elif processes and processes != _pool.size:
+            _pool.resize(processes)
+        return _pool
+
+
+def warm_pool(processes: int = None):
+    """Start the shared pool on a background thread unless it is running."""
+    if current_pool() is None:
+        threading.Thread(target=get_pool, args=(processes,), name="WarmPool", daemon=True).start()
+
+
+def current_pool():
+    """The shared pool if it is running, without starting one."""
+    pool = _pool
+    return None if pool is None or pool.closed else pool
+
+
+def shutdown_pool():
+    """Stop the shared pool if one was started."""
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
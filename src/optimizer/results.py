@@ -0,0 +1,243 @@
+# src/optimizer/results.py
+"""
+ResultStore: sweep results as growable NumPy columns.
+
+Rows (dicts of params and result columns) are appended in batches as they
+stream in; each column is one array, float64 for numbers (NaN when a row
+lacks it) and object for anything else. Capacity doubles as it fills, so
+appending stays amortized O(1) per row.
+
+Filtering, ranking and sorting work on whole columns:
+
+    store.query("FinalValue top 100 where sma_long > 50")   # row indices
+    store.query("where sma_short >= 10 and sma_long < 100")
+    store.order(indices, 'FinalValue', descending=True)
+
+A query is an optional ranking "<column> top|bottom <N>" followed by
+optional conditions "where <column> <op> <value> [and ...]" with op one
+of < <= > >= = == !=. Column names with spaces go in double quotes.
+"""
+
+import operator
+import re
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+_OPS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '=': operator.eq, '==': operator.eq, '!=': operator.ne,
+}
+_NAME = r'"[^"]+"|[\w.%]+'
+_RANK = re.compile(rf'^\s*(?P<col>{_NAME})\s+(?P<dir>top|bottom)\s+(?P<n>\d+)\s*$', re.I)
+_COND = re.compile(rf'^\s*(?P<col>{_NAME})\s*(?P<op><=|>=|==|!=|=|<|>)\s*(?P<val>"[^"]*"|\S+)\s*$')
+
+_MIN_CAPACITY = 1024
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool)
+
+
+class _Column:
+    __slots__ = ('data', 'numeric', 'integral')
+
+    def __init__(self, capacity: int):
+        self.data = np.full(capacity, np.nan)
+        self.numeric = True
+        # Every value so far is a whole number (shown without decimals)
+        self.integral = True
+
+    def to_object(self, filled: int):
+        data = np.empty(len(self.data), dtype=object)
+        data[:filled] = [None if v != v else (int(v) if self.integral else v)
+                         for v in self.data[:filled].tolist()]
+        self.data = data
+        self.numeric = False
+        self.integral = False
+
+
+class ResultStore:
+    """Columnar table of sweep results; see the module docstring."""
+
+    def __init__(self):
+        self._columns = {}
+        self._len = 0
+        self._capacity = 0
+
+    def __len__(self):
+        return self._len
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def is_numeric(self, name: str) -> bool:
+        return self._columns[name].numeric
+
+    def is_integral(self, name: str) -> bool:
+        return self._columns[name].integral
+
+    def values(self, name: str) -> np.ndarray:
+        """The filled part of one column (a view)."""
+        if name not in self._columns:
+            raise KeyError(f"Unknown column '{name}'; columns are {', '.join(self._columns)}")
+        return self._columns[name].data[:self._len]
+
+    def clear(self):
+        self.__init__()
+
+    # -- writing -----------------------------------------------------------
+    def _reserve(self, n: int):
+        if n <= self._capacity:
+            return
+        capacity = max(_MIN_CAPACITY, self._capacity)
+        while capacity < n:
+            capacity *= 2
+        for col in self._columns.values():
+            grown = (np.full(capacity, np.nan) if col.numeric
+                     else np.empty(capacity, dtype=object))
+            grown[:self._len] = col.data[:self._len]
+            col.data = grown
+        self._capacity = capacity
+
+    def append(self, rows: List[dict]) -> int:
+        """Add rows at the end (new columns are blank for earlier rows); returns len()."""
+        if not rows:
+            return self._len
+        start, stop = self._len, self._len + len(rows)
+        self._reserve(stop)
+        names = dict.fromkeys(self._columns)
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        for name in names:
+            col = self._columns.get(name)
+            if col is None:
+                col = self._columns[name] = _Column(self._capacity)
+            values = [row.get(name) for row in rows]
+            if col.numeric and not all(v is None or _is_number(v) for v in values):
+                col.to_object(start)
+            if col.numeric:
+                block = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+                if col.integral:
+                    finite = block[~np.isnan(block)]
+                    col.integral = bool(np.all(finite == np.floor(finite))) and not any(
+                        isinstance(v, (float, np.floating)) for v in values)
+                col.data[start:stop] = block
+            else:
+                col.data[start:stop] = values
+        self._len = stop
+        return stop
+
+    # -- reading -----------------------------------------------------------
+    def cell(self, row: int, name: str):
+        """One value as Python data (None when missing)."""
+        col = self._columns[name]
+        value = col.data[row]
+        if col.numeric:
+            if value != value:
+                return None
+            return int(value) if col.integral else float(value)
+        return value
+
+    def row(self, i: int) -> dict:
+        return {name: self.cell(i, name) for name in self._columns}
+
+    def to_frame(self, indices: np.ndarray = None) -> pd.DataFrame:
+        """The table (or the rows at `indices`, in that order) as a DataFrame."""
+        data = {}
+        for name, col in self._columns.items():
+            values = col.data[:self._len] if indices is None else col.data[indices]
+            if col.numeric and col.integral and not np.isnan(values).any():
+                values = values.astype(np.int64)
+            data[name] = values
+        return pd.DataFrame(data)
+
+    def export(self, path: str, indices: np.ndarray = None):
+        """Write the table as CSV, or as Parquet when path ends in .parquet."""
+        frame = self.to_frame(indices)
+        if path.lower().endswith('.parquet'):
+            # pandas needs pyarrow or fastparquet for this
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+
+    # -- selection ---------------------------------------------------------
+    def sort_key(self, name: str, indices: np.ndarray, descending: bool) -> np.ndarray:
+        """Ascending float key of the rows at `indices`; missing values sort last."""
+        values = self.values(name)[indices]
+        if self._columns[name].numeric:
+            key = values.copy()
+        else:
+            # Objects sort by their text
+            missing = np.array([v is None for v in values], dtype=bool)
+            key = np.full(len(values), np.nan)
+            if (~missing).any():
+                texts = np.array([str(v) for v in values[~missing]])
+                key[~missing] = np.unique(texts, return_inverse=True)[1]
+        if descending:
+            key = -key
+        key[np.isnan(key)] = np.inf
+        return key
+
+    def order(self, indices: Optional[np.ndarray], name: str, descending: bool = False) -> np.ndarray:
+        """`indices` (None: every row) stably sorted by one column; missing values last."""
+        if indices is None:
+            indices = np.arange(self._len)
+        return indices[np.argsort(self.sort_key(name, indices, descending), kind='stable')]
+
+    def query(self, text: str, indices: np.ndarray = None) -> np.ndarray:
+        """
+        Row indices selected by a query (see the module docstring), in order;
+        only rows among `indices` (default: every row) are considered.
+        """
+        head, where = split_query(text)
+        indices = np.arange(self._len) if indices is None else np.asarray(indices, dtype=np.int64)
+        if where.strip():
+            mask = np.ones(len(indices), dtype=bool)
+            for cond in re.split(r'(?i)\band\b', where):
+                m = _COND.match(cond)
+                if m is None:
+                    raise ValueError(f"Cannot read condition '{cond.strip()}'; expected e.g. sma_long > 50")
+                mask &= self._compare(_unquote(m['col']), m['op'], _unquote(m['val']), indices)
+            indices = indices[mask]
+        if head.strip():
+            m = _RANK.match(head)
+            if m is None:
+                raise ValueError(f"Cannot read '{head.strip()}'; expected e.g. FinalValue top 100")
+            indices = self.top(indices, _unquote(m['col']), int(m['n']),
+                               descending=m['dir'].lower() == 'top')
+        return indices
+
+    def top(self, indices: np.ndarray, name: str, n: int, descending: bool = True) -> np.ndarray:
+        """The n best of `indices` by one column, best first (partial sort)."""
+        if n >= len(indices):
+            return self.order(indices, name, descending)
+        if n <= 0:
+            return indices[:0]
+        key = self.sort_key(name, indices, descending)
+        part = np.argpartition(key, n - 1)[:n]
+        return indices[part[np.lexsort((part, key[part]))]]
+
+    def _compare(self, name: str, op: str, text: str, indices: np.ndarray) -> np.ndarray:
+        values = self.values(name)[indices]
+        if self._columns[name].numeric:
+            try:
+                target = float(text)
+            except ValueError:
+                raise ValueError(f"'{name}' is numeric; cannot compare it with '{text}'")
+            with np.errstate(invalid='ignore'):
+                return _OPS[op](values, target)
+        compare = _OPS[op]
+        return np.array([v is not None and compare(str(v), text) for v in values], dtype=bool)
+
+
+def split_query(text: str):
+    """(ranking part, conditions after 'where') of a query; either may be ''."""
+    parts = re.split(r'(?i)\bwhere\b', text, maxsplit=1)
+    return parts[0], parts[1] if len(parts) > 1 else ''
+
+
+def _unquote(text: str) -> str:
+    return text[1:-1] if len(text) >= 2 and text[0] == text[-1] == '"' else text
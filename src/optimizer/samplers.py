@@ -0,0 +1,210 @@
+# src/optimizer/samplers.py
+"""
+Search strategies over a ParamSpace with an ask/tell interface.
+
+    sampler = make_sampler('tpe', space, seed=7)
+    for params in sampler.ask(n):
+        sampler.tell(params, score)        # higher is better
+
+Samplers work on the parameters' integer ladders, never propose the same
+combo (or two combos of one equivalence class, see ParamSpace.key) twice
+and skip combos the space's constraints reject. ask() returns
+fewer than n combos (possibly none) once the space is exhausted.
+
+  grid   - every combo in order (exhaustive)
+  random - uniform random combos
+  lhs    - Latin hypercube: each parameter's range is split into n equal
+           strata and every stratum is used once per ask(n)
+  tpe    - adaptive, Tree-structured Parzen Estimator style: after a Latin
+           hypercube start, ranks results into good/bad sets, fits a
+           kernel density to each per parameter and proposes the
+           candidate maximizing good(x) / bad(x)
+"""
+
+import math
+
+import numpy as np
+
+from src.optimizer.space import ParamSpace
+
+
+class Sampler:
+    """Base class; subclasses implement _propose(n) -> list of index tuples."""
+    name = ''
+    # Proposals per ask() the executor should request (None: as many as it needs)
+    batch_size = None
+
+    def __init__(self, space: ParamSpace, seed: int = None):
+        self.space = space
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.seen = set()
+        self.classes = set()   # ParamSpace.key() of every accepted combo
+        self.history = []   # (index tuple, score) in tell() order
+
+    def ask(self, n: int) -> list:
+        out = []
+        if n <= 0:
+            return out
+        for idx in self._propose(n):
+            if self._accept(idx):
+                out.append(self.space.decode(idx))
+                if len(out) == n:
+                    break
+        return out
+
+    def tell(self, params: dict, score):
+        """Report a result; score None/NaN marks a failed run (ranked worst)."""
+        score = -math.inf if score is None or score != score else float(score)
+        self.history.append((self.space.encode(params), score))
+
+    def _accept(self, idx) -> bool:
+        idx = tuple(int(i) for i in idx)
+        if idx in self.seen:
+            return False
+        self.seen.add(idx)
+        params = self.space.decode(idx)
+        if not self.space.feasible(params):
+            return False
+        key = self.space.key(params)
+        if key in self.classes:
+            return False
+        self.classes.add(key)
+        return True
+
+    def _propose(self, n):
+        raise NotImplementedError
+
+    def _random_indices(self, n):
+        shape = self.space.shape
+        return [tuple(row) for row in self.rng.integers(0, shape, size=(n, len(shape)))]
+
+    def _fill_random(self, n):
+        """Random proposals until n were accepted by ask() or the space looks exhausted."""
+        # Rejections (duplicates/infeasible) grow as the space fills up;
+        # give up after a bounded number of draws
+        tries = 0
+        limit = max(100, 20 * n)
+        while tries < limit and len(self.seen) < self.space.size:
+            batch = self._random_indices(max(n, 16))
+            tries += len(batch)
+            yield from batch
+
+
+class GridSampler(Sampler):
+    name = 'grid'
+
+    def __init__(self, space: ParamSpace, seed: int = None):
+        super().__init__(space, seed)
+        self._it = map(tuple, space.grid_indices().tolist())
+
+    def _propose(self, n):
+        return self._it
+
+    def _accept(self, idx) -> bool:
+        # grid_indices() already dropped infeasible and duplicate combos
+        self.seen.add(idx)
+        return True
+
+
+class RandomSampler(Sampler):
+    name = 'random'
+
+    def _propose(self, n):
+        return self._fill_random(n)
+
+
+class LatinHypercubeSampler(Sampler):
+    name = 'lhs'
+
+    def _design(self, n):
+        cols = []
+        for p in self.space.params:
+            strata = (self.rng.permutation(n) + self.rng.random(n)) / n
+            cols.append(np.minimum((strata * p.n).astype(np.int64), p.n - 1))
+        return [tuple(row) for row in np.stack(cols, axis=1)] if cols else []
+
+    def _propose(self, n):
+        # Collisions (coarse ladders, constraint) are topped up randomly
+        yield from self._design(n)
+        yield from self._fill_random(n)
+
+
+class TPESampler(LatinHypercubeSampler):
+    """
+    -- n_startup: Latin hypercube evaluations before the model is used
+    -- gamma: fraction of results (best first) forming the 'good' set
+    -- n_candidates: draws from the good density scored per proposal
+    -- prior_weight: weight of a uniform prior mixed into both densities
+    """
+    name = 'tpe'
+    batch_size = 1
+
+    def __init__(self, space: ParamSpace, seed: int = None, n_startup: int = 10,
+                 gamma: float = 0.25, n_candidates: int = 32, prior_weight: float = 1.0):
+        super().__init__(space, seed)
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.prior_weight = prior_weight
+        self._startup = None
+
+    def _propose(self, n):
+        if len(self.history) < self.n_startup:
+            # One stratified design, handed out across ask() calls
+            if self._startup is None:
+                self._startup = self._design(self.n_startup)
+            while self._startup:
+                yield self._startup.pop()
+            yield from self._fill_random(n)
+            return
+        yield from self._model_candidates()
+        yield from self._fill_random(n)
+
+    def _density(self, points: np.ndarray, size: int) -> np.ndarray:
+        """Kernel density over ladder positions 0..size-1 with a uniform prior."""
+        grid = np.arange(size, dtype=float)
+        weights = np.full(size, self.prior_weight / size)
+        if len(points):
+            m = len(points)
+            spread = points.std() if m > 1 else size / 4
+            # Scott's rule, floored at range / (m + 1) so a few clustered
+            # good points do not collapse the search onto one spot early
+            bw = max(1.0, 1.06 * spread * m ** -0.2, size / min(100, m + 1))
+            kernels = np.exp(-0.5 * ((grid[None, :] - points[:, None]) / bw) ** 2)
+            kernels /= kernels.sum(axis=1, keepdims=True)
+            weights = weights + kernels.sum(axis=0)
+        return weights / weights.sum()
+
+    def _model_candidates(self):
+        idx = np.array([h[0] for h in self.history], dtype=float)
+        scores = np.array([h[1] for h in self.history])
+        order = np.argsort(-scores, kind='stable')
+        n_good = max(1, int(math.ceil(self.gamma * len(order))))
+        good, bad = idx[order[:n_good]], idx[order[n_good:]]
+
+        cands = np.empty((self.n_candidates, len(self.space.params)), dtype=np.int64)
+        log_ratio = np.zeros(self.n_candidates)
+        for d, p in enumerate(self.space.params):
+            l = self._density(good[:, d], p.n)
+            g = self._density(bad[:, d], p.n)
+            cands[:, d] = self.rng.choice(p.n, size=self.n_candidates, p=l)
+            log_ratio += np.log(l[cands[:, d]]) - np.log(g[cands[:, d]])
+        for i in np.argsort(-log_ratio, kind='stable'):
+            yield tuple(cands[i])
+
+
+SAMPLERS = {
+    'grid': GridSampler,
+    'random': RandomSampler,
+    'lhs': LatinHypercubeSampler,
+    'tpe': TPESampler,
+}
+
+
+def make_sampler(mode: str, space: ParamSpace, seed: int = None, **kwargs) -> Sampler:
+    try:
+        cls = SAMPLERS[mode]
+    except KeyError:
+        raise ValueError(f"Unknown search mode {mode!r}; expected one of {sorted(SAMPLERS)}") from None
+    return cls(space, seed=seed, **kwargs)
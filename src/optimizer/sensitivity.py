@@ -0,0 +1,169 @@
+# src/optimizer/sensitivity.py
+"""
+Parameter sensitivity of a finished sweep, computed from its results alone.
+
+    s = Sensitivity.from_store(store, ['fast', 'slow'], 'Sharpe')
+    values, best = s.marginal('fast')        # best Sharpe per fast value
+    grid = s.heatmap('fast', 'slow')         # (slow x fast) best Sharpe
+    smooth = s.robustness(radius=1)          # N-D neighborhood scores
+    s.summary()                              # raw vs. robust optimum
+
+Each parameter's distinct values form one axis, and every run is coded
+by its position on each axis (np.unique), so a marginal or a heatmap is
+one grouped reduction over all runs. The N-D cube holds the mean metric
+of the runs in each cell (NaN where none ran). A cell's robustness score
+is the mean of the non-empty cells within `radius` steps on every axis,
+computed with separable cumulative-sum box filters. A plateau keeps its
+value under smoothing, a spike does not.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+# Largest N-D cube robustness() builds (cells, not runs)
+MAX_CELLS = 20_000_000
+
+STATS = ('best', 'mean')
+
+
+def _box_sum(a: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    """Sum over the window [i - radius, i + radius] along one axis (clipped at the edges)."""
+    a = np.moveaxis(a, axis, 0)
+    n = a.shape[0]
+    csum = np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+    i = np.arange(n)
+    out = csum[np.minimum(i + radius + 1, n)] - csum[np.maximum(i - radius, 0)]
+    return np.moveaxis(out, 0, axis)
+
+
+def neighborhood_mean(cube: np.ndarray, radius: int) -> np.ndarray:
+    """Mean of the non-NaN cells within `radius` steps on every axis; NaN stays NaN."""
+    empty = np.isnan(cube)
+    total = np.where(empty, 0.0, cube)
+    count = (~empty).astype(np.float64)
+    for axis in range(cube.ndim):
+        total = _box_sum(total, radius, axis)
+        count = _box_sum(count, radius, axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = total / count
+    out[empty] = np.nan
+    return out
+
+
+class Sensitivity:
+    """
+    -- columns: name -> numeric values, one per run (params and metric)
+    -- params: parameter columns forming the axes
+    -- metric: column analysed
+    -- maximize: whether higher metric values are better
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], params: List[str], metric: str,
+                 maximize: bool = True):
+        if not params:
+            raise ValueError("Sensitivity needs at least one parameter")
+        self.params = list(params)
+        self.metric = metric
+        self.maximize = maximize
+        self.values = np.asarray(columns[metric], dtype=np.float64)
+        self.axes = {}
+        codes = []
+        for name in self.params:
+            axis, code = np.unique(np.asarray(columns[name], dtype=np.float64), return_inverse=True)
+            self.axes[name] = axis
+            codes.append(code.ravel())
+        self.codes = np.stack(codes)                 # (params x runs)
+        self.shape = tuple(len(self.axes[n]) for n in self.params)
+
+    @classmethod
+    def from_store(cls, store, params: List[str], metric: str, maximize: bool = True) -> 'Sensitivity':
+        return cls({n: store.values(n) for n in (*params, metric)}, params, metric, maximize)
+
+    def __len__(self):
+        return len(self.values)
+
+    # -- grouped reductions -------------------------------------------------
+    def _reduce(self, flat: np.ndarray, size: int, stat: str) -> np.ndarray:
+        """`stat` of the metric per group `flat` (NaN for groups without a value)."""
+        ok = ~np.isnan(self.values)
+        flat, values = flat[ok], self.values[ok]
+        if stat == 'mean':
+            counts = np.bincount(flat, minlength=size)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.bincount(flat, values, minlength=size) / counts
+        if stat != 'best':
+            raise ValueError(f"stat must be one of {', '.join(STATS)}, not {stat!r}")
+        sign = 1.0 if self.maximize else -1.0
+        out = np.full(size, -np.inf)
+        np.maximum.at(out, flat, sign * values)
+        out[out == -np.inf] = np.nan
+        return sign * out
+
+    def marginal(self, name: str, stat: str = 'best'):
+        """(axis values, stat of the metric over the runs at each value)."""
+        axis = self.axes[name]
+        return axis, self._reduce(self.codes[self.params.index(name)], len(axis), stat)
+
+    def heatmap(self, x: str, y: str, stat: str = 'best') -> np.ndarray:
+        """(len(y axis) x len(x axis)) stat of the metric over the runs in each cell."""
+        nx, ny = len(self.axes[x]), len(self.axes[y])
+        flat = self.codes[self.params.index(y)] * nx + self.codes[self.params.index(x)]
+        return self._reduce(flat, nx * ny, stat).reshape(ny, nx)
+
+    # -- N-D cube ----------------------------------------------------------
+    @property
+    def cells(self) -> int:
+        return int(np.prod(self.shape, dtype=np.float64))
+
+    def cube(self) -> np.ndarray:
+        """Mean metric per parameter cell, shaped like the axes."""
+        if self.cells > MAX_CELLS:
+            raise ValueError(f"{self.cells:,} parameter cells exceed {MAX_CELLS:,}; "
+                             f"analyse fewer parameters")
+        flat = np.ravel_multi_index(tuple(self.codes), self.shape)
+        return self._reduce(flat, self.cells, 'mean').reshape(self.shape)
+
+    def robustness(self, radius: int = 1) -> np.ndarray:
+        """Neighborhood-smoothed cube (see neighborhood_mean)."""
+        return neighborhood_mean(self.cube(), radius)
+
+    def project(self, cube: np.ndarray, *names: str) -> np.ndarray:
+        """Best value of an N-D cube over every axis but `names`, in that axis order."""
+        keep = [self.params.index(n) for n in names]
+        other = tuple(i for i in range(cube.ndim) if i not in keep)
+        sign = 1.0 if self.maximize else -1.0
+        signed = np.where(np.isnan(cube), -np.inf, sign * cube)
+        best = signed.max(axis=other) if other else signed
+        # The kept axes come out in their cube order; put them in the order asked
+        best = np.transpose(best, np.argsort(np.argsort(keep)))
+        return np.where(best == -np.inf, np.nan, sign * best)
+
+    def run_scores(self, radius: int = 1) -> np.ndarray:
+        """Robustness score of every run (its cell's smoothed value)."""
+        flat = np.ravel_multi_index(tuple(self.codes), self.shape)
+        return self.robustness(radius).ravel()[flat]
+
+    def summary(self, radius: int = 1) -> dict:
+        """
+        The best cell by raw metric and by robustness score:
+        {'best': params, 'best_value', 'best_score',
+         'robust': params, 'robust_value', 'robust_score'} (None when no run has a value).
+        """
+        raw = self.cube()
+        smooth = neighborhood_mean(raw, radius)
+        if np.isnan(raw).all():
+            return None
+        sign = 1.0 if self.maximize else -1.0
+        best = int(np.nanargmax(sign * raw))
+        robust = int(np.nanargmax(sign * smooth))
+
+        def cell(flat):
+            idx = np.unravel_index(flat, self.shape)
+            return {n: self.axes[n][i].item() for n, i in zip(self.params, idx)}
+
+        return {
+            'best': cell(best), 'best_value': raw.flat[best].item(), 'best_score': smooth.flat[best].item(),
+            'robust': cell(robust), 'robust_value': raw.flat[robust].item(),
+            'robust_score': smooth.flat[robust].item(),
+        }
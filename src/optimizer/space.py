@@ -0,0 +1,185 @@
+# src/optimizer/space.py
+"""
+Parameter spaces for optimization sweeps.
+
+Every parameter is a finite ladder low, low + step, ..., <= high. Values
+are computed from integer indices (low + i * step, rounded to the
+parameter's precision) rather than by repeated addition, so grids and
+samplers agree on the exact same values.
+
+The grid is built as index arrays in chunks: declarative constraints
+(see constraints.py) drop infeasible combos column-wise, and combos whose
+rounded values, or equivalence-class keys, repeat an earlier one are
+dropped, all before anything runs.
+"""
+
+import math
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.optimizer.constraints import Constraint
+
+# Combos decoded per vectorized grid chunk
+_GRID_CHUNK = 1 << 20
+
+
+class Param:
+    """One axis of a ParamSpace."""
+    __slots__ = ('name', 'low', 'high', 'step', 'is_int', 'precision', 'n')
+
+    def __init__(self, name: str, low, high, step, is_int: bool = False, precision: int = 8):
+        if step <= 0:
+            raise ValueError(f"{name}: step must be positive")
+        if high < low:
+            raise ValueError(f"{name}: high ({high}) is below low ({low})")
+        self.name = name
+        self.low = low
+        self.high = high
+        self.step = step
+        self.is_int = is_int
+        self.precision = 0 if is_int else precision
+        # Small tolerance so e.g. 0.01..0.05 step 0.01 keeps 0.05
+        self.n = int(math.floor((high - low) / step + 1e-9)) + 1
+
+    def value(self, idx: int):
+        v = self.low + int(idx) * self.step
+        return int(round(v)) if self.is_int else round(v, self.precision)
+
+    def values(self) -> list:
+        return [self.value(i) for i in range(self.n)]
+
+    def values_at(self, idx: np.ndarray) -> np.ndarray:
+        """value() of an index array (float64), looked up so rounding matches exactly."""
+        return np.asarray(self.values(), dtype=np.float64)[idx]
+
+    def index(self, value) -> int:
+        """Nearest ladder index of value (clipped to the range)."""
+        return int(min(max(round((value - self.low) / self.step), 0), self.n - 1))
+
+    def __repr__(self):
+        return f"Param({self.name!r}, {self.low}, {self.high}, {self.step}, n={self.n})"
+
+
+class ParamSpace:
+    """
+    Ordered set of Params plus optional feasibility checks.
+    -- constraint: callable(params dict) -> bool, checked per combo
+    -- constraints: declarative Constraints (see constraints.py), checked
+       on whole index arrays; those naming unknown parameters are ignored
+    -- bars: bars the runs will see, for WarmUp/Saturates (None: unknown)
+
+    Infeasible and duplicate combos are never produced by grid() or the
+    samplers.
+    """
+
+    def __init__(self, params: List[Param], constraint: Optional[Callable[[dict], bool]] = None,
+                 constraints: List[Constraint] = (), bars: int = None):
+        self.params = list(params)
+        self.names = [p.name for p in self.params]
+        self.constraint = constraint
+        self.constraints = [c for c in constraints if c.applies(self.names)]
+        self.bars = bars
+
+    @classmethod
+    def from_ranges(cls, ranges: Dict[str, tuple], constraint=None, constraints=(),
+                    bars: int = None) -> 'ParamSpace':
+        """
+        ranges: name -> (low, high, step) or (low, high, step, precision);
+        a parameter is an integer when low, high and step are all ints.
+        """
+        params = []
+        for name, spec in ranges.items():
+            low, high, step = spec[:3]
+            is_int = all(isinstance(v, (int, np.integer)) for v in (low, high, step))
+            precision = spec[3] if len(spec) > 3 else 8
+            params.append(Param(name, low, high, step, is_int, precision))
+        return cls(params, constraint, constraints, bars)
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(p.n for p in self.params)
+
+    @property
+    def size(self) -> int:
+        """Number of combos before the constraint is applied."""
+        return int(np.prod(self.shape, dtype=np.int64)) if self.params else 0
+
+    def decode(self, idx) -> dict:
+        """Index vector -> params dict."""
+        return {p.name: p.value(i) for p, i in zip(self.params, idx)}
+
+    def encode(self, params: dict) -> tuple:
+        """Params dict -> index vector."""
+        return tuple(p.index(params[p.name]) for p in self.params)
+
+    def feasible(self, params: dict) -> bool:
+        cols = {name: np.array([params[name]], dtype=np.float64) for name in self.names}
+        if not self._mask(cols)[0]:
+            return False
+        return self.constraint is None or bool(self.constraint(params))
+
+    def key(self, params: dict) -> tuple:
+        """Equivalence-class key of a combo; combos with equal keys run alike."""
+        if not self.names:
+            return ()
+        cols = {name: np.array([params[name]], dtype=np.float64) for name in self.names}
+        return tuple(self._keys(cols)[0].tolist())
+
+    def _columns(self, idx: np.ndarray) -> Dict[str, np.ndarray]:
+        return {p.name: p.values_at(idx[:, d]) for d, p in enumerate(self.params)}
+
+    def _mask(self, cols: Dict[str, np.ndarray]) -> np.ndarray:
+        ok = np.ones(len(cols[self.names[0]]) if self.names else 1, dtype=bool)
+        for c in self.constraints:
+            ok &= c.mask(cols, self.bars)
+        return ok
+
+    def _keys(self, cols: Dict[str, np.ndarray]) -> np.ndarray:
+        cols = dict(cols)
+        for c in self.constraints:
+            cols.update(c.key(cols, self.bars))
+        return np.stack([cols[name] for name in self.names], axis=1)
+
+    def grid_indices(self) -> np.ndarray:
+        """
+        (combos x params) ladder indices of every feasible combo, last
+        parameter varying fastest; of combos with equal keys only the first.
+        """
+        if not self.params:
+            return np.zeros((1 if self.feasible({}) else 0, 0), dtype=np.int64)
+        # Keys can only collide when a ladder repeats a rounded value or a
+        # constraint defines equivalence classes
+        dedupe = (any(len(set(p.values())) < p.n for p in self.params)
+                  or any(type(c).key is not Constraint.key for c in self.constraints))
+        chunks, keys = [], []
+        for start in range(0, self.size, _GRID_CHUNK):
+            flat = np.arange(start, min(start + _GRID_CHUNK, self.size), dtype=np.int64)
+            idx = np.stack(np.unravel_index(flat, self.shape), axis=1)
+            cols = self._columns(idx)
+            ok = self._mask(cols)
+            if self.constraint is not None:
+                ok[ok] = [bool(self.constraint(self.decode(i))) for i in idx[ok]]
+            chunks.append(idx[ok].astype(np.int32))
+            if dedupe:
+                keys.append(self._keys({name: v[ok] for name, v in cols.items()}))
+        idx = np.concatenate(chunks)
+        if not dedupe or not len(idx):
+            return idx
+        return idx[np.sort(_first_of_each(np.concatenate(keys)))]
+
+    def grid(self) -> Iterator[dict]:
+        """Every feasible, distinct combo, last parameter varying fastest."""
+        for idx in self.grid_indices():
+            yield self.decode(idx)
+
+
+def _first_of_each(keys: np.ndarray) -> np.ndarray:
+    """Row index of the first occurrence of every distinct row of `keys`."""
+    # Code each column by rank, then each row as one integer when they fit
+    codes = [np.unique(col, return_inverse=True) for col in keys.T]
+    dims = tuple(len(values) for values, _ in codes)
+    if math.prod(dims) < 2 ** 62:
+        flat = np.ravel_multi_index(tuple(inverse.ravel() for _, inverse in codes), dims)
+        return np.unique(flat, return_index=True)[1]
+    return np.unique(keys, axis=0, return_index=True)[1]
@@ -0,0 +1,228 @@
+# src/optimizer/walkforward.py
+"""
+Walk-forward optimization: fit on a training window, trade the next one.
+
+The history is cut into consecutive train/test windows (bar indices of
+the first feed):
+
+    rolling   [train 0][test 0]
+                      [train 1][test 1]
+                               [train 2][test 2] ...
+    anchored  [train 0        ][test 0]
+              [train 1                 ][test 1] ...
+
+For each window every candidate combo is run on the training bars, the
+best one (by objective) is run over the test bars, and the test segments
+are chained into one out-of-sample equity curve.
+
+In-sample chunks of every window and then all out-of-sample runs go to
+the shared WorkerPool (src/optimizer/pool.py). The feeds' arrays are
+published there as SharedOHLCV blocks; workers attach to them and slice
+views, so no bars are pickled or copied.
+An out-of-sample run starts `warmup` bars before its test window (by
+default at its training window) so indicators are primed, and only its
+test bars count.
+"""
+
+import math
+from typing import List, NamedTuple
+
+import backtrader as bt
+import numpy as np
+
+from src.data.feeds import OHLCVArrays, feed_length, slice_feeds
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.pool import build_feeds, feed_specs, get_pool
+from src.utils.logger import logger
+
+
+class Window(NamedTuple):
+    """Bar indices [train_start:train_stop] and [test_start:test_stop]."""
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+
+def walk_forward_windows(bars: int, train: int, test: int, anchored: bool = False,
+                         step: int = None) -> List[Window]:
+    """
+    Windows over `bars` bars. Each test window follows its training
+    window; windows advance by `step` bars (default: test) and the last
+    test window may be shorter. anchored=True keeps every training window
+    starting at bar 0.
+    """
+    if train < 1 or test < 1:
+        raise ValueError("train and test must be at least one bar")
+    step = step or test
+    windows = []
+    start = 0
+    while start + train < bars:
+        train_start = 0 if anchored else start
+        test_start = start + train
+        windows.append(Window(train_start, test_start, test_start, min(test_start + test, bars)))
+        start += step
+    return windows
+
+
+class WalkForwardResult:
+    """Per-window choices and the stitched out-of-sample equity curve."""
+
+    def __init__(self, objective: str = 'FinalValue'):
+        self.objective = objective
+        self.windows = []       # one dict per window, see walk_forward()
+        self.dates = []         # datetimes of the out-of-sample bars
+        self.equity = np.empty(0)
+        self.start_value = None
+
+    def __len__(self):
+        return len(self.windows)
+
+    @property
+    def oos_return(self) -> float:
+        """Total out-of-sample return in percent."""
+        if not len(self.equity) or not self.start_value:
+            return 0.0
+        return (self.equity[-1] / self.start_value - 1.0) * 100
+
+
+# --- worker side (runs in pool processes; arguments must pickle) ------------
+
+def _feeds(sources, specs, start, stop) -> list:
+    """Feeds over bars [start:stop] of SharedHandles or OHLCVArrays (views)."""
+    return slice_feeds(build_feeds(sources, specs), start, stop)
+
+
+def _in_sample(sources, specs, strat_cls, objective, start, stop, candidates):
+    """[(score, candidate position)] for the candidates that could run."""
+    executor = SweepExecutor(strat_cls, _feeds(sources, specs, start, stop), objective)
+    scores = []
+    for pos, params in candidates:
+        try:
+            row, _, _ = executor.evaluate(params)
+        except IndexError:
+            # Look-back longer than the training window
+            continue
+        scores.append((row[objective], pos))
+    return scores
+
+
+def _out_of_sample(sources, specs, strat_cls, params, run_start, test_start, stop):
+    """Equity over [run_start:stop]; returns (equity, datetimes, test offset)."""
+    executor = SweepExecutor(strat_cls, _feeds(sources, specs, run_start, stop))
+    _, equity, dt = executor.evaluate(params)
+    return equity.astype(np.float64), dt, test_start - run_start
+
+
+# --- driver -------------------------------------------------------------------
+
+def walk_forward(strat_cls: type, feeds: list, candidates: List[dict], train: int, test: int,
+                 anchored: bool = False, step: int = None, objective: str = 'FinalValue',
+                 warmup: int = None, max_workers: int = None,
+                 chunk_size: int = None) -> WalkForwardResult:
+    """
+    -- strat_cls, feeds: as for SweepExecutor (feeds must be ArrayData)
+    -- candidates: params dicts tried in every training window
+    -- train, test, anchored, step: see walk_forward_windows()
+    -- objective: in-sample result column to maximize
+    -- warmup: bars run before each test window to prime indicators
+       (None: the window's training bars)
+    -- max_workers: size of the shared pool (None: as it is); 1 runs
+       everything in this process
+    -- chunk_size: candidates per in-sample task (None: spread the work
+       over about four tasks per worker)
+
+    Each entry of result.windows holds the window's dates and indices,
+    the chosen params (None when no candidate could run on the training
+    bars, in which case the test window is sat out in cash), their
+    in-sample score and their out-of-sample return in percent.
+    """
+    windows = walk_forward_windows(feed_length(feeds[0]), train, test, anchored, step)
+    result = WalkForwardResult(objective)
+    if not windows or not candidates:
+        return result
+
+    pool = None if max_workers == 1 else get_pool(max_workers)
+    workers = 1 if pool is None else pool.size
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(candidates) * len(windows) / (4 * workers)))
+    indexed = list(enumerate(candidates))
+    chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+    specs = feed_specs(feeds)
+    if pool is None:
+        sources = [f.p.dataname for f in feeds]
+    else:
+        sources = [pool.publish(f.p.dataname) for f in feeds]
+
+    def submit(fn, *args):
+        if pool is None:
+            return _Done(fn(*args))
+        return pool.submit(fn, *args)
+
+    # 1) In-sample sweeps, all windows at once
+    futures = [[submit(_in_sample, sources, specs, strat_cls, objective,
+                       w.train_start, w.train_stop, chunk) for chunk in chunks]
+               for w in windows]
+    best = []
+    for w, parts in zip(windows, futures):
+        scores = [s for f in parts for s in f.result()]
+        # Highest score; the earliest candidate among equals
+        best.append(min(scores, key=lambda s: (-s[0], s[1])) if scores else None)
+
+    # 2) Out-of-sample runs of each window's winner
+    oos = []
+    for w, choice in zip(windows, best):
+        if choice is None:
+            logger.warning(f"Walk-forward window {w}: no candidate could run on the training bars")
+            oos.append(None)
+            continue
+        run_start = w.train_start if warmup is None else max(0, w.test_start - warmup)
+        oos.append(submit(_out_of_sample, sources, specs, strat_cls,
+                          candidates[choice[1]], run_start, w.test_start, w.test_stop))
+    oos = [f.result() if f is not None else None for f in oos]
+
+    _stitch(result, feeds[0].p.dataname, windows, best, oos, candidates)
+    return result
+
+
+class _Done:
+    """Future-like wrapper for work run inline (max_workers=1)."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
+def _stitch(result: WalkForwardResult, arrays: OHLCVArrays, windows, best, oos, candidates):
+    """Chain each window's test-bar returns into one curve starting at the broker's cash."""
+    value = result.start_value = bt.Cerebro().broker.startingcash
+    segments, dates = [], []
+    for w, choice, run in zip(windows, best, oos):
+        info = {
+            'train_start': bt.num2date(arrays.datetime[w.train_start]),
+            'train_end': bt.num2date(arrays.datetime[w.train_stop - 1]),
+            'test_start': bt.num2date(arrays.datetime[w.test_start]),
+            'test_end': bt.num2date(arrays.datetime[w.test_stop - 1]),
+            'window': w, 'params': None, 'in_sample': None, 'oos_return': 0.0,
+        }
+        if run is None:
+            # Nothing could be fitted: hold cash over the test bars
+            seg = np.full(w.test_stop - w.test_start, value)
+            seg_dt = arrays.datetime[w.test_start:w.test_stop]
+        else:
+            equity, dt, offset = run
+            base = equity[offset - 1] if offset else result.start_value
+            seg = value * equity[offset:] / base
+            seg_dt = dt[offset:]
+            info.update(params=candidates[choice[1]], in_sample=choice[0],
+                        oos_return=(seg[-1] / value - 1.0) * 100)
+        segments.append(seg)
+        dates.append(seg_dt)
+        value = seg[-1]
+        result.windows.append(info)
+        logger.info(f"Walk-forward {info['test_start']:%Y-%m-%d}..{info['test_end']:%Y-%m-%d}: "
+                    f"{info['params']} -> {info['oos_return']:+.2f}% out of sample")
+    result.equity = np.concatenate(segments)
+    result.dates = [bt.num2date(x) for x in np.concatenate(dates)]
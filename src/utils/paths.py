@@ -0,0 +1,56 @@
+# src/utils/paths.py
+"""
+Where the app keeps its files: a per-user data directory instead of
+whatever the working directory happens to be.
+
+BACKTESTER_DATA_DIR overrides the location; otherwise it is %APPDATA%
+on Windows, ~/Library/Application Support on macOS and $XDG_DATA_HOME
+(default ~/.local/share) elsewhere, each with an APP_DIR_NAME folder.
+"""
+
+import os
+import sqlite3
+import sys
+
+from src.utils.logger import logger
+
+APP_DIR_NAME = 'ModularBacktester'
+DATA_DIR_ENV = 'BACKTESTER_DATA_DIR'
+
+
+def app_data_dir() -> str:
+    """The per-user data directory, created if missing."""
+    path = os.environ.get(DATA_DIR_ENV)
+    if not path:
+        if sys.platform == 'win32':
+            base = os.environ.get('APPDATA') or os.path.expanduser('~\\AppData\\Roaming')
+        elif sys.platform == 'darwin':
+            base = os.path.expanduser('~/Library/Application Support')
+        else:
+            base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+        path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def database_path(name: str) -> str:
+    """
+    Path of the SQLite database `name` in app_data_dir(). Earlier versions
+    kept it in the working directory; if it is only there, it is copied
+    over (with the sqlite3 backup API, so a WAL file is folded in).
+    """
+    path = os.path.join(app_data_dir(), name)
+    legacy = os.path.abspath(name)
+    if not os.path.exists(path) and legacy != path and os.path.isfile(legacy):
+        src, dst = sqlite3.connect(legacy), sqlite3.connect(path)
+        try:
+            src.backup(dst)
+            logger.info(f"Copied {legacy} to {path}")
+        except sqlite3.Error:
+            logger.exception(f"Could not copy {legacy} to {path}; starting a new database")
+            dst.close()
+            os.remove(path)
+        finally:
+            src.close()
+            dst.close()
+    return path
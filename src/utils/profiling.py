@@ -0,0 +1,166 @@
+# src/utils/profiling.py
+"""
+Per-phase timing of a backtest run.
+
+A RunProfiler collects one record per phase (data load, feed build,
+cerebro.run, analyzers, metrics, chart rendering, report...) with wall and
+CPU time, bars/s, RSS change and the process peak RSS. Library code marks
+its phases with the module-level phase() context manager, which is a no-op
+unless a profiler is active:
+
+    with RunProfiler(capture='cprofile') as prof:
+        feed, rows = DataLoader.from_csv(path)
+        ...
+    prof.to_json('run_profile.json')
+
+capture='cprofile' (or 'pyinstrument', if installed) additionally profiles
+the whole session; the text report is in prof.capture_text.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from src.utils.memory import current_rss_mb, peak_rss_mb
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+CAPTURE_MODES = (None, 'cprofile', 'pyinstrument')
+
+# Profilers are activated per thread so a GUI run does not pick up phases
+# from background workers (and vice versa)
+_local = threading.local()
+
+
+def active():
+    """The RunProfiler active in this thread, or None."""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def phase(name: str, bars: int = None):
+    """
+    Record `name` into the active profiler. With none active this only
+    yields a scratch dict, so callers can fill in record['bars'] either way.
+    """
+    prof = active()
+    if prof is None:
+        yield {}
+        return
+    with prof.phase(name, bars) as record:
+        yield record
+
+
+class RunProfiler:
+    """
+    Collects phase records while active (use as a context manager).
+    -- capture: None, 'cprofile' or 'pyinstrument' for a call profile of the session
+    -- trace_memory: also record each phase's peak Python allocation via
+       tracemalloc (slows allocation-heavy code; a nested phase resets the
+       peak its parent reports)
+    """
+
+    def __init__(self, capture: str = None, trace_memory: bool = False):
+        if capture not in CAPTURE_MODES:
+            raise ValueError(f"capture must be one of {CAPTURE_MODES}, got {capture!r}")
+        if capture == 'pyinstrument' and pyinstrument is None:
+            raise ImportError("pyinstrument is not installed")
+        self.capture = capture
+        self.trace_memory = trace_memory
+        self.phases = []
+        self.capture_text = ''
+        self.started = None
+        self.wall_s = 0.0
+        self._depth = 0
+        self._profiler = None
+        self._own_tracemalloc = False
+        self._t0 = None
+
+    def __enter__(self):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self._own_tracemalloc = self.trace_memory and not tracemalloc.is_tracing()
+        if self._own_tracemalloc:
+            tracemalloc.start()
+        if self.capture == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.capture == 'pyinstrument':
+            self._profiler = pyinstrument.Profiler()
+            self._profiler.start()
+        if not hasattr(_local, 'stack'):
+            _local.stack = []
+        _local.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.stack.remove(self)
+        if self.capture == 'cprofile':
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(40)
+            self.capture_text = out.getvalue()
+        elif self.capture == 'pyinstrument':
+            self._profiler.stop()
+            self.capture_text = self._profiler.output_text()
+        self._profiler = None
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+        self.wall_s = time.perf_counter() - self._t0
+        return False
+
+    @contextmanager
+    def phase(self, name: str, bars: int = None):
+        """
+        Time the enclosed block. The yielded record can be updated inside
+        the block, e.g. record['bars'] = n once the bar count is known.
+        """
+        # Appended up front so self.phases stays in start order, with
+        # nested phases after their parent
+        record = {'name': name, 'depth': self._depth, 'bars': bars}
+        self.phases.append(record)
+        rss0 = current_rss_mb()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced0 = tracemalloc.get_traced_memory()[0]
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            wall = time.perf_counter() - wall0
+            record['wall_s'] = wall
+            record['cpu_s'] = time.process_time() - cpu0
+            bars = record['bars']
+            record['bars_per_s'] = bars / wall if bars and wall > 0 else None
+            rss1 = current_rss_mb()
+            record['rss_delta_mb'] = rss1 - rss0 if rss0 is not None and rss1 is not None else None
+            record['peak_rss_mb'] = peak_rss_mb()
+            if self.trace_memory and tracemalloc.is_tracing():
+                record['traced_peak_mb'] = (tracemalloc.get_traced_memory()[1] - traced0) / (1024 * 1024)
+
+    def report(self) -> dict:
+        """JSON-serializable summary of the session."""
+        return {
+            'started': self.started,
+            'wall_s': self.wall_s,
+            'capture': self.capture,
+            'peak_rss_mb': peak_rss_mb(),
+            'phases': self.phases,
+            'capture_text': self.capture_text,
+        }
+
+    def to_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
@@ -0,0 +1,52 @@
+# src/viz/dashboard.py
+"""
+Interactive (Plotly) run dashboard shown in the Results tab: equity,
+drawdown, returns histogram and rolling Sharpe. Kept free of Qt so it
+can be built (and benchmarked) without a web view.
+"""
+
+import numpy as np
+import plotly.graph_objs as go
+from plotly.subplots import make_subplots
+
+from src.backtester.metrics import drawdown_pct, equity_dates, rolling_sharpe
+
+
+def dashboard_series(equity: np.ndarray, window: int = 20) -> dict:
+    """Chart series from an EquityRecorder array."""
+    equity_vals = equity['equity']
+    returns = np.diff(equity_vals)
+    rolling = rolling_sharpe(returns, window=window)
+    # Align with dates (no change on the first bar)
+    rolling = np.concatenate(([np.nan], rolling)) if len(equity_vals) else rolling
+    return {
+        'dates': equity_dates(equity),
+        'equity_vals': equity_vals,
+        'drawdown': drawdown_pct(equity_vals),
+        'returns': returns,
+        'rolling': rolling,
+    }
+
+
+def build_dashboard(dates, equity_vals, drawdown, returns, rolling) -> go.Figure:
+    """2x2 dashboard: equity, drawdown, returns hist, rolling Sharpe."""
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Equity Curve', 'Drawdown (%)', 'Returns Distribution', 'Rolling Sharpe'),
+        vertical_spacing=0.2, horizontal_spacing=0.1
+    )
+    # Equity Curve
+    fig.add_trace(go.Scatter(x=dates, y=equity_vals, mode='lines', name='Equity'), row=1, col=1)
+    # Drawdown
+    fig.add_trace(go.Bar(x=dates, y=drawdown, name='Drawdown'), row=1, col=2)
+    # Returns Histogram
+    fig.add_trace(go.Histogram(x=returns, nbinsx=30, name='Returns'), row=2, col=1)
+    # Rolling Sharpe
+    fig.add_trace(go.Scatter(x=dates, y=rolling, mode='lines', name='Rolling Sharpe'), row=2, col=2)
+
+    fig.update_layout(
+        title='Backtest Performance Dashboard',
+        height=800, width=1200,
+        showlegend=False
+    )
+    return fig
@@ -0,0 +1,115 @@
+# src/viz/static_charts.py
+"""
+Static (PNG) versions of the run charts for reports.
+
+WeasyPrint cannot execute Plotly's JavaScript, so reports embed
+pre-rendered images instead. Rendering goes through the Agg canvas
+directly (no pyplot, no GUI backend), which also works in worker
+processes. Results are memoized per run, keyed by a digest of the data.
+"""
+
+import base64
+import hashlib
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# run digest -> {'equity_div': ..., 'drawdown_div': ..., 'returns_div': ...}
+_CACHE = OrderedDict()
+_CACHE_SIZE = 32
+
+
+def run_key(dates, equity_vals) -> str:
+    """Digest identifying one run's series; used as the memo key."""
+    h = hashlib.sha1(np.asarray(equity_vals, dtype=float).tobytes())
+    h.update(repr(list(dates)).encode())
+    return h.hexdigest()
+
+
+def _png_img(fig: Figure, alt: str) -> str:
+    buf = BytesIO()
+    FigureCanvasAgg(fig)
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    data = base64.b64encode(buf.getvalue()).decode('ascii')
+    return f'<img alt="{alt}" style="width:100%" src="data:image/png;base64,{data}">'
+
+
+def _new_axes(title, xlabel, ylabel):
+    fig = Figure(figsize=(10, 4), dpi=100)
+    ax = fig.add_subplot(111)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, alpha=0.3)
+    return fig, ax
+
+
+def render_run_charts(dates, equity_vals) -> dict:
+    """
+    Render equity, drawdown and returns-distribution charts as inline
+    <img> tags, keyed like the report template's *_div placeholders.
+    """
+    key = run_key(dates, equity_vals)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    x = list(dates)
+    equity = np.asarray(equity_vals, dtype=float)
+    cummax = np.maximum.accumulate(equity) if len(equity) else equity
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(cummax > 0, (equity - cummax) / cummax * 100, 0)
+    returns = np.diff(equity)
+
+    fig, ax = _new_axes('Equity Curve', 'Date', 'Portfolio Value')
+    ax.plot(x, equity, linewidth=1)
+    equity_div = _png_img(fig, 'Equity Curve')
+
+    fig, ax = _new_axes('Drawdown (%)', 'Date', 'Drawdown (%)')
+    ax.fill_between(x, drawdown, 0, step='mid', alpha=0.6)
+    drawdown_div = _png_img(fig, 'Drawdown')
+
+    fig, ax = _new_axes('Returns Distribution', 'Returns', 'Frequency')
+    if len(returns):
+        ax.hist(returns, bins=30)
+    returns_div = _png_img(fig, 'Returns Distribution')
+
+    charts = {'equity_div': equity_div, 'drawdown_div': drawdown_div, 'returns_div': returns_div}
+    _CACHE[key] = charts
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return charts
+
+
+def render_heatmap(grid, x_labels, y_labels, xlabel: str, ylabel: str, title: str) -> str:
+    """
+    Render a 2-D array (rows = y_labels, cols = x_labels) as a heatmap
+    <img>. NaN cells (untested combos) are left blank.
+    """
+    grid = np.asarray(grid, dtype=float)
+    fig = Figure(figsize=(max(4, 0.6 * len(x_labels) + 2), max(3, 0.4 * len(y_labels) + 1.5)), dpi=100)
+    ax = fig.add_subplot(111)
+    im = ax.imshow(np.ma.masked_invalid(grid), aspect='auto', origin='lower', cmap='viridis')
+    fig.colorbar(im, ax=ax)
+    ax.set_xticks(range(len(x_labels)))
+    ax.set_xticklabels([str(v) for v in x_labels], rotation=45, ha='right')
+    ax.set_yticks(range(len(y_labels)))
+    ax.set_yticklabels([str(v) for v in y_labels])
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    return _png_img(fig, title)
+
+
+def render_equity_overlay(dates, curves, labels, title: str = 'Equity Curves') -> str:
+    """Overlay several equity curves sharing the same dates in one chart."""
+    fig, ax = _new_axes(title, 'Date', 'Portfolio Value')
+    x = list(dates)
+    for curve, label in zip(curves, labels):
+        ax.plot(x[:len(curve)], curve, linewidth=1, label=label)
+    if labels:
+        ax.legend(fontsize='small', loc='best')
+    return _png_img(fig, title)
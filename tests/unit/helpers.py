@@ -0,0 +1,7 @@
+from benchmarks.synthetic import synthetic_ohlcv
+from src.data.feeds import ArrayData
+
+
+def synthetic_feed(n: int, seed: int = 0, freq: str = 'D', vol: float = 0.01) -> ArrayData:
+    """ArrayData over the benchmarks' synthetic OHLCV walk (`n` bars, ~1% moves per bar)."""
+    return ArrayData.from_dataframe(synthetic_ohlcv(n, freq=freq, vol=vol, seed=seed))
@@ -0,0 +1,66 @@
+import pytest
+from src.data.aggregator import BarAggregator, LiveBarStore, parse_message
+
+
+def _bars(store, symbol):
+    return [tuple(r) for r in zip(*store.arrays(symbol).values())]
+
+
+def test_time_bars_close_after_watermark():
+    agg = BarAggregator('time', size=60, watermark_s=5)
+    agg.add_tick('SPY', 0, 100, 1)
+    agg.add_tick('SPY', 30, 105, 2)
+    agg.add_tick('SPY', 59, 99, 1)
+    agg.add_tick('SPY', 62, 101, 1)
+    # Bar [0, 60) is still inside the watermark
+    assert agg.store.count('SPY') == 0
+    agg.add_tick('SPY', 66, 102, 1)
+    assert _bars(agg.store, 'SPY') == [(0, 100, 105, 99, 99, 4)]
+
+
+def test_out_of_order_within_watermark_and_late_drop():
+    agg = BarAggregator('time', size=10, watermark_s=5)
+    agg.add_tick('SPY', 5, 100, 1)
+    agg.add_tick('SPY', 12, 103, 1)
+    # Arrives late but inside the watermark: becomes the bar's open
+    agg.add_tick('SPY', 1, 98, 1)
+    agg.add_tick('SPY', 16, 104, 1)
+    assert _bars(agg.store, 'SPY') == [(0, 98, 100, 98, 100, 2)]
+    # Bar [0, 10) is already published: drop
+    agg.add_tick('SPY', 9, 50, 1)
+    assert agg.late_dropped == 1
+    agg.flush()
+    assert _bars(agg.store, 'SPY')[-1] == (10, 103, 104, 103, 104, 2)
+
+
+def test_tick_and_volume_bars():
+    ticks = BarAggregator('tick', size=3)
+    vol = BarAggregator('volume', size=10)
+    for i, (price, size) in enumerate([(1, 4), (3, 4), (2, 4), (5, 1), (4, 9)]):
+        ticks.add_tick('X', i, price, size)
+        vol.add_tick('X', i, price, size)
+    assert _bars(ticks.store, 'X') == [(0, 1, 3, 1, 2, 12)]
+    assert _bars(vol.store, 'X') == [(0, 1, 3, 1, 2, 12), (3, 5, 5, 4, 4, 10)]
+
+
+def test_symbols_are_independent_and_store_notifies():
+    store = LiveBarStore()
+    seen = []
+    store.subscribe(lambda symbol, bar: seen.append((symbol, bar.ts)))
+    agg = BarAggregator('time', size=1, watermark_s=0, store=store)
+    agg.on_batch([('feed', [{'symbol': 'A', 'ts': 1, 'price': 1, 'size': 1},
+                            {'symbol': 'B', 'ts': 1, 'bid': 9, 'ask': 11}]),
+                  ('feed', {'symbol': 'A', 'ts': 2, 'price': 2, 'size': 1})])
+    assert seen == [('A', 1)]
+    df = store.to_dataframe('A')
+    assert list(df.columns) == ["Date", "Open", "High", "Low", "Close", "Volume"]
+    assert str(df['Date'].iloc[0]) == '1970-01-01 00:00:01+00:00'
+    agg.flush()
+    assert _bars(store, 'B') == [(1, 10, 10, 10, 10, 0)]
+
+
+def test_parse_message_and_invalid_mode():
+    assert parse_message({'s': 'X', 't': 1_700_000_000_000, 'p': '1.5', 'q': 2}) == ('X', 1_700_000_000.0, 1.5, 2.0)
+    assert parse_message({'symbol': 'X', 'ts': 1}) is None
+    with pytest.raises(ValueError):
+        BarAggregator('renko')
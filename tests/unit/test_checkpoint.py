@@ -0,0 +1,109 @@
+import numpy as np
+
+from src.backtester.strategies import SmaCross
+from src.optimizer.checkpoint import SweepStore, sweep_definition, sweep_key
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.samplers import make_sampler
+from src.optimizer.space import ParamSpace
+from tests.unit.helpers import synthetic_feed
+
+
+SPACE = ParamSpace.from_ranges({'sma_short': (3, 12, 3), 'sma_long': (20, 200, 60)})
+
+
+class CountingExecutor(SweepExecutor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.runs = 0
+
+    def evaluate(self, params, bars=None):
+        self.runs += 1
+        return super().evaluate(params, bars)
+
+
+def test_sweep_key_follows_the_definition():
+    feed = synthetic_feed(150)
+    key = sweep_key(sweep_definition(SmaCross, [feed], SPACE, 'random', seed=1, budget=5))
+    assert key == sweep_key(sweep_definition(SmaCross, [synthetic_feed(150)], SPACE, 'random', seed=1, budget=5))
+    assert key != sweep_key(sweep_definition(SmaCross, [feed], SPACE, 'random', seed=2, budget=5))
+    assert key != sweep_key(sweep_definition(SmaCross, [synthetic_feed(150, seed=1)], SPACE, 'random', seed=1, budget=5))
+    # The grid ignores seed and budget
+    assert (sweep_key(sweep_definition(SmaCross, [feed], SPACE, 'grid', seed=1, budget=5)) ==
+            sweep_key(sweep_definition(SmaCross, [feed], SPACE, 'grid', seed=2, budget=9)))
+
+
+def test_interrupted_sweep_resumes_without_rerunning_done_combos(tmp_path):
+    feed = synthetic_feed(150)
+    definition = sweep_definition(SmaCross, [feed], SPACE, 'grid')
+    key = sweep_key(definition)
+    store = SweepStore(str(tmp_path / 'sweeps.db'))
+
+    first = CountingExecutor(SmaCross, [feed])
+    stopped = first.run(make_sampler('grid', SPACE), checkpoint=store.checkpoint(key, definition),
+                        should_stop=lambda: first.runs >= 5)
+    assert len(stopped.rows) + len(stopped.skipped) == 5
+    assert not store.info(key)['complete']
+    store.close()
+
+    # A new process: reopen the database and run the same sweep again
+    store = SweepStore(str(tmp_path / 'sweeps.db'))
+    second = CountingExecutor(SmaCross, [feed])
+    resumed = second.run(make_sampler('grid', SPACE), checkpoint=store.checkpoint(key, definition))
+    fresh = SweepExecutor(SmaCross, [feed]).run(make_sampler('grid', SPACE))
+
+    assert second.runs == len(list(SPACE.grid())) - 5 and resumed.resumed == 5
+    assert resumed.rows == fresh.rows and resumed.skipped == fresh.skipped
+    assert all(np.array_equal(a, b) for a, b in zip(resumed.equities, fresh.equities))
+    assert resumed.dates == fresh.dates
+    info = store.info(key)
+    assert info['complete'] and info['done'] == len(list(SPACE.grid()))
+    # sma_long=200 never fits 150 bars; it is stored as skipped, not retried
+    assert info['skipped'] == len(fresh.skipped) > 0
+
+    third = CountingExecutor(SmaCross, [feed])
+    third.run(make_sampler('grid', SPACE), checkpoint=store.checkpoint(key, definition))
+    assert third.runs == 0
+
+    # Incremental loading, in completion order
+    chunks = list(store.iter_results(key, chunk=3))
+    assert all(len(c) <= 3 for c in chunks)
+    assert [row for c in chunks for _, row, _ in c] == fresh.rows
+    assert len(store.dates(key)) == 150
+    store.close()
+
+
+def test_adaptive_search_resumes_on_the_same_path(tmp_path):
+    feed = synthetic_feed(150)
+    space = ParamSpace.from_ranges({'sma_short': (2, 12, 1), 'sma_long': (15, 60, 5)})
+    definition = sweep_definition(SmaCross, [feed], space, 'tpe', seed=3, budget=16)
+    key = sweep_key(definition)
+    store = SweepStore(str(tmp_path / 'sweeps.db'))
+
+    interrupted = CountingExecutor(SmaCross, [feed])
+    interrupted.run(make_sampler('tpe', space, seed=3), budget=16,
+                    checkpoint=store.checkpoint(key, definition),
+                    should_stop=lambda: interrupted.runs >= 12)
+    resumed = CountingExecutor(SmaCross, [feed]).run(
+        make_sampler('tpe', space, seed=3), budget=16, checkpoint=store.checkpoint(key, definition))
+    fresh = SweepExecutor(SmaCross, [feed]).run(make_sampler('tpe', space, seed=3), budget=16)
+    assert resumed.rows == fresh.rows and resumed.resumed == 12
+    store.close()
+
+
+def test_checkpoint_writes_are_batched_and_committed_by_finish(tmp_path):
+    path = str(tmp_path / 'sweeps.db')
+    store = SweepStore(path, batch_size=4)
+    definition = {'mode': 'grid'}
+    checkpoint = store.checkpoint('k', definition)
+    for i in range(10):
+        checkpoint.put({'sma_short': i}, {'FinalValue': i}, np.arange(3, dtype=np.float32), [1.0, 2.0, 3.0])
+    checkpoint.skip({'sma_short': 99})
+    checkpoint.finish()
+
+    # Everything is on disk for another connection once finish() returns
+    other = SweepStore(path)
+    info = other.info('k')
+    assert info['complete'] and info['done'] == 11 and info['skipped'] == 1
+    assert len(other.checkpoint('k')) == 11 and other.dates('k') == store.dates('k')
+    other.close()
+    store.close()
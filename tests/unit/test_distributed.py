@@ -0,0 +1,134 @@
+import multiprocessing as mp
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from src.backtester.strategies import SmaCross
+from src.optimizer.distributed import Coordinator, Worker, main, recv_msg, run_worker, send_msg
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.samplers import make_sampler
+from src.optimizer.space import ParamSpace
+from tests.unit.helpers import synthetic_feed
+
+SPACE = ParamSpace.from_ranges({'sma_short': (3, 12, 3), 'sma_long': (20, 300, 70)})
+
+
+def _local(feed):
+    return SweepExecutor(SmaCross, [feed]).run(make_sampler('grid', SPACE))
+
+
+def _worker_thread(coord, **kwargs):
+    worker = Worker(*coord.address, **kwargs)
+    thread = threading.Thread(target=worker.run, daemon=True)
+    thread.start()
+    return worker, thread
+
+
+def _lease_and_hold(coord):
+    """A raw client that leases one unit and then goes silent."""
+    sock = socket.create_connection(coord.address)
+    send_msg(sock, {'type': 'hello', 'name': 'flaky'})
+    recv_msg(sock)
+    send_msg(sock, {'type': 'request'})
+    unit, _ = recv_msg(sock)
+    assert unit['type'] == 'unit'
+    return sock, unit['unit']
+
+
+def test_worker_processes_match_a_local_sweep():
+    feed = synthetic_feed(250, seed=5)
+    ctx = mp.get_context('spawn')
+    with Coordinator(SmaCross, [feed], list(SPACE.grid()), unit_size=3, token='secret') as coord:
+        procs = [ctx.Process(target=run_worker, args=coord.address, kwargs={'token': 'secret'})
+                 for _ in range(3)]
+        for p in procs:
+            p.start()
+        streamed = []
+        result = coord.wait(timeout=120, on_result=streamed.append)
+        for p in procs:
+            p.join(30)
+        status = coord.status()
+    local = _local(feed)
+    assert status['done'] == status['units'] and len(status['workers']) == 3
+    assert result.rows == local.rows and result.skipped == local.skipped
+    assert sorted(map(str, streamed)) == sorted(map(str, local.rows))
+    assert all(np.array_equal(a, b) for a, b in zip(result.equities, local.equities))
+    assert result.dates == local.dates
+
+
+def test_units_of_a_lost_worker_are_retried():
+    feed = synthetic_feed(250, seed=5)
+    with Coordinator(SmaCross, [feed], list(SPACE.grid()), unit_size=4) as coord:
+        sock, uid = _lease_and_hold(coord)
+        sock.close()                                   # worker dies mid-unit
+        _, thread = _worker_thread(coord)
+        result = coord.wait(timeout=60)
+        thread.join(10)
+        assert coord.units[uid].attempts == 2
+    assert result.rows == _local(feed).rows
+
+
+def test_expired_lease_is_reassigned_and_the_late_worker_revoked():
+    feed = synthetic_feed(250, seed=5)
+    with Coordinator(SmaCross, [feed], list(SPACE.grid()), unit_size=4, lease=0.5) as coord:
+        sock, uid = _lease_and_hold(coord)             # stalls without renewing
+        _, thread = _worker_thread(coord)
+        result = coord.wait(timeout=60)
+        thread.join(10)
+        send_msg(sock, {'type': 'renew', 'unit': uid})
+        assert recv_msg(sock)[0]['type'] == 'revoked'
+        sock.close()
+    assert result.rows == _local(feed).rows
+
+
+def test_bad_token_is_refused():
+    with Coordinator(SmaCross, [synthetic_feed(250, seed=5)], list(SPACE.grid()), token='right') as coord:
+        with pytest.raises(PermissionError):
+            Worker(*coord.address, token='wrong').run()
+
+
+def test_datasets_are_cached_by_fingerprint(tmp_path):
+    feed = synthetic_feed(250, seed=5)
+    cache = str(tmp_path / 'cache')
+    with Coordinator(SmaCross, [feed], list(SPACE.grid())[:2]) as coord:
+        first = Worker(*coord.address, cache_dir=cache)
+        first.run()
+    with Coordinator(SmaCross, [feed], list(SPACE.grid())[2:4]) as coord:
+        second = Worker(*coord.address, cache_dir=cache)
+        second.run()
+        result = coord.result()
+    assert first.fetched == 1 and second.fetched == 0
+    assert second.cached_fingerprints() == [feed.p.dataname.fingerprint()]
+    assert result.rows == _local(feed).rows[2:4]
+
+
+def test_remote_bind_needs_a_token(monkeypatch):
+    monkeypatch.delenv('SWEEP_TOKEN', raising=False)
+    feed = synthetic_feed(250, seed=5)
+    with pytest.raises(ValueError):
+        Coordinator(SmaCross, [feed], list(SPACE.grid()), host='0.0.0.0')
+    Coordinator(SmaCross, [feed], list(SPACE.grid()), host='0.0.0.0', token='secret').stop()
+    with pytest.raises(SystemExit):
+        main(['coordinator', '--csv', 'x.csv', '--strategy', 'SmaCross', '--host', '0.0.0.0'])
+
+
+def test_malformed_messages_get_an_error_reply():
+    feed = synthetic_feed(250, seed=5)
+    with Coordinator(SmaCross, [feed], list(SPACE.grid()), unit_size=4) as coord:
+        sock, uid = _lease_and_hold(coord)
+        for msg, payload in [({'type': 'renew'}, b''),
+                             ({'type': 'renew', 'unit': 999}, b''),
+                             ({'type': 'error', 'unit': 'x'}, b''),
+                             ({'type': 'fetch', 'fingerprint': 'nope'}, b''),
+                             ({'type': 'result', 'unit': uid}, b''),
+                             ({'type': 'result', 'unit': uid, 'rows': [{}], 'skipped': [],
+                               'lengths': [3]}, b'\0' * 5)]:
+            send_msg(sock, msg, payload)
+            assert recv_msg(sock)[0]['type'] == 'error'
+        # The connection and the lease survive
+        send_msg(sock, {'type': 'renew', 'unit': uid})
+        assert recv_msg(sock)[0]['type'] == 'ok'
+        assert uid not in coord._done
+        sock.close()
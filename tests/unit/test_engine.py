@@ -0,0 +1,65 @@
+import backtrader as bt
+import numpy as np
+
+from benchmarks.synthetic import synthetic_ohlcv
+from src.backtester.analyzers import EQUITY_DTYPE, EventSink, EquityRecorder, TradeRecorder
+from src.backtester.engine import BacktestEngine
+from src.backtester.strategies import SmaCross
+from src.data.feeds import ArrayData
+
+
+def _frame(n=3000, seed=5):
+    return synthetic_ohlcv(n, freq='h', vol=0.01, seed=seed)
+
+
+def _engine(df, **kwargs):
+    engine = BacktestEngine(**kwargs)
+    engine.add_data(ArrayData.from_dataframe(df))
+    engine.set_strategy(SmaCross)
+    return engine
+
+
+def test_low_memory_mode_matches_default_results(tmp_path):
+    df = _frame()
+    default = _engine(df)
+    default.add_analyzer(EventSink, _name='sink')
+    default.add_analyzer(EquityRecorder, _name='equity')
+    default.add_analyzer(TradeRecorder, _name='trades')
+    full = default.run()[0]
+
+    lean = _engine(df, low_memory=True)
+    assert lean.cerebro.p.exactbars == 1 and not lean.cerebro.p.stdstats
+    assert lean.cerebro.observers == []
+    res = lean.run()[0]
+
+    assert res.broker.getvalue() == full.broker.getvalue()
+    ref, got = full.analyzers.sink.get_analysis(), res.analyzers.sink.get_analysis()
+    # The sink records the same rows as the in-memory recorders
+    np.testing.assert_array_equal(ref['equity'], full.analyzers.equity.get_analysis())
+    np.testing.assert_array_equal(ref['trades'], full.analyzers.trades.get_analysis())
+    np.testing.assert_array_equal(got['equity'], ref['equity'])
+    np.testing.assert_array_equal(got['trades']['pnlcomm'], ref['trades']['pnlcomm'])
+    assert len(got['equity']) == len(df) and len(got['trades']) > 0
+    # Finished orders are not kept for the whole run
+    assert len(res.broker.orders) < 1024
+    assert lean.peak_rss_mb is None or lean.peak_rss_mb > 0
+
+
+def test_event_sink_spills_to_disk(tmp_path):
+    # Long enough for several spills of EventSink's default flush_rows
+    df = _frame(10000)
+    mem = _engine(df, low_memory=True).run()[0].analyzers.sink.get_analysis()
+    prefix = str(tmp_path / "run")
+    engine = _engine(df, low_memory=True, sink_path=prefix)
+    disk = engine.run()[0].analyzers.sink.get_analysis()
+    assert isinstance(disk['equity'], np.memmap)
+    np.testing.assert_array_equal(disk['equity'], mem['equity'])
+    # Trade refs count up across runs; everything else matches
+    fields = [f for f in disk['trades'].dtype.names if f != 'ref']
+    np.testing.assert_array_equal(disk['trades'][fields], mem['trades'][fields])
+    assert (tmp_path / "run.equity.bin").stat().st_size == len(df) * EQUITY_DTYPE.itemsize
+
+
+def test_default_mode_keeps_buysell_observer():
+    engine = BacktestEngine()
+    assert any(obs[1] is bt.observers.BuySell for obs in engine.cerebro.observers)
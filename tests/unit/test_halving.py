@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.backtester.strategies import SmaCross
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.halving import (default_min_fraction, hyperband, rung_fractions,
+                                   successive_halving)
+from src.optimizer.samplers import make_sampler
+from src.optimizer.space import ParamSpace
+from tests.unit.helpers import synthetic_feed
+
+
+def _executor(n=1800):
+    return SweepExecutor(SmaCross, [synthetic_feed(n, seed=1, freq='h')])
+
+
+def _space():
+    return ParamSpace.from_ranges({'sma_short': (5, 25, 5), 'sma_long': (20, 220, 40)},
+                                  constraint=lambda p: p['sma_short'] < p['sma_long'])
+
+
+def test_rung_schedule():
+    assert rung_fractions(3, 1 / 9) == pytest.approx([1 / 9, 1 / 3, 1.0])
+    assert rung_fractions(2, 1.0) == [1.0]
+    assert default_min_fraction(9, 3) == pytest.approx(1 / 9)
+    assert default_min_fraction(81, 3) == pytest.approx(1 / 81)
+    assert default_min_fraction(1, 3) == 1.0
+
+
+def test_evaluate_on_a_prefix():
+    executor = _executor()
+    row, equity, dt = executor.evaluate({'sma_short': 5, 'sma_long': 20}, bars=200)
+    assert len(equity) == len(dt) == 200
+    full = executor.evaluate({'sma_short': 5, 'sma_long': 20})
+    assert len(full[1]) == 1800
+    # The prefix run is the start of the full run
+    assert np.allclose(equity[:150], full[1][:150])
+
+
+def test_successive_halving_prunes_and_accounts_for_every_candidate():
+    executor = _executor()
+    candidates = list(_space().grid())
+    result = successive_halving(executor, candidates, eta=3, min_fraction=1 / 9)
+
+    assert [r['fraction'] for r in result.rounds] == pytest.approx([1 / 9, 1 / 3, 1.0])
+    # sma_long=220 cannot run on the 200-bar first rung and moves up undecided
+    assert result.rounds[0]['undecided'] >= sum(c['sma_long'] > 200 for c in candidates)
+    assert len(result.rows) + len(result.pruned) + len(result.skipped) == len(candidates)
+    for r0, r1 in zip(result.rounds, result.rounds[1:]):
+        assert r1['evaluated'] == r0['kept'] + r0['undecided']
+    assert result.pruned and all(p['Fraction'] < 1 for p in result.pruned)
+    assert all(len(eq) == 1800 for eq in result.equities) and len(result.dates) == 1800
+
+    # Survivors were run in full, and the pruning saved bar evaluations
+    best = result.best()
+    params = {k: best[k] for k in ('sma_short', 'sma_long')}
+    assert executor.evaluate(params)[0] == best
+    assert result.bars_exhaustive == len(candidates) * 1800
+    assert 0 < result.compute_saved < 1
+
+
+def test_hyperband_draws_its_budget_across_brackets():
+    executor = _executor()
+    sampler = make_sampler('random', _space(), seed=2)
+    result = hyperband(executor, sampler, budget=20, eta=3, min_fraction=1 / 9, min_bars=50)
+    assert {r['bracket'] for r in result.rounds} == {0, 1, 2}
+    assert len(result.rows) + len(result.pruned) + len(result.skipped) == 20
+    # Pruned combos were reported to the sampler as failed runs
+    assert len(sampler.history) == 20
+    assert sum(1 for _, s in sampler.history if s == -np.inf) >= len(result.pruned)
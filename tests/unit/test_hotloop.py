@@ -0,0 +1,56 @@
+import backtrader as bt
+
+from src.backtester.engine import BacktestEngine
+from src.backtester.hotloop import HotLoopProfiler, collect_stats, profiled
+from src.backtester.strategies import AtrPositionSizing, SmaCross
+from tests.unit.helpers import synthetic_feed
+
+
+class CountingCross(SmaCross):
+    """Counts orders independently of the profiler."""
+
+    def __init__(self):
+        super().__init__()
+        self.submitted = self.cancelled = 0
+
+    def notify_order(self, order):
+        self.submitted += order.status == order.Submitted
+        self.cancelled += order.status == order.Canceled
+        super().notify_order(order)
+
+
+def test_profiled_strategy_keeps_params_and_results():
+    cls = profiled(SmaCross)
+    assert profiled(SmaCross) is cls and profiled(cls) is cls
+    assert issubclass(cls, HotLoopProfiler) and cls.__name__ == 'SmaCross'
+
+    values = []
+    for strat in (SmaCross, cls):
+        cerebro = bt.Cerebro()
+        cerebro.adddata(synthetic_feed(2500, seed=8))
+        cerebro.addstrategy(strat, sma_short=7)
+        res = cerebro.run()[0]
+        assert res.p.sma_short == 7
+        values.append(res.broker.getvalue())
+    assert values[0] == values[1]
+
+
+def test_engine_flag_reports_per_strategy_breakdown():
+    engine = BacktestEngine(profile_strategies=True)
+    engine.add_data(synthetic_feed(2500, seed=8))
+    engine.set_strategy(CountingCross)
+    engine.set_strategy(AtrPositionSizing)
+    results = engine.run()
+
+    stats = {s['strategy']: s for s in engine.strategy_stats}
+    assert set(stats) == {'CountingCross', 'AtrPositionSizing'}
+    cross = stats['CountingCross']
+    strat = results[0]
+    assert cross['bars'] == 2500
+    # next() only runs once every indicator has its minimum period
+    assert cross['next_calls'] == 2500 - strat._minperiod + 1
+    assert cross['orders'] == strat.submitted > 0
+    assert cross['cancels'] == strat.cancelled
+    assert cross['orders_per_bar'] == cross['orders'] / 2500
+    assert cross['next_s'] > 0 and cross['notify_trade_calls'] > 0
+    assert collect_stats(results) != [] and BacktestEngine().strategy_stats == []
@@ -0,0 +1,79 @@
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtester.analyzers import EquityRecorder, TradeRecorder, EQUITY_DTYPE, TRADE_DTYPE
+from src.backtester.metrics import (
+    drawdown_pct, equity_dates, equity_metrics, period_returns, rolling_sharpe, trade_metrics
+)
+from src.backtester.strategies import SmaCross
+from src.data.feeds import ArrayData
+
+
+@pytest.fixture(scope="module")
+def run():
+    rng = np.random.default_rng(2)
+    n = 1500
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({'Date': pd.date_range('2018-01-01', periods=n, freq='D'),
+                       'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close, 'Volume': 1})
+    cerebro = bt.Cerebro()
+    cerebro.adddata(ArrayData.from_dataframe(df))
+    cerebro.addstrategy(SmaCross)
+    cerebro.addanalyzer(EquityRecorder, _name='equity')
+    cerebro.addanalyzer(TradeRecorder, _name='trades')
+    cerebro.addanalyzer(bt.analyzers.TimeReturn, _name='returns')
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='ta')
+    return cerebro, cerebro.run()[0], df
+
+
+def test_recorders_return_structured_arrays(run):
+    cerebro, res, df = run
+    equity = res.analyzers.equity.get_analysis()
+    trades = res.analyzers.trades.get_analysis()
+    assert equity.dtype == EQUITY_DTYPE and trades.dtype == TRADE_DTYPE
+    assert len(equity) == len(df)
+    assert equity['equity'][-1] == res.broker.getvalue()
+    assert (equity_dates(equity) == df['Date'].to_numpy()).all()
+    # Position column is the strategy's position on every bar
+    assert set(np.unique(equity['position'] != 0)) == {False, True}
+    closed = trades[-1]
+    assert closed['exit_bar'] - closed['entry_bar'] == closed['duration']
+    assert closed['pnl'] == pytest.approx((closed['exit_price'] - closed['entry_price']) * closed['size'])
+
+
+def test_metrics_match_builtin_analyzers(run):
+    cerebro, res, _ = run
+    equity = res.analyzers.equity.get_analysis()
+    em = equity_metrics(equity['equity'], start_value=cerebro.broker.startingcash)
+    tr = np.array(list(res.analyzers.returns.get_analysis().values()))
+    np.testing.assert_allclose(period_returns(equity['equity'], cerebro.broker.startingcash), tr)
+    assert em['sharpe'] == pytest.approx(tr.mean() / tr.std(ddof=1) * np.sqrt(252))
+    assert em['max_drawdown'] == pytest.approx(res.analyzers.drawdown.get_analysis().max.drawdown)
+
+    tm = trade_metrics(res.analyzers.trades.get_analysis())
+    ta = res.analyzers.ta.get_analysis()
+    assert tm['total_trades'] == ta.total.closed
+    assert tm['wins'] == ta.won.total and tm['losses'] == ta.lost.total
+    assert tm['net_pnl'] == pytest.approx(ta.pnl.net.total)
+    assert tm['max_consec_losses'] == ta.streak.lost.longest
+    assert tm['avg_hold'] == pytest.approx(ta.len.average)
+
+
+def test_vectorized_helpers():
+    eq = np.array([100, 110, 99, 121, 110.0])
+    np.testing.assert_allclose(drawdown_pct(eq), [0, 0, -10, 0, -100 * 11 / 121])
+    changes = np.array([1, 2, 3, 1, 1, 1.0])
+    rs = rolling_sharpe(changes, window=3)
+    assert np.isnan(rs[:2]).all() and np.isnan(rs[-1])
+    assert rs[2] == pytest.approx(2 / 1 * np.sqrt(3))
+    trades = np.zeros(5, dtype=TRADE_DTYPE)
+    trades['pnlcomm'] = [5, -1, -2, -3, 4]
+    trades['duration'] = [1, 2, 3, 4, 5]
+    tm = trade_metrics(trades)
+    assert (tm['wins'], tm['max_consec_losses'], tm['max_consec_wins'], tm['avg_hold']) == (2, 3, 1, 3)
+    assert tm['expectancy'] == pytest.approx(3 / 5)
+    assert trade_metrics(np.zeros(0, dtype=TRADE_DTYPE))['win_rate'] == 0
+    assert equity_metrics(np.array([]))['sharpe'] == 0
@@ -0,0 +1,137 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.backtester.strategies import SmaCross
+from src.gui.strategy_selector_widget import StrategySelectorWidget
+from src.optimizer.constraints import Ordered, Saturates, WarmUp
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.samplers import make_sampler
+from src.optimizer.space import Param, ParamSpace
+from tests.unit.helpers import synthetic_feed
+
+
+def _drain(sampler, budget, score):
+    seen = []
+    while len(seen) < budget:
+        batch = sampler.ask(sampler.batch_size or budget - len(seen))
+        if not batch:
+            break
+        for p in batch:
+            sampler.tell(p, score(p))
+            seen.append(p)
+    return seen
+
+
+def test_param_ladder_has_no_float_drift():
+    p = Param('stop', 0.01, 0.05, 0.01, precision=2)
+    assert p.values() == [0.01, 0.02, 0.03, 0.04, 0.05]
+    assert Param('n', 5, 20, 5, is_int=True).values() == [5, 10, 15, 20]
+    assert p.index(0.031) == 2 and p.index(9) == 4
+    space = ParamSpace.from_ranges({'a': (1, 4, 1), 'b': (0.1, 0.3, 0.1, 1)})
+    assert space.shape == (4, 3) and space.params[0].is_int and not space.params[1].is_int
+
+
+def test_grid_matches_product_and_applies_constraint():
+    space = ParamSpace.from_ranges({'sma_short': (5, 20, 5), 'sma_long': (10, 30, 10)},
+                                   constraint=lambda p: p['sma_short'] < p['sma_long'])
+    expected = [dict(sma_short=s, sma_long=l)
+                for s, l in itertools.product([5, 10, 15, 20], [10, 20, 30]) if s < l]
+    assert list(space.grid()) == expected
+    sampler = make_sampler('grid', space)
+    assert _drain(sampler, 100, lambda p: 0) == expected
+
+
+@pytest.mark.parametrize('mode', ['random', 'lhs', 'tpe'])
+def test_samplers_are_seeded_unique_and_feasible(mode):
+    space = ParamSpace.from_ranges({'x': (0, 30, 1), 'y': (0.0, 1.0, 0.05, 2)},
+                                   constraint=lambda p: p['x'] != 7)
+    score = lambda p: -(p['x'] - 20) ** 2 - (p['y'] - 0.5) ** 2
+    a = _drain(make_sampler(mode, space, seed=3), 60, score)
+    b = _drain(make_sampler(mode, space, seed=3), 60, score)
+    assert a == b and len(a) == 60
+    assert len({tuple(p.values()) for p in a}) == 60
+    assert all(p['x'] != 7 for p in a)
+    assert a != _drain(make_sampler(mode, space, seed=4), 60, score)
+
+
+def test_declarative_constraints_prune_and_dedupe_the_grid():
+    space = ParamSpace.from_ranges({'fast': (2, 30, 2), 'slow': (5, 60, 5), 'max_hold': (1, 60, 1)},
+                                   constraints=[Ordered('fast', 'slow'), WarmUp('fast', 'slow'),
+                                                Saturates('max_hold', 'slow'), Ordered('fast', 'nope')],
+                                   bars=50)
+    # Brute force: fast < slow < bars, and max_hold beyond bars - slow is one class
+    expected, classes = [], set()
+    for f, s, h in itertools.product(range(2, 31, 2), range(5, 61, 5), range(1, 61)):
+        if f < s < 50 and (f, s, min(h, 50 - s)) not in classes:
+            classes.add((f, s, min(h, 50 - s)))
+            expected.append(dict(fast=f, slow=s, max_hold=h))
+    assert len(space.constraints) == 3
+    assert list(space.grid()) == expected
+
+    # Ladders that round onto the same value keep one combo per value
+    rounded = ParamSpace.from_ranges({'x': (0.01, 0.05, 0.005, 2)})
+    assert [p['x'] for p in rounded.grid()] == [0.01, 0.02, 0.03, 0.04, 0.05]
+
+    # Samplers propose one combo per class at most, and random search finds them all
+    for mode in ('random', 'lhs', 'tpe'):
+        keys = [space.key(p) for p in _drain(make_sampler(mode, space, seed=1), 10_000, lambda p: p['fast'])]
+        assert len(set(keys)) == len(keys) and set(keys) <= classes
+        assert mode == 'tpe' or set(keys) == classes
+
+
+def test_strategy_specs_carry_constraints_for_their_params():
+    for name, (cls, specs, constraints) in StrategySelectorWidget.STRATEGIES.items():
+        keys = [spec[0] for spec in specs]
+        assert constraints and all(c.applies(keys) for c in constraints), name
+
+
+@pytest.mark.parametrize('mode', ['random', 'lhs', 'tpe'])
+def test_samplers_stop_when_space_is_exhausted(mode):
+    space = ParamSpace.from_ranges({'x': (1, 4, 1), 'y': (1, 3, 1)},
+                                   constraint=lambda p: p['x'] + p['y'] != 5)
+    got = _drain(make_sampler(mode, space, seed=0), 100, lambda p: p['x'])
+    assert sorted(tuple(p.values()) for p in got) == sorted(
+        tuple(p.values()) for p in space.grid())
+
+
+def test_latin_hypercube_covers_every_stratum():
+    space = ParamSpace.from_ranges({'x': (0, 19, 1), 'y': (0, 19, 1)})
+    pts = make_sampler('lhs', space, seed=5).ask(20)
+    assert sorted(p['x'] for p in pts) == list(range(20))
+    assert sorted(p['y'] for p in pts) == list(range(20))
+
+
+def test_tpe_beats_random_search_on_a_fixed_budget():
+    space = ParamSpace.from_ranges({'x': (0, 99, 1), 'y': (0, 99, 1), 'z': (0.0, 1.0, 0.01, 2)})
+    score = lambda p: -((p['x'] - 71) ** 2 + (p['y'] - 23) ** 2) / 100 - 50 * (p['z'] - 0.3) ** 2
+
+    def mean_best(mode):
+        return np.mean([max(map(score, _drain(make_sampler(mode, space, seed=s), 60, score)))
+                        for s in range(8)])
+
+    assert mean_best('tpe') > mean_best('random')
+
+
+def test_executor_respects_budget_and_skips_short_data():
+    n = 120
+    space = ParamSpace.from_ranges({'sma_short': (5, 10, 5), 'sma_long': (20, 200, 90)})
+    executor = SweepExecutor(SmaCross, [synthetic_feed(n)])
+
+    streamed = []
+    result = executor.run(make_sampler('grid', space), on_result=streamed.append)
+    # sma_long=200 needs more bars than the data has
+    assert [(r['sma_short'], r['sma_long']) for r in result.rows] == [(5, 20), (5, 110), (10, 20), (10, 110)]
+    assert result.skipped == [{'sma_short': 5, 'sma_long': 200}, {'sma_short': 10, 'sma_long': 200}]
+    assert streamed == result.rows and len(result.dates) == n
+    assert all(len(eq) == n for eq in result.equities)
+    assert result.best()['FinalValue'] == max(r['FinalValue'] for r in result.rows)
+
+    limited = executor.run(make_sampler('random', space, seed=1), budget=2)
+    assert len(limited.rows) + len(limited.skipped) == 2
+
+    # With the bar count known, the too-long look-back is never dispatched
+    warm = ParamSpace(space.params, constraints=[WarmUp('sma_short', 'sma_long')], bars=n)
+    pruned = executor.run(make_sampler('grid', warm))
+    assert pruned.rows == result.rows and not pruned.skipped
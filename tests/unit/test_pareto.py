@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.backtester.strategies import SmaCross
+from src.optimizer.executor import RUN_METRICS, SweepExecutor
+from src.optimizer.pareto import ParetoFront, non_dominated
+from tests.unit.helpers import synthetic_feed
+
+
+def _brute_front(points):
+    """Indices no other point dominates (all objectives maximized)."""
+    keep = []
+    for i, p in enumerate(points):
+        if not any(np.all(q >= p) and np.any(q > p) for q in points):
+            keep.append(i)
+    return keep
+
+
+def test_non_dominated_matches_brute_force_with_ties_and_missing():
+    rng = np.random.default_rng(0)
+    points = rng.integers(0, 6, size=(400, 3)).astype(float)
+    points[rng.choice(400, 20, replace=False), rng.integers(0, 3, 20)] = -np.inf
+    assert list(np.flatnonzero(non_dominated(points))) == _brute_front(points)
+
+
+def test_streamed_front_matches_bulk_and_respects_directions():
+    rng = np.random.default_rng(1)
+    rows = [{'Return%': float(r), 'MaxDD%': float(d), 'Trades': int(t)}
+            for r, d, t in zip(rng.integers(-10, 10, 3000), rng.integers(0, 20, 3000), rng.integers(0, 30, 3000))]
+    rows[5]['Return%'] = None
+    objectives = {'Return%': 'max', 'MaxDD%': 'min', 'Trades': 'min'}
+
+    bulk = ParetoFront(objectives)
+    bulk.add(rows)
+    streamed = ParetoFront(objectives)
+    for i in range(0, len(rows), 97):
+        streamed.add(rows[i:i + 97])
+    assert streamed.seen == bulk.seen == 3000
+    assert np.array_equal(streamed.ids, bulk.ids)
+
+    flipped = np.array([[-np.inf if r['Return%'] is None else r['Return%'], -r['MaxDD%'], -r['Trades']]
+                        for r in rows])
+    assert list(bulk.ids) == _brute_front(flipped)
+    assert 5 not in bulk.ids
+    assert np.array_equal(bulk.points[:, 1], [rows[i]['MaxDD%'] for i in bulk.ids])
+
+    with pytest.raises(ValueError):
+        ParetoFront({'Return%': 'up'})
+
+
+def test_sweep_rows_carry_every_run_metric():
+    executor = SweepExecutor(SmaCross, [synthetic_feed(200, seed=2)])
+    row, equity, _ = executor.evaluate({'sma_short': 5, 'sma_long': 20})
+    assert list(row) == ['sma_short', 'sma_long', *RUN_METRICS]
+    assert row['FinalValue'] == round(float(equity[-1]), 2)
+    assert isinstance(row['Trades'], int) and row['MaxDD%'] >= 0
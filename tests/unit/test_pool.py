@@ -0,0 +1,79 @@
+import math
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from src.backtester.strategies import SmaCross
+from src.optimizer.distributed import Coordinator, Worker
+from src.optimizer.executor import SweepExecutor
+from src.optimizer import pool as pool_module
+from src.optimizer.pool import DEFAULT_MAX_PROCESSES, WorkerPool, default_processes
+from src.optimizer.samplers import make_sampler
+from src.optimizer.space import ParamSpace
+from tests.unit.helpers import synthetic_feed
+
+SPACE = ParamSpace.from_ranges({'sma_short': (3, 12, 3), 'sma_long': (20, 300, 70)})
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with WorkerPool(2, max_datasets=2) as p:
+        assert p.wait_ready(timeout=120)
+        yield p
+
+
+def test_tasks_run_on_warm_workers(pool):
+    assert pool.submit(math.factorial, 5).result(timeout=30) == 120
+    assert [f.result(timeout=30) for f in pool.map(abs, [-1, -2, 3])] == [1, 2, 3]
+    with pytest.raises(ValueError):
+        pool.submit(int, 'x').result(timeout=30)
+    health = pool.health()
+    assert health['workers'] == health['alive'] == health['ready'] == 2
+    assert health['busy'] == health['queued'] == 0
+    assert health['completed'] >= 4 and health['failed'] >= 1
+    assert 0.0 <= health['utilization'] <= 1.0
+
+
+def test_pooled_sweep_matches_local_and_reuses_the_dataset(pool):
+    feed = synthetic_feed(250, seed=6)
+    local = SweepExecutor(SmaCross, [feed]).run(make_sampler('grid', SPACE))
+    misses = pool.misses
+    for _ in range(2):
+        pooled = SweepExecutor(SmaCross, [feed]).run(make_sampler('grid', SPACE), pool=pool, chunk_size=3)
+        assert pooled.rows == local.rows and pooled.skipped == local.skipped
+        assert all(np.array_equal(a, b) for a, b in zip(pooled.equities, local.equities))
+        assert pooled.dates == local.dates
+    # Published once, then served from the pool's cache
+    assert pool.misses == misses + 1 and pool.hits >= 1
+
+
+def test_dead_worker_is_replaced_and_its_task_retried_once(pool):
+    restarts = pool.restarts
+    with pytest.raises(RuntimeError, match="died twice"):
+        pool.submit(os._exit, 3).result(timeout=120)
+    assert pool.restarts == restarts + 2
+    assert pool.wait_ready(timeout=120)
+    assert pool.submit(math.factorial, 4).result(timeout=60) == 24
+    assert pool.health()['alive'] == 2
+
+
+def test_distributed_worker_runs_units_on_the_pool(pool):
+    feed = synthetic_feed(250, seed=6)
+    with Coordinator(SmaCross, [feed], list(SPACE.grid()), unit_size=6) as coord:
+        worker = Worker(*coord.address, pool=pool)
+        thread = threading.Thread(target=worker.run, daemon=True)
+        thread.start()
+        result = coord.wait(timeout=120)
+        thread.join(10)
+    local = SweepExecutor(SmaCross, [feed]).run(make_sampler('grid', SPACE))
+    assert worker.units_done == coord.status()['units']
+    assert result.rows == local.rows and result.skipped == local.skipped
+
+
+def test_default_size_is_capped(monkeypatch):
+    monkeypatch.setattr(pool_module.mp, 'cpu_count', lambda: 64)
+    assert default_processes() == DEFAULT_MAX_PROCESSES
+    monkeypatch.setattr(pool_module.mp, 'cpu_count', lambda: 2)
+    assert default_processes() == 2
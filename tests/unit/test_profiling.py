@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtester.engine import BacktestEngine
+from src.backtester.strategies import SmaCross
+from src.data.loader import DataLoader
+from src.utils import profiling
+from src.utils.profiling import RunProfiler, phase
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    n = 2000
+    close = 100 + np.cumsum(np.random.default_rng(4).normal(0, 1, n))
+    df = pd.DataFrame({'Date': pd.date_range('2012-01-01', periods=n, freq='D'),
+                       'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                       'Volume': 100})
+    path = tmp_path / "prices.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_phases_recorded_across_loader_and_engine(csv_path, tmp_path):
+    with RunProfiler() as prof:
+        with phase('backtest'):
+            feed, rows = DataLoader.from_csv(str(csv_path))
+            engine = BacktestEngine()
+            engine.add_data(feed)
+            engine.set_strategy(SmaCross)
+            engine.run()
+
+    names = [(r['name'], r['depth']) for r in prof.phases]
+    assert names == [('backtest', 0), ('load_csv', 1), ('build_feed', 1), ('cerebro.run', 1)]
+    run = prof.phases[-1]
+    assert run['bars'] == rows == 2000
+    assert run['bars_per_s'] == pytest.approx(run['bars'] / run['wall_s'])
+    assert all(r['wall_s'] >= 0 and r['cpu_s'] >= 0 for r in prof.phases)
+    assert prof.phases[0]['wall_s'] >= sum(r['wall_s'] for r in prof.phases[1:])
+
+    out = json.loads(open(prof.to_json(str(tmp_path / "p.json"))).read())
+    assert [p['name'] for p in out['phases']] == [n for n, _ in names]
+    assert out['capture'] is None and out['wall_s'] > 0
+
+
+def test_phase_is_noop_without_profiler():
+    assert profiling.active() is None
+    with phase('x') as rec:
+        rec['bars'] = 5
+    with RunProfiler() as prof:
+        assert profiling.active() is prof
+    assert profiling.active() is None and prof.phases == []
+
+
+def test_cprofile_capture_and_traced_memory():
+    with RunProfiler(capture='cprofile', trace_memory=True) as prof:
+        with phase('alloc'):
+            blob = [bytearray(1024) for _ in range(2048)]
+        del blob
+    assert 'function calls' in prof.capture_text
+    assert prof.phases[0]['traced_peak_mb'] >= 2
+    with pytest.raises(ValueError):
+        RunProfiler(capture='perf')
@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pandas as pd
+from src.gui.report_generator import ReportGenerator, build_sweep_context
+from src.viz.static_charts import render_run_charts
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), '../../templates')
+
+
+def make_context(seed):
+    dates = list(pd.date_range('2021-01-01', periods=50))
+    equity = [1000 + seed + i * (-1) ** i for i in range(50)]
+    return {
+        'title': f"Run {seed}", 'date': '2021-02-19', 'dates': dates, 'equity_vals': equity,
+        'metrics': {'Total Trades': 1}, 'trades_table': [],
+        'final_value': f"{equity[-1]:.2f}", 'max_drawdown': '0.00%', 'cagr': '0.00%',
+    }
+
+
+def test_static_charts_are_memoized_per_run():
+    ctx = make_context(1)
+    first = render_run_charts(ctx['dates'], ctx['equity_vals'])
+    assert first['equity_div'].startswith('<img') and 'data:image/png;base64,' in first['equity_div']
+    assert render_run_charts(ctx['dates'], ctx['equity_vals']) is first
+    assert render_run_charts(ctx['dates'], ctx['equity_vals'][::-1]) is not first
+
+
+def test_generate_report_inlines_images_and_times_stages(tmp_path):
+    rg = ReportGenerator(template_dir=TEMPLATES)
+    html_file, pdf_path = rg.generate_report(make_context(2), output_dir=str(tmp_path),
+                                             filename='r.pdf', pdf=False)
+    html = open(html_file, encoding='utf-8').read()
+    assert html.count('data:image/png;base64,') == 3
+    assert 'plotly' not in html
+    assert set(rg.last_timings) == {'charts', 'html', 'pdf', 'total'}
+
+
+def test_generate_reports_in_process_pool(tmp_path):
+    rg = ReportGenerator(template_dir=TEMPLATES)
+    jobs = [(make_context(i), str(tmp_path), f"r{i}.pdf") for i in range(3)]
+    results = rg.generate_reports(jobs, max_workers=2, pdf=False)
+    assert [os.path.basename(h) for h, _, _ in results] == ['r0.html', 'r1.html', 'r2.html']
+    assert all(os.path.exists(h) and t['total'] > 0 for h, _, t in results)
+
+
+def test_sweep_report_from_stored_runs(tmp_path):
+    dates = list(pd.date_range('2021-01-01', periods=20))
+    results, equities = [], []
+    for fast in (2, 3, 4):
+        for slow in (10, 20):
+            curve = np.linspace(1000, 1000 + fast * slow, 20)
+            results.append({'fast': fast, 'slow': slow, 'FinalValue': curve[-1]})
+            equities.append(curve)
+    ctx = build_sweep_context(results, equities, dates, strategy='SMA', top_k=3)
+    assert ctx['run_count'] == 6
+    assert ctx['best']['fast'] == 4 and ctx['best']['slow'] == 20
+    assert ctx['columns'][-2:] == ['Return (%)', 'Max DD (%)']
+    assert [r[2] for r in ctx['rows']] == sorted((r['FinalValue'] for r in results), reverse=True)
+    assert len(ctx['heatmaps']) == 1 and ctx['overlay_div'].startswith('<img')
+
+    rg = ReportGenerator(template_dir=TEMPLATES)
+    html_file, _ = rg.generate_sweep_report(ctx, output_dir=str(tmp_path), filename='sweep.pdf', pdf=False)
+    html = open(html_file, encoding='utf-8').read()
+    assert html.count('<tr class="top">') == 3
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from src.gui.results_model import ResultsTableModel
+from src.optimizer.results import ResultStore
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def _rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{'sma_short': int(s), 'sma_long': int(l), 'FinalValue': round(float(v), 2)}
+            for s, l, v in zip(rng.integers(2, 20, n), rng.integers(20, 200, n), rng.normal(1e4, 300, n))]
+
+
+def test_store_grows_by_batches_and_keeps_types():
+    store = ResultStore()
+    rows = _rows(5000)
+    for i in range(0, len(rows), 700):
+        store.append(rows[i:i + 700])
+    store.append([{'sma_short': 3, 'note': 'late column'}])
+    assert len(store) == 5001
+    assert store.row(0) == {**rows[0], 'note': None}
+    assert store.row(5000) == {'sma_short': 3, 'sma_long': None, 'FinalValue': None, 'note': 'late column'}
+    assert store.is_integral('sma_short') and not store.is_integral('FinalValue')
+    assert not store.is_numeric('note')
+
+
+def test_query_matches_pandas():
+    rows = _rows(20000, seed=1)
+    store = ResultStore()
+    store.append(rows)
+    frame = pd.DataFrame(rows)
+
+    top = store.query("FinalValue top 100 where sma_long > 50")
+    expected = frame[frame.sma_long > 50].sort_values('FinalValue', ascending=False, kind='stable').head(100)
+    assert np.array_equal(store.values('FinalValue')[top], expected.FinalValue.to_numpy())
+
+    both = store.query("where sma_short >= 10 and sma_long < 100")
+    assert np.array_equal(both, np.flatnonzero((frame.sma_short >= 10) & (frame.sma_long < 100)))
+    worst = store.query("FinalValue bottom 5")
+    assert np.array_equal(store.values('FinalValue')[worst], np.sort(frame.FinalValue.to_numpy())[:5])
+
+    with pytest.raises(KeyError):
+        store.query("Sharpe top 3")
+    with pytest.raises(ValueError):
+        store.query("where sma_long is big")
+
+
+def test_model_streams_filters_sorts_and_exports(app, tmp_path):
+    model = ResultsTableModel()
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    rows = _rows(300, seed=2)
+    model.append_rows(rows[:100])
+    model.append_rows(rows[100:])
+    assert model.rowCount() == 300 and model.columnCount() == 3
+    assert inserted == [(100, 299)]
+    assert model.headerData(2, Qt.Horizontal) == 'FinalValue'
+    assert model.data(model.index(0, 0)) == str(rows[0]['sma_short'])
+
+    model.set_query("FinalValue top 10")
+    assert model.rowCount() == 10
+    best = max(r['FinalValue'] for r in rows)
+    assert model.data(model.index(0, 2)) == str(best)
+    # Streamed rows go through the active query
+    model.append_rows([{'sma_short': 2, 'sma_long': 30, 'FinalValue': best + 1}])
+    assert model.rowCount() == 10 and model.data(model.index(0, 2)) == str(best + 1)
+
+    model.set_query("")
+    model.sort(1, Qt.AscendingOrder)
+    shown = [int(model.data(model.index(r, 1))) for r in range(model.rowCount())]
+    assert shown == sorted(shown)
+
+    path = str(tmp_path / 'results.csv')
+    model.export(path)
+    assert len(pd.read_csv(path)) == 301
+
+
+@pytest.mark.parametrize('query, sort', [
+    ("where sma_long > 50", (2, Qt.DescendingOrder)),
+    ("FinalValue top 25 where sma_short < 15", (1, Qt.AscendingOrder)),
+    ("", (0, Qt.AscendingOrder)),
+    ("where sma_short != 3", (3, Qt.AscendingOrder)),
+])
+def test_streamed_rows_merge_like_a_full_reselection(app, query, sort):
+    rows = _rows(3000, seed=3)
+    for i, row in enumerate(rows):
+        row['tag'] = f"t{i % 7}"
+    streamed, fresh = ResultsTableModel(), ResultsTableModel()
+    streamed.append_rows(rows[:10])
+    streamed.set_query(query)
+    streamed.sort(*sort)
+    for i in range(10, len(rows), 37):
+        streamed.append_rows(rows[i:i + 37])
+    fresh.set_rows(rows)
+    fresh.set_query(query)
+    fresh.sort(*sort)
+    assert np.array_equal(streamed.visible_indices(), fresh.visible_indices())
+
+    # A subset restricts both the existing and the streamed rows
+    streamed.show_only(np.arange(0, 4000, 3))
+    streamed.append_rows(_rows(30, seed=4))
+    fresh.append_rows(_rows(30, seed=4))
+    fresh.show_only(np.arange(0, 4000, 3))
+    assert np.array_equal(streamed.visible_indices(), fresh.visible_indices())
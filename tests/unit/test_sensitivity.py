@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.optimizer.results import ResultStore
+from src.optimizer.sensitivity import Sensitivity, neighborhood_mean
+
+
+def _frame(n=50_000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'fast': rng.integers(2, 30, n), 'slow': rng.integers(20, 120, n) * 1.0,
+                          'stop': rng.choice([0.01, 0.02, 0.05], n), 'Sharpe': rng.normal(0, 1, n)})
+    frame.loc[::53, 'Sharpe'] = np.nan
+    return frame
+
+
+def test_marginals_and_heatmaps_match_pandas():
+    frame = _frame()
+    s = Sensitivity({c: frame[c].to_numpy() for c in frame}, ['fast', 'slow', 'stop'], 'Sharpe')
+    values, best = s.marginal('slow')
+    assert np.array_equal(values, np.sort(frame.slow.unique()))
+    assert np.allclose(best, frame.groupby('slow').Sharpe.max().to_numpy())
+    assert np.allclose(s.marginal('stop', 'mean')[1], frame.groupby('stop').Sharpe.mean().to_numpy())
+    for stat, agg in (('best', 'max'), ('mean', 'mean')):
+        expected = frame.pivot_table(index='slow', columns='fast', values='Sharpe', aggfunc=agg)
+        assert np.allclose(s.heatmap('fast', 'slow', stat), expected.to_numpy(), equal_nan=True)
+
+    # Lower is better: 'best' is the minimum
+    low = Sensitivity({c: frame[c].to_numpy() for c in frame}, ['fast'], 'Sharpe', maximize=False)
+    assert np.allclose(low.marginal('fast')[1], frame.groupby('fast').Sharpe.min().to_numpy())
+    with pytest.raises(ValueError):
+        s.marginal('fast', 'median')
+
+
+def test_neighborhood_mean_matches_brute_force():
+    rng = np.random.default_rng(1)
+    cube = rng.normal(size=(6, 7, 5))
+    cube[rng.random(cube.shape) < 0.3] = np.nan
+    smooth = neighborhood_mean(cube, 2)
+    for idx in np.ndindex(cube.shape):
+        window = cube[tuple(slice(max(i - 2, 0), i + 3) for i in idx)]
+        expected = np.nan if np.isnan(cube[idx]) else np.nanmean(window)
+        assert np.isclose(smooth[idx], expected, equal_nan=True)
+
+
+def test_summary_tells_a_spike_from_a_plateau():
+    fast, slow = np.meshgrid(np.arange(1, 21), np.arange(21, 41), indexing='ij')
+    # A broad hill around (15, 30) and a one-cell spike at (3, 25) that beats it
+    sharpe = 1.0 - ((fast - 15) ** 2 + (slow - 30) ** 2) / 200
+    sharpe[2, 4] = 1.5
+    store = ResultStore()
+    store.append([{'fast': int(f), 'slow': int(s), 'Sharpe': float(v)}
+                  for f, s, v in zip(fast.ravel(), slow.ravel(), sharpe.ravel())])
+
+    s = Sensitivity.from_store(store, ['fast', 'slow'], 'Sharpe')
+    summary = s.summary(radius=2)
+    assert summary['best'] == {'fast': 3, 'slow': 25} and summary['best_value'] == 1.5
+    assert summary['robust'] == {'fast': 15, 'slow': 30}
+    assert summary['robust_score'] > summary['best_score']
+    assert np.array_equal(s.project(s.cube(), 'slow', 'fast'), sharpe.T)
+    assert np.allclose(s.run_scores(2), s.robustness(2).ravel())
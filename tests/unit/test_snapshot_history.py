@@ -0,0 +1,63 @@
+import pytest
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QImage, QColor
+from PySide6.QtWidgets import QApplication
+from src.gui.snapshot_history import SnapshotHistoryModel, PreviewLoader, read_blob
+from src.data.snapshot_store import SnapshotStore
+
+TABLE = 'snapshots'
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def make_store(path, n, **images):
+    store = SnapshotStore(path, TABLE)
+    store.insert_many(
+        dict(symbol=f"SYM{i % 3}", live=0, title=f"run {i}", date=f"2021-01-{i % 28 + 1:02d}", **images)
+        for i in range(n)
+    )
+    store.flush()
+    return store
+
+
+def png_bytes():
+    img = QImage(4, 4, QImage.Format_RGB32)
+    img.fill(QColor('red'))
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, 'PNG')
+    return bytes(data)
+
+
+def test_model_pages_all_rows_in_order(tmp_path, app):
+    store = make_store(str(tmp_path / "s.db"), 450)
+    model = SnapshotHistoryModel(store)
+    model.refresh()
+    assert model.rowCount() == SnapshotHistoryModel.PAGE_SIZE
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 450
+    keys = [(model.data(model.index(r, 2)), model.snapshot_id(r)) for r in range(model.rowCount())]
+    assert keys == sorted(keys, reverse=True)
+    assert len({k[1] for k in keys}) == 450
+    store.close()
+
+
+def test_preview_loader_decodes_blobs(tmp_path, app):
+    png = png_bytes()
+    store = make_store(str(tmp_path / "s.db"), 1, equity_img=png, drawdown_img=png, histogram_img=png)
+    with store.reader() as conn:
+        assert read_blob(conn, TABLE, 'equity_img', 1) == png
+
+    received = []
+    loader = PreviewLoader(store, 1)
+    loader.signals.loaded.connect(lambda sid, images: received.append((sid, images)))
+    loader.run()
+    sid, images = received[0]
+    assert sid == 1 and len(images) == 3
+    assert all(not img.isNull() for img in images)
+    store.close()
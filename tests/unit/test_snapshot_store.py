@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+import pytest
+from src.data.snapshot_store import SnapshotStore, MIGRATIONS, search_clause
+
+
+def test_store_uses_wal_and_records_schema_version(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    with store.reader() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert store.schema_version() == MIGRATIONS[-1][0]
+    store.close()
+    # Re-opening an up-to-date database applies nothing twice
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    with store.reader() as conn:
+        versions = [r[0] for r in conn.execute("SELECT version FROM schema_version")]
+    assert versions == [v for v, _ in MIGRATIONS]
+    store.close()
+
+
+def test_store_migrates_unversioned_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE snapshots (id INTEGER PRIMARY KEY, symbol TEXT, live INTEGER, title TEXT, "
+                 "description TEXT, notes TEXT, date TEXT, equity_img BLOB, drawdown_img BLOB, histogram_img BLOB)")
+    conn.execute("INSERT INTO snapshots (symbol, date) VALUES ('SPY', '2021-01-01')")
+    conn.commit()
+    conn.close()
+    store = SnapshotStore(path)
+    with store.reader() as conn:
+        assert conn.execute("SELECT symbol FROM snapshots").fetchall() == [('SPY',)]
+    assert store.schema_version() == MIGRATIONS[-1][0]
+    store.close()
+
+
+def test_batched_writes_from_many_threads(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"), batch_size=16)
+
+    def producer(k):
+        store.insert_many({'symbol': f"S{k}", 'title': str(i), 'date': '2021-01-01'} for i in range(50))
+
+    threads = [threading.Thread(target=producer, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.flush(timeout=5)
+    with store.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 200
+    store.close()
+
+
+def test_flush_reports_failed_writes(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    # A dict cannot be bound as a column value
+    store.insert({'symbol': {'not': 'storable'}, 'date': '2021-01-01'})
+    with pytest.raises(sqlite3.Error):
+        store.flush(timeout=5)
+    # The failure is reported once; later writes go through
+    store.insert({'symbol': 'SPY', 'date': '2021-01-02'})
+    assert store.flush(timeout=5)
+    with store.reader() as conn:
+        assert conn.execute("SELECT symbol FROM snapshots").fetchall() == [('SPY',)]
+    store.close()
+
+
+def test_search_text_and_metric_filters(tmp_path):
+    store = SnapshotStore(str(tmp_path / "s.db"))
+    store.insert_many([
+        {'symbol': 'SPY', 'strategy': 'SmaCross', 'sharpe': 1.4, 'title': 'breakout test', 'date': '2021-01-01'},
+        {'symbol': 'SPY', 'strategy': 'SmaCross', 'sharpe': 0.3, 'title': 'baseline', 'date': '2021-01-02'},
+        {'symbol': 'QQQ', 'strategy': 'SmaCross', 'sharpe': 2.0, 'notes': 'tight stops', 'date': '2021-01-03'},
+        {'symbol': 'SPY', 'strategy': 'TimedExitSma', 'sharpe': 1.9, 'description': 'breakout', 'date': '2021-01-04'},
+    ])
+    store.flush()
+
+    def ids(query):
+        where, args = search_clause(query)
+        with store.reader() as conn:
+            return [r[0] for r in conn.execute(f"SELECT id FROM snapshots WHERE {where} ORDER BY id", args)]
+
+    assert ids("SmaCross sharpe > 1 symbol:spy") == [1]
+    assert ids("breakout") == [1, 4]
+    assert ids("stop") == [3]
+    assert ids("strategy:TimedExitSma sharpe>=1.9") == [4]
+    assert search_clause("  ") == ('', [])
+    with pytest.raises(ValueError):
+        search_clause("sharpe>high")
+    store.close()
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from src.data.stream import (
+    StreamHub, QtStreamBridge, CoalescingDispatcher, RestStreamer, WebSocketStreamer, hub_bridge
+)
+
+
+class StandInServer:
+    """Local REST + websocket server standing in for a market-data venue."""
+
+    def __init__(self):
+        self.polls = 0
+        self.ws_connects = 0
+        self.subscriptions = []
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _quote(self, request):
+        self.polls += 1
+        return web.json_response({'symbol': request.query.get('symbol', 'SPY'), 'seq': self.polls})
+
+    async def _flaky(self, request):
+        self.polls += 1
+        if self.polls <= 2:
+            return web.Response(status=503)
+        return web.json_response({'seq': self.polls})
+
+    async def _ws(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.ws_connects += 1
+        msg = await ws.receive_json()
+        self.subscriptions.append(msg)
+        for i in range(3):
+            await ws.send_json({'channel': msg['channel'], 'seq': i})
+        await ws.send_str('not json')
+        # Drop the connection so the client has to reconnect
+        await ws.close()
+        return ws
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_get('/quote', self._quote)
+        app.router.add_get('/flaky', self._flaky)
+        app.router.add_get('/ws', self._ws)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+        self._started.wait(5)
+        return f"127.0.0.1:{self.port}"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+
+@pytest.fixture
+def server():
+    srv = StandInServer()
+    host = srv.start()
+    yield srv, host
+    srv.stop()
+
+
+@pytest.fixture
+def hub():
+    h = StreamHub(batch_interval_s=0.01, backoff_initial_s=0.05, backoff_max_s=0.2)
+    yield h
+    h.stop()
+
+
+def _collect(hub, until, timeout=5.0):
+    received = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        received.extend(hub.drain())
+        if until(received):
+            break
+        time.sleep(0.01)
+    return received
+
+
+def test_hub_multiplexes_rest_pollers(server, hub):
+    srv, host = server
+    hub.add_rest_poller('spy', f"http://{host}/quote", interval_s=0.02, params={'symbol': 'SPY'})
+    hub.add_rest_poller('qqq', f"http://{host}/quote", interval_s=0.02, params={'symbol': 'QQQ'})
+    received = _collect(hub, lambda r: {k for k, _ in r} == {'spy', 'qqq'} and len(r) >= 6)
+    assert {k for k, _ in received} == {'spy', 'qqq'}
+    assert all(p['symbol'] == k.upper() for k, p in received)
+    assert sorted(hub.sources()) == ['qqq', 'spy']
+
+    hub.remove('spy')
+    time.sleep(0.05)
+    hub.drain()
+    later = _collect(hub, lambda r: len(r) >= 3)
+    assert later and {k for k, _ in later} == {'qqq'}
+
+
+def test_hub_retries_failed_polls_with_backoff(server, hub):
+    srv, host = server
+    hub.add_rest_poller('flaky', f"http://{host}/flaky", interval_s=0.02)
+    received = _collect(hub, lambda r: len(r) >= 1)
+    assert received[0] == ('flaky', {'seq': 3})
+
+
+def test_hub_websocket_subscribes_and_reconnects(server, hub):
+    srv, host = server
+    hub.add_websocket('trades', f"ws://{host}/ws", {'channel': 'trades'})
+    received = _collect(hub, lambda r: len(r) >= 6)
+    # Invalid JSON is skipped; the dropped socket is reopened and re-subscribed
+    assert [p['seq'] for _, p in received[:6]] == [0, 1, 2, 0, 1, 2]
+    assert srv.ws_connects >= 2
+    assert srv.subscriptions[0] == {'channel': 'trades'}
+
+
+def test_qt_bridge_emits_batches(qtbot, server, hub):
+    srv, host = server
+    bridge = QtStreamBridge(hub, interval_ms=10)
+    batches = []
+    bridge.batch_ready.connect(batches.append)
+    hub.add_rest_poller('spy', f"http://{host}/quote", interval_s=0.02)
+    qtbot.waitUntil(lambda: sum(len(b) for b in batches) >= 3, timeout=5000)
+    bridge.stop()
+    assert all(k == 'spy' for b in batches for k, _ in b)
+
+
+def test_streamers_sharing_a_hub_each_get_their_messages(qtbot, server, hub):
+    srv, host = server
+    spy = RestStreamer(f"http://{host}/quote?symbol=SPY", interval_s=0.02, hub=hub)
+    qqq = RestStreamer(f"http://{host}/quote?symbol=QQQ", interval_s=0.02, hub=hub)
+    trades = WebSocketStreamer(f"ws://{host}/ws", {'channel': 'trades'}, hub=hub)
+    got = {'spy': [], 'qqq': [], 'trades': []}
+    spy.new_data.connect(got['spy'].append)
+    qqq.new_data.connect(got['qqq'].append)
+    trades.new_data.connect(got['trades'].append)
+    drained = []
+    hub_bridge(hub).batch_ready.connect(drained.extend)
+    for streamer in (spy, qqq, trades):
+        streamer.start()
+    qtbot.waitUntil(lambda: all(len(v) >= 3 for v in got.values()), timeout=5000)
+    for streamer in (spy, qqq, trades):
+        streamer.stop()
+    hub_bridge(hub).stop()
+
+    assert hub_bridge(hub) is hub_bridge(hub)
+    # Every message taken off the hub reached the streamer it belongs to
+    for name, streamer in (('spy', spy), ('qqq', qqq), ('trades', trades)):
+        assert got[name] == [p for k, p in drained if k == streamer.key]
+    assert {p['symbol'] for p in got['spy']} == {'SPY'}
+    assert {p['symbol'] for p in got['qqq']} == {'QQQ'}
+    assert [p['seq'] for p in got['trades'][:3]] == [0, 1, 2]
+
+
+def test_websocket_streamer_hands_raw_messages_to_its_dispatcher(qtbot, server, hub):
+    srv, host = server
+    d = CoalescingDispatcher(frame_ms=10, symbol_key='channel')
+    frames = []
+    d.frame_ready.connect(frames.append)
+    trades = WebSocketStreamer(f"ws://{host}/ws", {'channel': 'trades'}, dispatcher=d, hub=hub)
+    trades.start()
+    qtbot.waitUntil(lambda: d.stats()['invalid'] >= 1 and bool(frames), timeout=5000)
+    trades.stop()
+    d.stop()
+
+    # Decoding happens on the dispatcher's worker; nothing went through the hub queue
+    assert hub.drain() == []
+    stats = d.stats()
+    assert stats['received'] >= 4 and stats['decoded'] >= 3
+    assert frames[0]['trades']['channel'] == 'trades'
+
+
+def _settle(dispatcher, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while dispatcher.stats()['queue_depth'] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    time.sleep(0.02)
+
+
+def test_dispatcher_coalesces_per_symbol(qtbot):
+    d = CoalescingDispatcher(frame_ms=10_000)
+    frames = []
+    d.frame_ready.connect(frames.append)
+    for i in range(50):
+        d.submit(json.dumps({'symbol': 'SPY', 'last': i}))
+    d.submit(b'{"symbol": "QQQ", "bid": 1}')
+    d.submit({'symbol': 'QQQ', 'ask': 2})
+    d.submit('not json')
+    _settle(d)
+    d.deliver()
+    assert frames == [{'SPY': {'symbol': 'SPY', 'last': 49}, 'QQQ': {'symbol': 'QQQ', 'bid': 1, 'ask': 2}}]
+    stats = d.stats()
+    assert stats['received'] == 53 and stats['invalid'] == 1
+    assert stats['coalesced'] == 50 and stats['frames'] == 1 and stats['delivered'] == 2
+    d.stop()
+
+
+def test_dispatcher_latest_policy_and_drops(qtbot):
+    d = CoalescingDispatcher(frame_ms=10_000, policy='latest', max_queue=5, use_orjson=False)
+    assert d.decoder == 'json'
+    frames = []
+    d.frame_ready.connect(frames.append)
+    # Hold the worker so the inbox fills up
+    d._lock.acquire()
+    for i in range(20):
+        d.submit({'symbol': 'SPY', 'bid': i} if i == 0 else {'symbol': 'SPY', 'last': i})
+    d._lock.release()
+    _settle(d)
+    d.deliver()
+    # Oldest messages were dropped; 'latest' keeps no fields from earlier ones
+    assert frames == [{'SPY': {'symbol': 'SPY', 'last': 19}}]
+    stats = d.stats()
+    assert stats['dropped'] >= 10 and stats['queue_depth'] == 0
+    d.stop()
+    with pytest.raises(ValueError):
+        CoalescingDispatcher(policy='sample')
@@ -0,0 +1,24 @@
+import sqlite3
+
+from src.utils.paths import app_data_dir, database_path
+
+
+def test_data_dir_follows_the_env_override(tmp_path, monkeypatch):
+    target = tmp_path / 'data' / 'app'
+    monkeypatch.setenv('BACKTESTER_DATA_DIR', str(target))
+    assert app_data_dir() == str(target) and target.is_dir()
+    assert database_path('x.db') == str(target / 'x.db')
+
+
+def test_legacy_database_in_the_working_dir_is_copied(tmp_path, monkeypatch):
+    monkeypatch.setenv('BACKTESTER_DATA_DIR', str(tmp_path / 'data'))
+    monkeypatch.chdir(tmp_path)
+    with sqlite3.connect('old.db') as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        conn.execute("INSERT INTO t VALUES (7)")
+    conn.close()
+
+    path = database_path('old.db')
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT v FROM t").fetchall() == [(7,)]
+    conn.close()
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.backtester.strategies import SmaCross
+from src.data.feeds import slice_feed
+from src.data.shared import SharedOHLCV, attach
+from src.optimizer.executor import SweepExecutor
+from src.optimizer.walkforward import Window, walk_forward, walk_forward_windows
+from tests.unit.helpers import synthetic_feed
+
+CANDIDATES = [{'sma_short': s, 'sma_long': l} for s in (5, 10) for l in (20, 40)]
+
+
+def test_rolling_and_anchored_windows():
+    assert walk_forward_windows(10, 4, 3) == [Window(0, 4, 4, 7), Window(3, 7, 7, 10)]
+    assert walk_forward_windows(11, 4, 3, anchored=True) == [
+        Window(0, 4, 4, 7), Window(0, 7, 7, 10), Window(0, 10, 10, 11)]
+    assert walk_forward_windows(4, 4, 3) == []
+    with pytest.raises(ValueError):
+        walk_forward_windows(10, 0, 3)
+
+
+def test_shared_arrays_round_trip():
+    arrays = synthetic_feed(50, seed=4, freq='h').p.dataname
+    with SharedOHLCV(arrays) as shared:
+        view = attach(shared.handle)
+        assert len(view) == 50
+        assert np.array_equal(view.close, arrays.close)
+        assert np.array_equal(view.datetime, arrays.datetime)
+
+
+def test_walk_forward_picks_the_in_sample_best_and_stitches_test_windows():
+    feed = synthetic_feed(700, seed=4, freq='h')
+    result = walk_forward(SmaCross, [feed], CANDIDATES, train=300, test=200, max_workers=1)
+
+    assert [w['window'] for w in result.windows] == [Window(0, 300, 300, 500), Window(200, 500, 500, 700)]
+    for w in result.windows:
+        win = w['window']
+        executor = SweepExecutor(SmaCross, [slice_feed(feed, win.train_start, win.train_stop)])
+        scores = [executor.evaluate(p)[0]['FinalValue'] for p in CANDIDATES]
+        assert w['params'] == CANDIDATES[int(np.argmax(scores))]
+        assert w['in_sample'] == max(scores)
+
+    # One out-of-sample bar per test bar, chained window to window
+    assert len(result.equity) == len(result.dates) == 400
+    assert result.dates[0] == result.windows[0]['test_start']
+    growth = np.prod([1 + w['oos_return'] / 100 for w in result.windows])
+    assert result.oos_return == pytest.approx((growth - 1) * 100)
+
+
+def test_process_pool_matches_inline_run():
+    feed = synthetic_feed(500, seed=4, freq='h')
+    inline = walk_forward(SmaCross, [feed], CANDIDATES, train=250, test=125, max_workers=1)
+    pooled = walk_forward(SmaCross, [feed], CANDIDATES, train=250, test=125,
+                          max_workers=2, chunk_size=2)
+    assert [w['params'] for w in pooled.windows] == [w['params'] for w in inline.windows]
+    assert np.allclose(pooled.equity, inline.equity)
+
+
+def test_view_shows_windows_and_exports_the_stitched_curve(qtbot):
+    from src.gui.walkforward_view import WalkForwardView
+
+    result = walk_forward(SmaCross, [synthetic_feed(700, seed=4, freq='h')], CANDIDATES,
+                          train=300, test=200, max_workers=1)
+    view = WalkForwardView()
+    qtbot.addWidget(view)
+    view.set_result(result, ['sma_short', 'sma_long'])
+    store = view.model.store
+    assert len(store) == 2 and store.columns[:2] == ['Train', 'Test']
+    assert list(store.values('OOS %')) == [round(w['oos_return'], 2) for w in result.windows]
+    frame = view.equity_frame()
+    assert np.array_equal(frame['Equity'], result.equity) and view.export_btn.isEnabled()